@@ -1,3 +1,14 @@
-from .celery import app as celery_app
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from .runtime_limits import apply_process_limits
+
+# Size native thread pools (BLAS/OpenMP/TF) before any entry point imports NumPy or TensorFlow.
+# The RUNTIME_* budget may come from backend-django/.env, which settings.py loads too late for this
+load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+apply_process_limits()
+
+from .celery import app as celery_app  # noqa: E402
 
 __all__ = ["celery_app"]
@@ -0,0 +1,153 @@
+"""CPU thread budgets for NumPy/BLAS, OpenMP and TensorFlow.
+
+Every web or Celery worker process would otherwise start BLAS, OpenMP and
+TensorFlow thread pools as wide as the machine, so N workers under load
+run N x cores threads and throughput collapses from oversubscription.
+
+The per-process budget is ``RUNTIME_CPU_BUDGET`` (default: usable cores)
+divided by ``RUNTIME_WORKER_PROCESSES`` (default: ``WEB_CONCURRENCY`` or 1),
+or ``RUNTIME_THREADS_PER_WORKER`` when set explicitly.
+
+- `apply_process_limits` runs at process start (imported from
+  ``config/__init__``, after it loads ``.env``) and exports the usual ``*_NUM_THREADS`` variables
+  before NumPy or TensorFlow load their thread pools;
+- `limit_threads` narrows BLAS/OpenMP pools around one request or task,
+  with per-endpoint overrides from ``settings.RUNTIME_THREAD_LIMITS``.
+
+TensorFlow fixes its intra/inter-op pools when it initializes, so those
+are only set once per process.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+_BLAS_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+_applied = False
+
+
+def _env_int(name: str) -> int | None:
+    value = os.getenv(name, "").strip()
+    try:
+        return int(value) if value else None
+    except ValueError:
+        logger.warning("Ignoring non-integer %s=%r", name, value)
+        return None
+
+
+def cpu_budget() -> int:
+    configured = _env_int("RUNTIME_CPU_BUDGET")
+    if configured:
+        return max(configured, 1)
+    try:
+        return max(len(os.sched_getaffinity(0)), 1)
+    except AttributeError:  # pragma: no cover - not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def worker_processes() -> int:
+    return max(_env_int("RUNTIME_WORKER_PROCESSES") or _env_int("WEB_CONCURRENCY") or 1, 1)
+
+
+def threads_per_worker() -> int:
+    """Threads one worker process may use for native compute pools."""
+    explicit = _env_int("RUNTIME_THREADS_PER_WORKER")
+    if explicit:
+        return max(explicit, 1)
+    return max(cpu_budget() // worker_processes(), 1)
+
+
+def configure_tensorflow(intra_op: int | None = None, inter_op: int | None = None) -> bool:
+    """Set TensorFlow's thread pools if TF is loaded and not yet initialized; returns success."""
+    tf = sys.modules.get("tensorflow")
+    if tf is None:
+        return False
+    intra_op = intra_op or threads_per_worker()
+    inter_op = inter_op or _env_int("RUNTIME_TF_INTER_OP_THREADS") or min(2, intra_op)
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+        return True
+    except RuntimeError:
+        # TF already created its runtime; the environment variables set at start-up apply instead
+        return False
+
+
+def apply_process_limits() -> int:
+    """Export thread limits for this process (idempotent) and return the per-worker budget."""
+    global _applied
+    threads = threads_per_worker()
+    if _applied:
+        return threads
+    for name in _BLAS_ENV_VARS:
+        os.environ.setdefault(name, str(threads))
+    os.environ.setdefault("TF_NUM_INTRAOP_THREADS", str(threads))
+    os.environ.setdefault("TF_NUM_INTEROP_THREADS", str(_env_int("RUNTIME_TF_INTER_OP_THREADS") or min(2, threads)))
+
+    # Libraries imported before this point already sized their pools; shrink them now
+    if "numpy" in sys.modules:
+        from threadpoolctl import threadpool_limits
+
+        threadpool_limits(limits=threads)
+    configure_tensorflow(threads)
+    _applied = True
+    return threads
+
+
+def parse_thread_limits(text: str) -> Dict[str, int]:
+    """Parse comma-separated "scope=threads" pairs, skipping malformed entries with a warning."""
+    limits: Dict[str, int] = {}
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        scope, _, value = item.partition("=")
+        try:
+            threads = int(value)
+        except ValueError:
+            threads = 0
+        if not scope.strip() or threads < 1:
+            logger.warning("Ignoring malformed RUNTIME_THREAD_LIMITS entry %r", item)
+            continue
+        limits[scope.strip()] = threads
+    return limits
+
+
+def endpoint_limits() -> Dict[str, int]:
+    from django.conf import settings
+
+    return dict(getattr(settings, "RUNTIME_THREAD_LIMITS", {}) or {})
+
+
+def limit_for(scope: str) -> int:
+    """Thread limit for `scope` ("app.endpoint"), falling back to "app", then the worker budget."""
+    overrides = endpoint_limits()
+    for key in (scope, scope.split(".", 1)[0]):
+        if key in overrides:
+            return max(int(overrides[key]), 1)
+    return threads_per_worker()
+
+
+@contextmanager
+def limit_threads(scope: str) -> Iterator[int]:
+    """
+    Cap BLAS/OpenMP threads while a request or task for `scope` runs.
+    threadpoolctl changes process-wide state, so overlapping requests in one
+    threaded worker share the most recent limit until the outer one exits.
+    """
+    from threadpoolctl import threadpool_limits
+
+    limit = limit_for(scope)
+    with threadpool_limits(limits=limit):
+        yield limit
@@ -15,6 +15,8 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 
+from config.runtime_limits import parse_thread_limits, threads_per_worker
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / '.env')   # loads backend-django/.env into os.environ
@@ -51,7 +53,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
 ]
 
-INSTALLED_APPS += ['corsheaders', 'rest_framework', 'network', 'rest_framework.authtoken']
+INSTALLED_APPS += ['corsheaders', 'rest_framework', 'network', 'regressor', 'rest_framework.authtoken']
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -237,6 +239,88 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
+# Late-acknowledged tasks (training) are redelivered if their worker dies; fetch one at a time,
+# and keep the broker from redelivering a still-running task before the visibility timeout
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_BROKER_TRANSPORT_OPTIONS = {"visibility_timeout": int(os.getenv("CELERY_VISIBILITY_TIMEOUT", 6 * 3600))}
+
+# Shared Django cache (e.g. the regressor's issued job ids): Redis shared by web and Celery
+# processes, or per-process memory (the default with eager Celery)
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL") or ("" if CELERY_TASK_ALWAYS_EAGER else CELERY_BROKER_URL)
+if CACHE_REDIS_URL.startswith(("redis://", "rediss://", "unix://")):
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_REDIS_URL}}
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# Live training events (network/services/events.py): "redis" pub/sub shared by web and
+# Celery processes, or the per-process "memory" bus (the default with eager Celery)
+NETWORK_EVENT_BACKEND = os.getenv("NETWORK_EVENT_BACKEND") or ("memory" if CELERY_TASK_ALWAYS_EAGER else "redis")
+NETWORK_EVENT_REDIS_URL = os.getenv("NETWORK_EVENT_REDIS_URL") or CELERY_BROKER_URL
+NETWORK_EVENT_STATE_TTL = int(os.getenv("NETWORK_EVENT_STATE_TTL", 86400))
+# Seconds to wait for the event Redis before giving up on a publish or read
+NETWORK_EVENT_REDIS_TIMEOUT = float(os.getenv("NETWORK_EVENT_REDIS_TIMEOUT", 2.0))
+# Seconds between progress events, and between progress writes to the job row
+NETWORK_EVENT_PUBLISH_INTERVAL = float(os.getenv("NETWORK_EVENT_PUBLISH_INTERVAL", 0.25))
+NETWORK_PROGRESS_PERSIST_INTERVAL = float(os.getenv("NETWORK_PROGRESS_PERSIST_INTERVAL", 2.0))
+# Event stream keep-alive comment interval and maximum connection age (clients reconnect)
+NETWORK_EVENT_HEARTBEAT = float(os.getenv("NETWORK_EVENT_HEARTBEAT", 15))
+NETWORK_EVENT_STREAM_MAX_AGE = float(os.getenv("NETWORK_EVENT_STREAM_MAX_AGE", 3600))
+# Cancellation: fallback DB status poll of the worker's watcher thread, and CSV rows read
+# between cancellation checks while a dataset loads
+NETWORK_CANCEL_DB_POLL_INTERVAL = float(os.getenv("NETWORK_CANCEL_DB_POLL_INTERVAL", 5.0))
+NETWORK_CSV_CHUNK_ROWS = int(os.getenv("NETWORK_CSV_CHUNK_ROWS", 50000))
+# Minimum seconds between training checkpoints (taken at epoch ends; 0 disables resuming)
+NETWORK_CHECKPOINT_INTERVAL = float(os.getenv("NETWORK_CHECKPOINT_INTERVAL", 60))
+# Runs of one training job before a job whose workers keep dying (e.g. OOM-killed) is failed
+NETWORK_MAX_ATTEMPTS = int(os.getenv("NETWORK_MAX_ATTEMPTS", 3))
+# Sweeps: trial cap per job, and concurrent trial processes per job (0 runs trials inline;
+# the worker's thread budget is split between them). Processes are also capped at one per
+# NETWORK_TRIAL_PROCESS_MB of free worker memory, so small workers run one trial at a time
+NETWORK_SWEEP_MAX_TRIALS = int(os.getenv("NETWORK_SWEEP_MAX_TRIALS", 64))
+NETWORK_TRIAL_WORKERS = int(os.getenv("NETWORK_TRIAL_WORKERS") or threads_per_worker())
+NETWORK_TRIAL_PROCESS_MB = float(os.getenv("NETWORK_TRIAL_PROCESS_MB", 700))
+# Memory limit of a training worker for auto_batch_size and trial pools, in MiB (0 = the cgroup limit)
+NETWORK_WORKER_MEMORY_MB = float(os.getenv("NETWORK_WORKER_MEMORY_MB", 0))
+
+# Regressor: worker processes used by the parallel endpoints (defaults to the per-worker
+# thread budget from config/runtime_limits.py)
+REGRESSOR_MAX_WORKERS = int(os.getenv("REGRESSOR_MAX_WORKERS") or threads_per_worker())
+REGRESSOR_COMPARE_MAX_MODELS = int(os.getenv("REGRESSOR_COMPARE_MAX_MODELS", 20))
+# Hyperparameter search: candidate cap and the size (candidates * folds * rows)
+# above which a search is queued on Celery instead of running in the request
+REGRESSOR_SEARCH_MAX_CANDIDATES = int(os.getenv("REGRESSOR_SEARCH_MAX_CANDIDATES", 200))
+REGRESSOR_SEARCH_SYNC_LIMIT = int(os.getenv("REGRESSOR_SEARCH_SYNC_LIMIT", 2_000_000))
+# Number of fitted regressors kept deserialized in memory per process for /predict
+REGRESSOR_MODEL_CACHE_SIZE = int(os.getenv("REGRESSOR_MODEL_CACHE_SIZE", 32))
+# Days stored regressor models are kept before cleanup_artifacts deletes them
+REGRESSOR_MODEL_RETENTION_DAYS = int(os.getenv("REGRESSOR_MODEL_RETENTION_DAYS", 7))
+# SVR switches from the exact solver to a low-rank kernel approximation above this many rows
+REGRESSOR_SVR_APPROX_THRESHOLD = int(os.getenv("REGRESSOR_SVR_APPROX_THRESHOLD", 20000))
+# Fit plots draw at most this many scatter points (larger inputs are decimated)
+REGRESSOR_PLOT_MAX_POINTS = int(os.getenv("REGRESSOR_PLOT_MAX_POINTS", 2000))
+REGRESSOR_PLOT_DPI = int(os.getenv("REGRESSOR_PLOT_DPI", 100))
+# Plots are rendered in a pool of pre-warmed processes (0 renders in the request thread)
+REGRESSOR_RENDER_WORKERS = int(os.getenv("REGRESSOR_RENDER_WORKERS") or min(2, os.cpu_count() or 1))
+REGRESSOR_RENDER_QUEUE_SIZE = int(os.getenv("REGRESSOR_RENDER_QUEUE_SIZE", 16))
+REGRESSOR_RENDER_TIMEOUT = float(os.getenv("REGRESSOR_RENDER_TIMEOUT", 30))
+# Single-model fits whose estimated cost exceeds this run as Celery tasks (see regressor.jobs)
+REGRESSOR_ASYNC_COST_LIMIT = float(os.getenv("REGRESSOR_ASYNC_COST_LIMIT", 50_000_000))
+# Seconds a queued job id stays pollable (Celery keeps results for a day by default)
+REGRESSOR_JOB_TTL = int(os.getenv("REGRESSOR_JOB_TTL", 86400))
+# Cores a single random forest fit may use (defaults to REGRESSOR_MAX_WORKERS)
+REGRESSOR_RF_MAX_JOBS = int(os.getenv("REGRESSOR_RF_MAX_JOBS") or REGRESSOR_MAX_WORKERS)
+# Spatial indexes (KD-tree / ball tree) kept in memory per process for k-NN regression
+REGRESSOR_KNN_INDEX_CACHE_SIZE = int(os.getenv("REGRESSOR_KNN_INDEX_CACHE_SIZE", 8))
+# Exhaustive best-subset selection scores 2^p subsets, so it is limited to small p
+REGRESSOR_BEST_SUBSET_MAX_FEATURES = int(os.getenv("REGRESSOR_BEST_SUBSET_MAX_FEATURES", 15))
+# Bootstrap confidence bands: resample cap and wall-clock budget per request
+REGRESSOR_BOOTSTRAP_MAX_RESAMPLES = int(os.getenv("REGRESSOR_BOOTSTRAP_MAX_RESAMPLES", 1000))
+REGRESSOR_BOOTSTRAP_TIME_LIMIT = float(os.getenv("REGRESSOR_BOOTSTRAP_TIME_LIMIT", 60))
+
+# Native thread budgets (see config/runtime_limits.py). RUNTIME_CPU_BUDGET / RUNTIME_WORKER_PROCESSES
+# / RUNTIME_THREADS_PER_WORKER are read from the environment at process start; per-endpoint caps
+# are "scope=threads" pairs, e.g. "regressor.random-forest=4,network.training=8,regressor=2"
+RUNTIME_THREAD_LIMITS = parse_thread_limits(os.getenv("RUNTIME_THREAD_LIMITS", ""))
 
 # Artifact cleanup policy: number of days to retain saved artifacts before pruning
 ARTIFACT_RETENTION_DAYS = int(os.getenv("ARTIFACT_RETENTION_DAYS", 30))
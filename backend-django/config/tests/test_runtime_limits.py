@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from threadpoolctl import threadpool_info
+
+from config import runtime_limits
+
+
+class RuntimeLimitsTests(SimpleTestCase):
+    def test_budget_is_split_across_worker_processes(self):
+        with mock.patch.dict(os.environ, {"RUNTIME_CPU_BUDGET": "16", "WEB_CONCURRENCY": "4"}):
+            self.assertEqual(runtime_limits.threads_per_worker(), 4)
+        with mock.patch.dict(os.environ, {"RUNTIME_CPU_BUDGET": "2", "RUNTIME_WORKER_PROCESSES": "8"}):
+            self.assertEqual(runtime_limits.threads_per_worker(), 1)
+        with mock.patch.dict(os.environ, {"RUNTIME_THREADS_PER_WORKER": "3"}):
+            self.assertEqual(runtime_limits.threads_per_worker(), 3)
+
+    def test_process_start_exports_thread_variables(self):
+        self.assertEqual(os.environ["OMP_NUM_THREADS"], os.environ["OPENBLAS_NUM_THREADS"])
+        self.assertIn("TF_NUM_INTRAOP_THREADS", os.environ)
+
+    def test_process_start_reads_budget_from_dotenv(self):
+        # A fresh interpreter whose .env (swapped in for backend-django/.env) sets the budget
+        code = (
+            "import sys, dotenv\n"
+            "load = dotenv.load_dotenv\n"
+            "dotenv.load_dotenv = lambda *args, **kwargs: load(sys.argv[1])\n"
+            "import os, config\n"
+            "print(os.environ['OMP_NUM_THREADS'], os.environ['TF_NUM_INTEROP_THREADS'])\n"
+        )
+        env = {k: v for k, v in os.environ.items() if not k.startswith("RUNTIME_") and "NUM_THREADS" not in k
+               and not k.startswith("TF_NUM_")}
+        with tempfile.TemporaryDirectory() as tmp:
+            dotenv = os.path.join(tmp, ".env")
+            with open(dotenv, "w") as fh:
+                fh.write("RUNTIME_THREADS_PER_WORKER=3\nRUNTIME_TF_INTER_OP_THREADS=1\n")
+            out = subprocess.run(
+                [sys.executable, "-c", code, dotenv], cwd=Path(__file__).resolve().parents[2],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+        self.assertEqual(out.split()[-2:], ["3", "1"])
+
+    @override_settings(RUNTIME_THREAD_LIMITS={"regressor.random-forest": 1, "regressor": 2})
+    def test_endpoint_overrides(self):
+        self.assertEqual(runtime_limits.limit_for("regressor.random-forest"), 1)
+        self.assertEqual(runtime_limits.limit_for("regressor.linear"), 2)
+        self.assertEqual(runtime_limits.limit_for("network.training"), runtime_limits.threads_per_worker())
+
+        with runtime_limits.limit_threads("regressor.random-forest") as limit:
+            self.assertEqual(limit, 1)
+            self.assertTrue(all(pool["num_threads"] == 1 for pool in threadpool_info()))
+
+    def test_malformed_limits_are_skipped(self):
+        with self.assertLogs("config.runtime_limits", "WARNING") as logs:
+            limits = runtime_limits.parse_thread_limits("regressor=2, network.training=x,=3,bad,regressor.knn=1,")
+        self.assertEqual(limits, {"regressor": 2, "regressor.knn": 1})
+        self.assertEqual(len(logs.output), 3)
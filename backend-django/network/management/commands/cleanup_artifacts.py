@@ -8,6 +8,7 @@ from django.core.management.base import BaseCommand
 from django.conf import settings
 
 from network.models import TrainingJob
+from regressor.model_store import prune_models
 
 
 class Command(BaseCommand):
@@ -41,6 +42,11 @@ class Command(BaseCommand):
                 except Exception as exc:
                     self.stderr.write(f"Failed to remove {p}: {exc}")
 
+        # Fitted regressors live in storage and have their own (shorter) retention
+        model_days = getattr(settings, "REGRESSOR_MODEL_RETENTION_DAYS", days)
+        pruned_models = prune_models(model_days)
+        self.stdout.write(f"Removed {pruned_models} regressor models older than {model_days} days")
+
         # Clear artifact_path references from TrainingJob rows whose files are missing
         jobs = TrainingJob.objects.exclude(artifact_path="").all()
         cleared = 0
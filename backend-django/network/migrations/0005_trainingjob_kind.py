@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0004_edge_client_id_edge_stable_id_layernode_client_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingjob',
+            name='kind',
+            field=models.CharField(choices=[('training', 'Training'), ('sweep', 'Hyperparameter sweep')], default='training', max_length=16),
+        ),
+    ]
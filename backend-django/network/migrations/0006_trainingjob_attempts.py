@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0005_trainingjob_kind'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainingjob',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
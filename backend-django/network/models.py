@@ -139,6 +139,12 @@ class TrainingStatus(models.TextChoices):
     CANCELLED = "cancelled", "Cancelled"
 
 
+class TrainingJobKind(models.TextChoices):
+    TRAINING = "training", "Training"
+    # Several trials over one dataset; the best trial's model becomes the job artifact
+    SWEEP = "sweep", "Hyperparameter sweep"
+
+
 class TrainingJob(TimeStampedModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     graph = models.ForeignKey(
@@ -147,6 +153,12 @@ class TrainingJob(TimeStampedModel):
         related_name="training_jobs",
     )
 
+    kind = models.CharField(
+        max_length=16,
+        choices=TrainingJobKind.choices,
+        default=TrainingJobKind.TRAINING,
+    )
+
     status = models.CharField(
         max_length=16,
         choices=TrainingStatus.choices,
@@ -171,6 +183,9 @@ class TrainingJob(TimeStampedModel):
     # Error message when FAILED
     error = models.TextField(blank=True, default="")
 
+    # Runs started by workers; above 1 the task was redelivered after a worker was lost
+    attempts = models.PositiveIntegerField(default=0)
+
     class Meta(TimeStampedModel.Meta):
         ordering = ("-created_at",)
 
@@ -371,6 +371,7 @@ class TrainingJobSerializer(serializers.ModelSerializer):
         fields = (
             "id",
             "graph",
+            "kind",
             "status",
             "params",
             "result",
@@ -378,21 +379,37 @@ class TrainingJobSerializer(serializers.ModelSerializer):
             "artifact_path",
             "progress",
             "error",
+            "attempts",
             "created_at",
             "updated_at",
         )
         read_only_fields = (
             "id",
+            "kind",
             "status",
             "result",
             "artifact_path",
             "progress",
             "error",
+            "attempts",
             "created_at",
             "updated_at",
         )
 
 
+# Single-run options that sweep trials and cross-validation folds do not apply
+TRIAL_IGNORED_FIELDS = (
+    "jit_compile",
+    "mixed_precision",
+    "steps_per_execution",
+    "intra_op_threads",
+    "inter_op_threads",
+    "profile_trace",
+    "save_best_model",
+    "save_training_logs",
+)
+
+
 class TrainingStartSerializer(serializers.Serializer):
     x_columns = serializers.ListField(child=serializers.CharField(), required=True)
     y_column = serializers.CharField(required=True)
@@ -401,6 +418,10 @@ class TrainingStartSerializer(serializers.Serializer):
     metrics = serializers.ListField(child=serializers.CharField(), required=False, allow_empty=True)
     epochs = serializers.IntegerField(required=False, min_value=1, default=100)
     batch_size = serializers.IntegerField(required=False, min_value=1, default=25)
+    # Probe candidate batch sizes before training and use the fastest that fits in memory
+    auto_batch_size = serializers.BooleanField(required=False, default=False)
+    # Average the gradients of N batches per update: an effective batch of N x batch_size (0/1 = off)
+    gradient_accumulation_steps = serializers.IntegerField(required=False, min_value=0, max_value=1024, default=0)
     validation_split = serializers.FloatField(required=False, min_value=0.0, max_value=1.0, default=0.1)
     test_split = serializers.FloatField(required=False, min_value=0.0, max_value=1.0, default=0.1)
     y_one_hot = serializers.BooleanField(required=False, default=False)
@@ -427,6 +448,26 @@ class TrainingStartSerializer(serializers.Serializer):
     save_best_model = serializers.BooleanField(required=False, default=False)
     save_training_logs = serializers.BooleanField(required=False, default=False)
 
+    # K-fold cross-validation instead of a single split (0 = off)
+    cv_folds = serializers.IntegerField(required=False, min_value=0, max_value=20, default=0)
+
+    # Warm start from a finished job's weights
+    warm_start_from = serializers.UUIDField(required=False, allow_null=True)
+    freeze_layers = serializers.IntegerField(required=False, min_value=0, default=0)
+    new_rows_only = serializers.BooleanField(required=False, default=False)
+
+    # TensorFlow runtime; "auto"/0 are resolved from the model size by the worker
+    jit_compile = serializers.ChoiceField(choices=["auto", "true", "false"], required=False, default="auto")
+    mixed_precision = serializers.ChoiceField(
+        choices=["auto", "float32", "mixed_bfloat16", "mixed_float16"], required=False, default="auto"
+    )
+    steps_per_execution = serializers.IntegerField(required=False, min_value=0, default=0)
+    intra_op_threads = serializers.IntegerField(required=False, min_value=0, default=0)
+    inter_op_threads = serializers.IntegerField(required=False, min_value=0, default=0)
+
+    # Also record a TensorFlow profiler trace (downloadable as artifact type=profile)
+    profile_trace = serializers.BooleanField(required=False, default=False)
+
     def to_internal_value(self, data):
         # Allow JSON strings for list fields (common from multipart/form-data)
         import json
@@ -449,6 +490,10 @@ class TrainingStartSerializer(serializers.Serializer):
                     # Leave as-is; ListField will raise validation error if needed
                     pass
 
+        # Accept JSON booleans and any casing for the tri-state jit_compile
+        if "jit_compile" in data:
+            data["jit_compile"] = str(data["jit_compile"]).lower()
+
         return super().to_internal_value(data)
 
     def validate(self, attrs):
@@ -460,6 +505,68 @@ class TrainingStartSerializer(serializers.Serializer):
                 "validation_split": ["validation_split + test_split must be < 1.0"],
                 "test_split": ["validation_split + test_split must be < 1.0"],
             })
+        if attrs.get("cv_folds") == 1:
+            raise serializers.ValidationError({"cv_folds": ["Use at least 2 folds, or 0 to disable cross-validation"]})
+        if attrs.get("auto_batch_size") and (attrs.get("cv_folds") or 0) >= 2:
+            raise serializers.ValidationError({"auto_batch_size": ["Cross-validation runs use the given batch_size"]})
+        if (attrs.get("cv_folds") or 0) >= 2:
+            self._reject_trial_ignored(attrs, "Not applied to cross-validation folds")
+        source = attrs.get("warm_start_from")
+        if source is None:
+            if attrs.get("freeze_layers") or attrs.get("new_rows_only"):
+                raise serializers.ValidationError({"warm_start_from": ["freeze_layers and new_rows_only need warm_start_from"]})
+        else:
+            from network.services.warm_start import get_source_job
+
+            if (attrs.get("cv_folds") or 0) >= 2:
+                raise serializers.ValidationError({"warm_start_from": ["Cannot warm-start cross-validation runs"]})
+            try:
+                get_source_job(source)
+            except ValueError as exc:
+                raise serializers.ValidationError({"warm_start_from": [str(exc)]})
+            # Stored in the job's JSON params
+            attrs["warm_start_from"] = str(source)
+        return attrs
+
+    def _reject_trial_ignored(self, attrs, message):
+        changed = [name for name in TRIAL_IGNORED_FIELDS if name in attrs and attrs[name] != self.fields[name].default]
+        if changed:
+            raise serializers.ValidationError({name: [message] for name in changed})
+
+
+class TrainingSweepSerializer(TrainingStartSerializer):
+    """Training parameters plus the `sweep` configuration (see network/services/sweeps.py)."""
+
+    sweep = serializers.JSONField(required=True)
+
+    def to_internal_value(self, data):
+        import json
+
+        data = dict(data)
+        sweep = data.get("sweep")
+        if isinstance(sweep, (list, tuple)) and len(sweep) == 1:
+            sweep = sweep[0]
+        # Sent as a JSON string from multipart/form-data
+        if isinstance(sweep, str):
+            try:
+                data["sweep"] = json.loads(sweep)
+            except ValueError:
+                raise serializers.ValidationError({"sweep": ["Must be a JSON object"]})
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        from network.services.sweeps import parse_sweep
+
+        attrs = super().validate(attrs)
+        if attrs.get("warm_start_from"):
+            raise serializers.ValidationError({"warm_start_from": ["Sweep trials always start from scratch"]})
+        if attrs.get("auto_batch_size"):
+            raise serializers.ValidationError({"auto_batch_size": ["Sweep trials use the given batch_size; sweep it instead"]})
+        self._reject_trial_ignored(attrs, "Not applied to sweep trials")
+        try:
+            attrs["sweep"] = parse_sweep(attrs["sweep"], attrs.get("epochs", 100))
+        except (TypeError, ValueError) as exc:
+            raise serializers.ValidationError({"sweep": [str(exc)]})
         return attrs
 
 
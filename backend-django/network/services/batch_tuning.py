@@ -0,0 +1,187 @@
+"""Automatic batch size selection (``auto_batch_size``).
+
+Before the real fit, `tune_batch_size` runs short timed probes of the model
+at candidate batch sizes (powers of two plus the requested size) on the
+leading rows of the training split, each on a fresh clone so the job's
+weights are untouched. Every probe fits `PROBE_STEPS` steps once to trace
+the train step and once more timed; the fastest size in samples/sec wins.
+
+Probing stops before a size whose estimated memory exceeds the budget, i.e.
+`MEMORY_HEADROOM` of what the worker has left (its memory limit minus the
+RSS observed before probing), once a probe pushes RSS above
+`RSS_CEILING` of the limit, or at the first out-of-memory error. The
+estimate counts weights, gradients and two optimizer slots per parameter
+plus each layer's activations and their gradients per sample.
+
+If the real fit still runs out of memory, `fallback_batch_size` gives the
+next smaller size that probed fine and the job continues from the last
+completed epoch with it. A worker killed by the kernel's OOM killer raises
+nothing: the job is requeued and resumes from its last checkpoint, which
+carries the tuning, and `after_worker_lost` moves it one size down. A worker
+killed before the first checkpoint tunes again from scratch on the next run,
+so ``NETWORK_MAX_ATTEMPTS`` is what bounds those retries.
+
+With gradient accumulation the tuned size is the micro-batch: each probe
+step is one accumulated batch, so the effective batch grows with it.
+
+The probes, the budget and any fallbacks are stored in
+``result["batch_tuning"]``.
+"""
+from __future__ import annotations
+
+import math
+import os
+import time
+from dataclasses import replace
+from typing import Any, Dict, List
+
+import numpy as np
+from django.conf import settings
+
+from network.services.fitting import TrainParams, compile_model
+from network.services.profiling import current_rss_mb
+from network.services.runtime_config import resolve_runtime
+
+MIN_BATCH_SIZE = 8
+MAX_BATCH_SIZE = 2048
+PROBE_STEPS = 8
+MEMORY_HEADROOM = 0.8
+RSS_CEILING = 0.9
+# Weights, gradients and two optimizer slots (Adam's moments)
+_PARAM_COPIES = 4
+_FLOAT_BYTES = 4
+
+
+def memory_limit_mb() -> float:
+    """The worker's memory limit: the setting, else the cgroup limit, else physical memory."""
+    configured = float(settings.NETWORK_WORKER_MEMORY_MB or 0)
+    if configured > 0:
+        return configured
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as fh:
+                text = fh.read().strip()
+        except OSError:
+            continue
+        # "max" (v2) or a huge sentinel (v1) mean unlimited
+        if text.isdigit() and int(text) < 1 << 60:
+            return int(text) / 2**20
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 2**20
+
+
+def free_memory_mb() -> float:
+    """What the worker has left: its memory limit minus the current RSS."""
+    return max(memory_limit_mb() - current_rss_mb(), 0.0)
+
+
+def activation_units(model) -> int:
+    """Values per sample in the outputs of all the model's layers."""
+    total = 0
+    for layer in model.layers:
+        try:
+            shape = layer.output.shape
+        except (AttributeError, ValueError):
+            continue
+        total += int(np.prod([d for d in shape[1:] if d is not None] or [1]))
+    return total
+
+
+def estimate_step_mb(param_count: int, units: int, batch_size: int, accumulating: bool = False) -> float:
+    """Estimated memory of one train step at `batch_size`, in MiB."""
+    # Gradient accumulation keeps one more copy of the parameters
+    params = (_PARAM_COPIES + int(accumulating)) * param_count
+    activations = 2 * units * batch_size
+    return (params + activations) * _FLOAT_BYTES / 2**20
+
+
+def candidate_sizes(train_rows: int, requested: int) -> List[int]:
+    """Batch sizes to probe, ascending: powers of two within the training rows plus `requested`."""
+    largest = min(train_rows, MAX_BATCH_SIZE)
+    sizes = {2**k for k in range(int(math.log2(MIN_BATCH_SIZE)), int(math.log2(MAX_BATCH_SIZE)) + 1) if 2**k <= largest}
+    if 0 < requested <= train_rows:
+        sizes.add(int(requested))
+    return sorted(sizes) or [max(train_rows, 1)]
+
+
+def is_oom(exc: BaseException) -> bool:
+    # TensorFlow raises ResourceExhaustedError when an allocation fails
+    return isinstance(exc, MemoryError) or type(exc).__name__ == "ResourceExhaustedError"
+
+
+def _probe(model, params: TrainParams, metric_names: List[str], X: np.ndarray, y: np.ndarray) -> float:
+    """Samples/sec of a fresh clone of `model` training on `X` at ``params.batch_size``."""
+    from keras.models import clone_model
+
+    probe = clone_model(model)
+    runtime = resolve_runtime(params, model.count_params(), len(X))
+    compile_model(probe, params, metric_names, runtime.jit_compile, runtime.steps_per_execution)
+    fit_kwargs = dict(batch_size=params.batch_size, epochs=1, verbose=0, shuffle=False)
+    # The first fit traces and builds the train step; the second is timed
+    probe.fit(X, y, **fit_kwargs)
+    start = time.perf_counter()
+    probe.fit(X, y, **fit_kwargs)
+    return len(X) / max(time.perf_counter() - start, 1e-9)
+
+
+def tune_batch_size(model, params: TrainParams, metric_names: List[str], X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
+    """Probe candidate batch sizes on the training rows `X`/`y`; returns the choice and the probes."""
+    limit = memory_limit_mb()
+    budget = free_memory_mb() * MEMORY_HEADROOM
+    param_count = model.count_params()
+    units = activation_units(model)
+
+    probes: List[Dict[str, Any]] = []
+    for size in candidate_sizes(len(X), params.batch_size):
+        estimate = estimate_step_mb(param_count, units, size, params.gradient_accumulation_steps >= 2)
+        probe: Dict[str, Any] = {"batch_size": size, "estimated_mb": round(estimate, 3)}
+        probes.append(probe)
+        if estimate > budget:
+            probe["status"] = "over_budget"
+            break
+        rows = min(len(X), size * PROBE_STEPS)
+        try:
+            probe["samples_per_sec"] = _probe(model, replace(params, batch_size=size), metric_names, X[:rows], y[:rows])
+        except Exception as exc:
+            if not is_oom(exc):
+                raise
+            probe["status"] = "oom"
+            break
+        probe["rss_mb"] = round(current_rss_mb(), 1)
+        probe["status"] = "ok"
+        if probe["rss_mb"] > limit * RSS_CEILING:
+            break
+
+    ok = [p for p in probes if p["status"] == "ok"]
+    if ok:
+        chosen = max(ok, key=lambda p: p["samples_per_sec"])["batch_size"]
+    else:
+        chosen = min(params.batch_size, probes[0]["batch_size"])
+    return {
+        "batch_size": chosen,
+        "requested_batch_size": params.batch_size,
+        "memory_limit_mb": round(limit, 1),
+        "memory_budget_mb": round(budget, 1),
+        "probes": probes,
+        "fallbacks": [],
+    }
+
+
+def fallback_batch_size(tuning: Dict[str, Any] | None, current: int, exc: BaseException) -> int | None:
+    """Smaller batch size to retry with after `exc`, or None when the error is not an OOM to recover from."""
+    if tuning is None or not is_oom(exc):
+        return None
+    smaller = [p["batch_size"] for p in tuning["probes"] if p["status"] == "ok" and p["batch_size"] < current]
+    if smaller:
+        return max(smaller)
+    return current // 2 if current // 2 >= 1 else None
+
+
+def after_worker_lost(tuning: Dict[str, Any], epoch: int) -> Dict[str, Any]:
+    """`tuning` restored from the checkpoint of a run whose worker was lost, moved one batch size down."""
+    current = tuning["batch_size"]
+    # Most likely the OOM killer: handled like an out-of-memory error the worker never got to raise
+    smaller = fallback_batch_size(tuning, current, MemoryError())
+    if smaller is not None:
+        tuning["fallbacks"].append({"from": current, "to": smaller, "epoch": epoch, "worker_lost": True})
+        tuning["batch_size"] = smaller
+    return tuning
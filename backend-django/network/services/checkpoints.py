@@ -0,0 +1,191 @@
+"""Periodic training checkpoints so retried or requeued jobs resume where they stopped.
+
+While a job trains, `checkpoint_callback` saves (at most every
+NETWORK_CHECKPOINT_INTERVAL seconds, at an epoch boundary) the model with its
+optimizer state, plus a small JSON state (completed epochs, history so far,
+Python/NumPy/TensorFlow RNG state, and the job's batch tuning) to `network.storage` under
+``checkpoints/job-<id>/``. The model file of an epoch is written before its
+state file, so a state file always points at a complete model; older
+checkpoints are deleted once the new one is in place.
+
+When the task is redelivered after its worker was killed (it acknowledges
+late) `load_latest_checkpoint` restores the model and RNG state and training
+continues from the saved epoch, so at most one interval of work is lost.
+Errors raised by training itself fail the job without a retry, and a job is
+failed once it has been started ``NETWORK_MAX_ATTEMPTS`` times. Checkpoints
+are removed once the job succeeds, fails or is cancelled.
+"""
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+from django.conf import settings
+
+from network import storage
+
+logger = logging.getLogger(__name__)
+
+_STATE_RE = re.compile(r"^epoch-(\d+)\.json$")
+
+
+def checkpoint_prefix(job_id: str) -> str:
+    return f"checkpoints/job-{job_id}"
+
+
+def _key(job_id: str, epoch: int, suffix: str) -> str:
+    return f"{checkpoint_prefix(job_id)}/epoch-{epoch:05d}{suffix}"
+
+
+def capture_rng_state() -> Dict[str, Any]:
+    """JSON-serializable state of the Python, NumPy and TensorFlow global generators."""
+    version, internal, gauss = random.getstate()
+    np_state = np.random.get_state()
+    state: Dict[str, Any] = {
+        "python": [version, list(internal), gauss],
+        "numpy": [np_state[0], np_state[1].tolist(), int(np_state[2]), int(np_state[3]), float(np_state[4])],
+    }
+    try:
+        import tensorflow as tf
+
+        state["tensorflow"] = tf.random.get_global_generator().state.numpy().tolist()
+    except Exception:
+        pass
+    return state
+
+
+def restore_rng_state(state: Dict[str, Any]) -> None:
+    if "python" in state:
+        version, internal, gauss = state["python"]
+        random.setstate((version, tuple(internal), gauss))
+    if "numpy" in state:
+        name, keys, pos, has_gauss, cached = state["numpy"]
+        np.random.set_state((name, np.asarray(keys, dtype=np.uint32), pos, has_gauss, cached))
+    if "tensorflow" in state:
+        try:
+            import tensorflow as tf
+
+            tf.random.get_global_generator().reset(np.asarray(state["tensorflow"], dtype=np.int64))
+        except Exception:
+            pass
+
+
+@dataclass
+class Checkpoint:
+    """A restored checkpoint: the compiled model and the state saved with it."""
+
+    model: Any
+    epoch: int
+    history: Dict[str, List[float]]
+    rng: Dict[str, Any]
+    # Job state saved alongside, e.g. ``batch_tuning``
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def save_checkpoint(
+    job_id: str, model, epoch: int, history: Dict[str, List[float]], extra: Dict[str, Any] | None = None
+) -> None:
+    """Save the model (with optimizer state) after `epoch` completed epochs, then drop older checkpoints."""
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".keras")
+    tmp.close()
+    try:
+        model.save(tmp.name)
+        model_key = _key(job_id, epoch, ".keras")
+        state_key = _key(job_id, epoch, ".json")
+        # `default_storage.save` renames instead of overwriting
+        for key in (model_key, state_key):
+            storage.delete(key)
+        with open(tmp.name, "rb") as fh:
+            model_key = storage.save_file(model_key, fh)
+        state = {"epoch": epoch, "model": model_key, "history": history, "rng": capture_rng_state(), "extra": extra or {}}
+        storage.save_file(state_key, io.BytesIO(json.dumps(state).encode()))
+    finally:
+        os.remove(tmp.name)
+    for name in storage.list_files(checkpoint_prefix(job_id)):
+        match = re.match(r"^epoch-(\d+)\.", name)
+        if match and int(match.group(1)) < epoch:
+            storage.delete(f"{checkpoint_prefix(job_id)}/{name}")
+
+
+def load_latest_checkpoint(job_id: str) -> Checkpoint | None:
+    """The newest complete checkpoint of the job, or None when there is none (or it is unreadable)."""
+    epochs = sorted(
+        (int(m.group(1)) for m in map(_STATE_RE.match, storage.list_files(checkpoint_prefix(job_id))) if m),
+        reverse=True,
+    )
+    import keras
+
+    for epoch in epochs:
+        try:
+            with storage.open_stream(_key(job_id, epoch, ".json")) as fh:
+                state = json.loads(fh.read())
+            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".keras")
+            try:
+                with storage.open_stream(state["model"]) as fh:
+                    tmp.write(fh.read())
+                tmp.close()
+                model = keras.models.load_model(tmp.name)
+            finally:
+                tmp.close()
+                os.remove(tmp.name)
+        except Exception:
+            logger.warning("Skipping unreadable checkpoint %s of job %s", epoch, job_id, exc_info=True)
+            continue
+        return Checkpoint(
+            model=model,
+            epoch=int(state["epoch"]),
+            history=state.get("history") or {},
+            rng=state.get("rng") or {},
+            extra=state.get("extra") or {},
+        )
+    return None
+
+
+def clear_checkpoints(job_id: str) -> None:
+    for name in storage.list_files(checkpoint_prefix(job_id)):
+        storage.delete(f"{checkpoint_prefix(job_id)}/{name}")
+
+
+def checkpoint_callback(
+    job_id: str,
+    history: Dict[str, List[float]] | None = None,
+    interval: float | None = None,
+    extra: Dict[str, Any] | None = None,
+):
+    """
+    Keras callback saving a checkpoint at the end of an epoch once `interval` seconds passed
+    since the last one. `history` is the history restored from a previous checkpoint; `extra`
+    is saved as it is at each checkpoint, so the caller may update it in place.
+    """
+    from keras.callbacks import Callback
+
+    interval = float(settings.NETWORK_CHECKPOINT_INTERVAL if interval is None else interval)
+
+    class _CheckpointCallback(Callback):  # pragma: no cover - relies on Keras runtime
+        def __init__(self):
+            super().__init__()
+            self.history = {k: list(v) for k, v in (history or {}).items()}
+            self._last = time.monotonic()
+
+        def on_epoch_end(self, epoch, logs=None):  # type: ignore[override]
+            for key, value in (logs or {}).items():
+                self.history.setdefault(key, []).append(float(value))
+            if self.model.stop_training or time.monotonic() - self._last < interval:
+                return
+            try:
+                save_checkpoint(job_id, self.model, int(epoch) + 1, self.history, extra)
+            except Exception:
+                # Checkpoints are a safety net; never fail the training run over one
+                logger.warning("Could not checkpoint job %s", job_id, exc_info=True)
+            self._last = time.monotonic()
+
+    return _CheckpointCallback()
@@ -0,0 +1,105 @@
+"""K-fold cross-validation of one graph over one loaded dataset.
+
+With ``cv_folds >= 2`` the job splits every row into `cv_folds` shuffled
+folds and trains one model per fold (on the other folds, validating on the
+held-out one) concurrently in a `TrialPool`: the dataset is memory-mapped
+by the fold processes and each fold rebuilds the model from the config the
+parent built and checked once. ``validation_split``/``test_split`` do not
+apply; the held-out fold is the validation and evaluation set.
+
+The result keeps each fold's history and evaluation, the mean and standard
+deviation of the fold evaluations, and the per-epoch mean history (over the
+epochs every fold reached) as the job's ``history``. No model artifact is
+saved: cross-validation estimates how well the configuration generalizes.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+from django.conf import settings
+
+from config.runtime_limits import threads_per_worker
+from network.models import TrainingJob
+from network.services import events
+from network.services.batch_tuning import free_memory_mb
+from network.services.cancellation import CancellationToken, TrainingCancelled
+from network.services.fitting import TrainParams, kfold_indices
+from network.services.sweeps import run_trials
+from network.services.trial_pool import TrialPool, TrialSpec, pool_size
+
+
+def summarize_folds(folds: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Mean/std of the fold evaluations and the per-epoch mean history."""
+    evaluations = [f["evaluation"] for f in folds if f.get("evaluation")]
+    keys = sorted(set().union(*evaluations)) if evaluations else []
+    mean = {k: float(np.mean([e[k] for e in evaluations if k in e])) for k in keys}
+    std = {k: float(np.std([e[k] for e in evaluations if k in e])) for k in keys}
+
+    history: Dict[str, List[float]] = {}
+    for key in sorted(set().union(*(f["history"] for f in folds))):
+        series = [f["history"].get(key) or [] for f in folds]
+        # Early stopping can end folds at different epochs
+        length = min(len(s) for s in series)
+        history[key] = [float(np.mean([s[i] for s in series])) for i in range(length)]
+    return {"mean": mean, "std": std, "history": history}
+
+
+def run_cross_validation(job: TrainingJob, params: TrainParams, model, X: np.ndarray, y: np.ndarray, metric_names: List[str], token: CancellationToken) -> Dict[str, Any]:
+    """Train and evaluate every fold of the job's dataset and return the job result."""
+    if params.cv_folds > len(X):
+        raise ValueError(f"cv_folds ({params.cv_folds}) exceeds the number of rows ({len(X)})")
+    splits = kfold_indices(len(X), params.cv_folds)
+    workers, threads = pool_size(
+        len(splits), settings.NETWORK_TRIAL_WORKERS, threads_per_worker(),
+        free_memory_mb(), settings.NETWORK_TRIAL_PROCESS_MB,
+    )
+    reporter = events.ProgressReporter(str(job.id))
+    reporter.live.update(folds=len(splits))
+    done_epochs: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    with TrialPool(X, y, model.to_json(), workers, threads, inline_cancel_event=token.event) as pool:
+        specs = [
+            TrialSpec(
+                trial_id=f"fold{k}",
+                params=dict(job.params or {}),
+                metric_names=metric_names,
+                train_idx=train_idx,
+                val_idx=held_out,
+                test_idx=held_out,
+                epochs=params.epochs,
+                evaluate=True,
+            )
+            for k, (train_idx, held_out) in enumerate(splits)
+        ]
+        outcomes = run_trials(token, pool, specs, reporter, done_epochs, float(params.epochs * len(specs)))
+    reporter.flush()
+    if token.cancelled:
+        raise TrainingCancelled(f"Cross-validation {job.id} was cancelled")
+
+    folds = [
+        {
+            "fold": k,
+            "rows": int(len(spec.val_idx)),
+            "history": outcomes[spec.trial_id]["history"],
+            "evaluation": outcomes[spec.trial_id]["evaluation"],
+            "epochs_trained": outcomes[spec.trial_id]["epochs_trained"],
+            "elapsed": outcomes[spec.trial_id]["elapsed"],
+        }
+        for k, spec in enumerate(specs)
+    ]
+    summary = summarize_folds(folds)
+    return {
+        "history": summary["history"],
+        "evaluation": summary["mean"],
+        "cross_validation": {
+            "folds": folds,
+            "mean": summary["mean"],
+            "std": summary["std"],
+            "workers": workers,
+            "threads_per_fold": threads,
+            "elapsed": time.perf_counter() - started,
+        },
+    }
@@ -0,0 +1,403 @@
+"""Live training events pushed to watchers instead of polled from the database.
+
+The training callback publishes progress snapshots and status changes to a
+per-job channel; `TrainingJobViewSet.stream_events` relays them to clients
+as Server-Sent Events. The latest event of each job is also kept under its
+own key, so a client that connects (or reconnects) mid-run gets the current
+state at once instead of waiting for the next batch. Cancellation requests
+travel on the same channel, plus a flag key for workers that start later
+(see `network.services.cancellation`).
+
+Backends (``NETWORK_EVENT_BACKEND``):
+- ``redis``: pub/sub plus a state key with a TTL, shared by web and Celery processes
+- ``memory``: per-process stand-in for tests and eager Celery
+"""
+from __future__ import annotations
+
+import abc
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator
+
+from django.conf import settings
+
+from network.models import TrainingJob, TrainingStatus
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {TrainingStatus.SUCCEEDED, TrainingStatus.FAILED, TrainingStatus.CANCELLED}
+
+Event = Dict[str, Any]
+
+
+def is_terminal(event: Event | None) -> bool:
+    return bool(event) and event.get("type") == "status" and event.get("status") in TERMINAL_STATUSES
+
+
+class EventBus(abc.ABC):
+    """Publish/subscribe for job events; `listen` and `alisten` yield a ``receive(timeout)`` callable."""
+
+    @abc.abstractmethod
+    def publish(self, job_id: str, event: Event) -> None:
+        ...
+
+    @abc.abstractmethod
+    def latest(self, job_id: str) -> Event | None:
+        ...
+
+    @abc.abstractmethod
+    def request_cancel(self, job_id: str) -> None:
+        """Set the job's cancellation flag (checked by workers that start after the event was sent)."""
+
+    @abc.abstractmethod
+    def cancel_requested(self, job_id: str) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def listen(self, job_id: str):
+        ...
+
+    @abc.abstractmethod
+    def alisten(self, job_id: str):
+        ...
+
+
+class InMemoryEventBus(EventBus):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Event] = {}
+        self._subscribers: Dict[str, set] = defaultdict(set)
+        self._cancelled: set = set()
+
+    def publish(self, job_id: str, event: Event) -> None:
+        with self._lock:
+            self._latest[job_id] = event
+            deliver = list(self._subscribers.get(job_id, ()))
+        for callback in deliver:
+            try:
+                callback(event)
+            except RuntimeError:
+                # The subscriber's event loop is already closed
+                pass
+
+    def latest(self, job_id: str) -> Event | None:
+        with self._lock:
+            return self._latest.get(job_id)
+
+    def request_cancel(self, job_id: str) -> None:
+        with self._lock:
+            self._cancelled.add(job_id)
+
+    def cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancelled
+
+    def _subscribe(self, job_id: str, callback: Callable[[Event], None]) -> None:
+        with self._lock:
+            self._subscribers[job_id].add(callback)
+
+    def _unsubscribe(self, job_id: str, callback: Callable[[Event], None]) -> None:
+        with self._lock:
+            self._subscribers[job_id].discard(callback)
+            if not self._subscribers[job_id]:
+                del self._subscribers[job_id]
+
+    @contextmanager
+    def listen(self, job_id: str):
+        inbox: "queue.Queue[Event]" = queue.Queue()
+        self._subscribe(job_id, inbox.put_nowait)
+
+        def receive(timeout: float) -> Event | None:
+            try:
+                return inbox.get(timeout=timeout)
+            except queue.Empty:
+                return None
+
+        try:
+            yield receive
+        finally:
+            self._unsubscribe(job_id, inbox.put_nowait)
+
+    @asynccontextmanager
+    async def alisten(self, job_id: str):
+        loop = asyncio.get_running_loop()
+        inbox: "asyncio.Queue[Event]" = asyncio.Queue()
+
+        def callback(event: Event) -> None:
+            # Published from the training thread; hand over to the subscriber's loop
+            loop.call_soon_threadsafe(inbox.put_nowait, event)
+
+        self._subscribe(job_id, callback)
+
+        async def receive(timeout: float) -> Event | None:
+            try:
+                return await asyncio.wait_for(inbox.get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        try:
+            yield receive
+        finally:
+            self._unsubscribe(job_id, callback)
+
+
+class RedisEventBus(EventBus):
+    def __init__(self, url: str, state_ttl: int, timeout: float = 2.0):
+        import redis
+
+        self.url = url
+        self.state_ttl = state_ttl
+        # Short socket timeouts: an unreachable Redis must not stall the training loop
+        self._timeouts = {"socket_connect_timeout": timeout, "socket_timeout": timeout}
+        self._client = redis.Redis.from_url(url, **self._timeouts)
+
+    @staticmethod
+    def _channel(job_id: str) -> str:
+        return f"network:training:{job_id}:events"
+
+    @staticmethod
+    def _state_key(job_id: str) -> str:
+        return f"network:training:{job_id}:state"
+
+    @staticmethod
+    def _cancel_key(job_id: str) -> str:
+        return f"network:training:{job_id}:cancel"
+
+    def publish(self, job_id: str, event: Event) -> None:
+        payload = json.dumps(event)
+        pipe = self._client.pipeline(transaction=False)
+        pipe.set(self._state_key(job_id), payload, ex=self.state_ttl)
+        pipe.publish(self._channel(job_id), payload)
+        pipe.execute()
+
+    def latest(self, job_id: str) -> Event | None:
+        raw = self._client.get(self._state_key(job_id))
+        return json.loads(raw) if raw else None
+
+    def request_cancel(self, job_id: str) -> None:
+        self._client.set(self._cancel_key(job_id), "1", ex=self.state_ttl)
+
+    def cancel_requested(self, job_id: str) -> bool:
+        return bool(self._client.exists(self._cancel_key(job_id)))
+
+    @contextmanager
+    def listen(self, job_id: str):
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self._channel(job_id))
+
+        def receive(timeout: float) -> Event | None:
+            message = pubsub.get_message(timeout=timeout)
+            return json.loads(message["data"]) if message else None
+
+        try:
+            yield receive
+        finally:
+            pubsub.close()
+
+    @asynccontextmanager
+    async def alisten(self, job_id: str):
+        from redis import asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.url, **self._timeouts)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self._channel(job_id))
+
+        async def receive(timeout: float) -> Event | None:
+            message = await pubsub.get_message(timeout=timeout)
+            return json.loads(message["data"]) if message else None
+
+        try:
+            yield receive
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_bus: EventBus | None = None
+_bus_key: tuple | None = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """The process-wide bus for the configured backend (rebuilt when the settings change)."""
+    global _bus, _bus_key
+    backend = str(getattr(settings, "NETWORK_EVENT_BACKEND", "redis")).lower()
+    key = (backend, getattr(settings, "NETWORK_EVENT_REDIS_URL", None))
+    with _bus_lock:
+        if _bus is None or _bus_key != key:
+            if backend == "memory":
+                _bus = InMemoryEventBus()
+            elif backend == "redis":
+                _bus = RedisEventBus(
+                    key[1],
+                    int(getattr(settings, "NETWORK_EVENT_STATE_TTL", 86400)),
+                    float(getattr(settings, "NETWORK_EVENT_REDIS_TIMEOUT", 2.0)),
+                )
+            else:
+                raise ValueError(f"Unknown NETWORK_EVENT_BACKEND '{backend}'")
+            _bus_key = key
+        return _bus
+
+
+# Publish failures are logged with a traceback at most once per this many seconds
+PUBLISH_WARNING_INTERVAL = 60.0
+_publish_warned_at = float("-inf")
+_publish_failures = 0
+
+
+def _publish(job_id: str, event: Event) -> None:
+    # Watchers are best-effort: a broker outage must never fail a training run
+    global _publish_warned_at, _publish_failures
+    try:
+        get_event_bus().publish(str(job_id), event)
+    except Exception:
+        _publish_failures += 1
+        now = time.monotonic()
+        if now - _publish_warned_at < PUBLISH_WARNING_INTERVAL:
+            return
+        logger.warning(
+            "Could not publish %s event for training job %s (%d failed since the last warning)",
+            event.get("type"), job_id, _publish_failures, exc_info=True,
+        )
+        _publish_warned_at = now
+        _publish_failures = 0
+
+
+def publish_progress(job_id: str, progress: float, live: Dict[str, Any]) -> None:
+    _publish(job_id, {"type": "progress", "job": str(job_id), "ts": time.time(), "progress": progress, "live": live})
+
+
+class ProgressReporter:
+    """
+    Pushes progress and live metrics to watchers (throttled to
+    ``NETWORK_EVENT_PUBLISH_INTERVAL``) and persists them to the job row only
+    every ``NETWORK_PROGRESS_PERSIST_INTERVAL`` seconds.
+    """
+
+    def __init__(self, job_id: str):
+        self.job_id = str(job_id)
+        self.progress = 0.05
+        self.live: Dict[str, Any] = {}
+        self.publish_interval = float(getattr(settings, "NETWORK_EVENT_PUBLISH_INTERVAL", 0.25))
+        self.persist_interval = float(getattr(settings, "NETWORK_PROGRESS_PERSIST_INTERVAL", 2.0))
+        self._published_at = 0.0
+        self._persisted_at = 0.0
+        self._base_result: Dict[str, Any] | None = None
+
+    def report(self, progress: float, force_publish: bool = False) -> None:
+        self.progress = progress
+        now = time.monotonic()
+        if force_publish or now - self._published_at >= self.publish_interval:
+            self._published_at = now
+            publish_progress(self.job_id, progress, dict(self.live))
+        if now - self._persisted_at >= self.persist_interval:
+            self._persisted_at = now
+            self._persist()
+
+    def flush(self) -> None:
+        """Publish and persist the current snapshot regardless of the throttles."""
+        if self.live:
+            publish_progress(self.job_id, self.progress, dict(self.live))
+            self._persisted_at = time.monotonic()
+            self._persist()
+
+    def _persist(self) -> None:
+        try:
+            if self._base_result is None:
+                # Read the stored result once so the live snapshot is merged without per-update reads
+                stored = TrainingJob.objects.filter(id=self.job_id).values_list("result", flat=True).first()
+                self._base_result = dict(stored or {})
+            TrainingJob.objects.filter(id=self.job_id).update(
+                progress=self.progress, result={**self._base_result, "live": dict(self.live)}
+            )
+        except Exception:
+            # best-effort; don't crash training on DB update issues
+            pass
+
+
+def status_event(job: TrainingJob) -> Event:
+    """Snapshot of a job row as an event (also the initial state when the bus has none)."""
+    result = job.result or {}
+    event: Event = {
+        "type": "status",
+        "job": str(job.id),
+        "ts": job.updated_at.timestamp() if job.updated_at else time.time(),
+        "status": job.status,
+        "progress": job.progress,
+    }
+    if result.get("live"):
+        event["live"] = result["live"]
+    if job.status in TERMINAL_STATUSES:
+        event["error"] = job.error or None
+        event["evaluation"] = result.get("evaluation")
+    return event
+
+
+def publish_status(job: TrainingJob) -> None:
+    _publish(job.id, {**status_event(job), "ts": time.time()})
+
+
+def _initial_state(bus: EventBus, job: TrainingJob) -> Event:
+    stored = status_event(job)
+    try:
+        published = bus.latest(str(job.id))
+    except Exception:
+        logger.warning("Could not read the latest event of training job %s", job.id, exc_info=True)
+        published = None
+    # The row wins once the job is finished or when the bus has nothing newer
+    if published is None or job.status in TERMINAL_STATUSES or published.get("ts", 0) < stored["ts"]:
+        return stored
+    return published
+
+
+def _format(event: Event) -> str:
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event)}\n\n"
+
+
+def _stream_settings() -> tuple[float, float]:
+    heartbeat = float(getattr(settings, "NETWORK_EVENT_HEARTBEAT", 15))
+    max_age = float(getattr(settings, "NETWORK_EVENT_STREAM_MAX_AGE", 3600))
+    return heartbeat, max_age
+
+
+def stream_events(job: TrainingJob) -> Iterator[str]:
+    """SSE frames for a job: the latest state first, then live events until it finishes."""
+    bus = get_event_bus()
+    heartbeat, max_age = _stream_settings()
+    yield "retry: 2000\n\n"
+    with bus.listen(str(job.id)) as receive:
+        # Subscribed before reading the snapshot, so no event falls in between
+        current = _initial_state(bus, job)
+        yield _format(current)
+        deadline = time.monotonic() + max_age
+        while not is_terminal(current) and time.monotonic() < deadline:
+            event = receive(heartbeat)
+            if event is None:
+                yield ": keep-alive\n\n"
+            elif event.get("ts", 0) > current.get("ts", 0):
+                current = event
+                yield _format(event)
+
+
+async def astream_events(job: TrainingJob) -> AsyncIterator[str]:
+    """`stream_events` for ASGI servers: waiting clients hold no worker thread."""
+    bus = get_event_bus()
+    heartbeat, max_age = _stream_settings()
+    yield "retry: 2000\n\n"
+    async with bus.alisten(str(job.id)) as receive:
+        current = await asyncio.to_thread(_initial_state, bus, job)
+        yield _format(current)
+        deadline = time.monotonic() + max_age
+        while not is_terminal(current) and time.monotonic() < deadline:
+            event = await receive(heartbeat)
+            if event is None:
+                yield ": keep-alive\n\n"
+            elif event.get("ts", 0) > current.get("ts", 0):
+                current = event
+                yield _format(event)
@@ -0,0 +1,247 @@
+"""Django-free building blocks of a training run.
+
+Shared by the job worker (`network.services.training`) and the trial
+subprocesses of sweeps and cross-validation (`network.services.trial_pool`),
+which must not touch the ORM: parameters, metric normalization, optimizer
+construction, compilation and the train/validation/test and k-fold splits.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass
+class TrainParams:
+    x_columns: List[str]
+    y_column: str
+    optimizer: str = "adam"
+    loss: str = "mse"
+    metrics: List[str] | None = None
+    epochs: int = 100
+    batch_size: int = 25
+    validation_split: float = 0.1
+    test_split: float = 0.1
+    y_one_hot: bool = False
+    learning_rate: float | None = None
+    shuffle: bool = True
+    validation_batch_size: int | None = None
+    # EarlyStopping
+    early_stopping: bool = False
+    es_monitor: str = "val_loss"
+    es_mode: str = "auto"
+    es_patience: int = 5
+    es_min_delta: float = 0.0
+    es_restore_best_weights: bool = True
+    # ReduceLROnPlateau
+    reduce_lr: bool = False
+    rlrop_monitor: str = "val_loss"
+    rlrop_factor: float = 0.1
+    rlrop_patience: int = 3
+    rlrop_min_lr: float = 1e-6
+    # Gradient Clipping
+    clipnorm: float | None = None
+    clipvalue: float | None = None
+    # Gradient accumulation: average the gradients of N batches per optimizer update (0/1 = off)
+    gradient_accumulation_steps: int = 0
+    # Auto-Balancing
+    auto_balance: bool = False
+    # Learning Rate Schedule
+    lr_schedule: str = "constant"
+    lr_decay_steps: int = 1000
+    lr_decay_rate: float = 0.96
+    # Checkpointing & Logs
+    save_best_model: bool = False
+    save_training_logs: bool = False
+    # K-fold cross-validation (0 = single train/validation/test split)
+    cv_folds: int = 0
+    # Warm start from another job's weights (network/services/warm_start.py)
+    warm_start_from: str | None = None
+    freeze_layers: int = 0
+    new_rows_only: bool = False
+    # TensorFlow runtime ("auto"/0 = resolved from model size; network/services/runtime_config.py)
+    jit_compile: str = "auto"
+    mixed_precision: str = "auto"
+    steps_per_execution: int = 0
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+    # Choose batch_size from timed probes (network/services/batch_tuning.py)
+    auto_batch_size: bool = False
+    # Record a TensorFlow profiler trace artifact (network/services/profiling.py)
+    profile_trace: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TrainParams":
+        return cls(
+            x_columns=list(data.get("x_columns") or []),
+            y_column=str(data.get("y_column")),
+            optimizer=str(data.get("optimizer", "adam")),
+            loss=str(data.get("loss", "mse")),
+            metrics=list(data.get("metrics") or []),
+            epochs=int(data.get("epochs", 10)),
+            batch_size=int(data.get("batch_size", 32)),
+            validation_split=float(data.get("validation_split", 0.1)),
+            test_split=float(data.get("test_split", 0.1)),
+            y_one_hot=bool(str(data.get("y_one_hot", "false")).lower() in {"1", "true", "yes", "on"}),
+            learning_rate=(float(data["learning_rate"]) if data.get("learning_rate") not in (None, "") else None),
+            shuffle=bool(str(data.get("shuffle", "true")).lower() in {"1", "true", "yes", "on"}),
+            validation_batch_size=(int(data["validation_batch_size"]) if data.get("validation_batch_size") not in (None, "") else None),
+            early_stopping=bool(str(data.get("early_stopping", "false")).lower() in {"1", "true", "yes", "on"}),
+            es_monitor=str(data.get("es_monitor", "val_loss")),
+            es_mode=str(data.get("es_mode", "auto")),
+            es_patience=int(data.get("es_patience", 5)),
+            es_min_delta=float(data.get("es_min_delta", 0.0)),
+            es_restore_best_weights=bool(str(data.get("es_restore_best_weights", "true")).lower() in {"1", "true", "yes", "on"}),
+            reduce_lr=bool(str(data.get("reduce_lr", "false")).lower() in {"1", "true", "yes", "on"}),
+            rlrop_monitor=str(data.get("rlrop_monitor", "val_loss")),
+            rlrop_factor=float(data.get("rlrop_factor", 0.1)),
+            rlrop_patience=int(data.get("rlrop_patience", 3)),
+            rlrop_min_lr=float(data.get("rlrop_min_lr", 1e-6)),
+            clipnorm=(float(data["clipnorm"]) if data.get("clipnorm") not in (None, "") else None),
+            clipvalue=(float(data["clipvalue"]) if data.get("clipvalue") not in (None, "") else None),
+            gradient_accumulation_steps=int(data.get("gradient_accumulation_steps") or 0),
+            auto_balance=bool(str(data.get("auto_balance", "false")).lower() in {"1", "true", "yes", "on"}),
+            lr_schedule=str(data.get("lr_schedule", "constant")),
+            lr_decay_steps=int(data.get("lr_decay_steps", 1000)),
+            lr_decay_rate=float(data.get("lr_decay_rate", 0.96)),
+            save_best_model=bool(str(data.get("save_best_model", "false")).lower() in {"1", "true", "yes", "on"}),
+            save_training_logs=bool(str(data.get("save_training_logs", "false")).lower() in {"1", "true", "yes", "on"}),
+            cv_folds=int(data.get("cv_folds") or 0),
+            warm_start_from=(str(data["warm_start_from"]) if data.get("warm_start_from") not in (None, "") else None),
+            freeze_layers=int(data.get("freeze_layers") or 0),
+            new_rows_only=bool(str(data.get("new_rows_only", "false")).lower() in {"1", "true", "yes", "on"}),
+            jit_compile=str(data.get("jit_compile", "auto")).lower(),
+            mixed_precision=str(data.get("mixed_precision") or "auto"),
+            steps_per_execution=int(data.get("steps_per_execution") or 0),
+            intra_op_threads=int(data.get("intra_op_threads") or 0),
+            inter_op_threads=int(data.get("inter_op_threads") or 0),
+            auto_batch_size=bool(str(data.get("auto_batch_size", "false")).lower() in {"1", "true", "yes", "on"}),
+            profile_trace=bool(str(data.get("profile_trace", "false")).lower() in {"1", "true", "yes", "on"}),
+        )
+
+
+def normalize_metric_names(metrics: List[str], loss_name: str) -> List[str]:
+    """Map 'accuracy' to the variant matching the loss (dropped for regression losses)."""
+    names: List[str] = []
+    for m in metrics:
+        m_low = str(m).lower()
+        if m_low in {"accuracy", "acc"}:
+            if "sparse_categorical_crossentropy" in loss_name:
+                names.append("sparse_categorical_accuracy")
+            elif "categorical_crossentropy" in loss_name:
+                names.append("categorical_accuracy")
+            elif "binary_crossentropy" in loss_name:
+                names.append("binary_accuracy")
+            # For regression, 'accuracy' is meaningless; skip it
+        else:
+            names.append(str(m))
+    return names
+
+
+def build_optimizer(params: TrainParams):
+    from keras import optimizers
+
+    opt_config: Dict[str, Any] = {}
+    if params.clipnorm is not None:
+        opt_config['clipnorm'] = params.clipnorm
+    if params.clipvalue is not None:
+        opt_config['clipvalue'] = params.clipvalue
+    if params.gradient_accumulation_steps >= 2:
+        # Clipping applies to the averaged gradients of the accumulated batches
+        opt_config['gradient_accumulation_steps'] = params.gradient_accumulation_steps
+
+    try:
+        # Get the class from the string name
+        opt_instance = optimizers.get(params.optimizer)
+        opt_class = opt_instance.__class__
+        # Re-instantiate with user params
+        opt = opt_class(**opt_config)
+    except Exception:
+        # Fallback
+        opt = optimizers.get(params.optimizer)
+    # Apply learning rate override if provided
+    try:
+        if params.learning_rate is not None and hasattr(opt, "learning_rate"):
+            # Some optimizers expose a tf.Variable; assign via attribute works in Keras 3
+            opt.learning_rate = params.learning_rate  # type: ignore[attr-defined]
+    except Exception:
+        pass
+    return opt
+
+
+def compile_model(
+    model, params: TrainParams, metric_names: List[str], jit_compile: bool | str = "auto", steps_per_execution: int = 1,
+) -> None:
+    from keras import losses, metrics as kmetrics
+
+    model.compile(
+        optimizer=build_optimizer(params),
+        loss=losses.get(params.loss),
+        metrics=[kmetrics.get(m) for m in metric_names],
+        jit_compile=jit_compile,
+        steps_per_execution=steps_per_execution,
+    )
+
+
+def schedule_callbacks(params: TrainParams) -> List[Any]:
+    """EarlyStopping / ReduceLROnPlateau as requested by the params."""
+    from keras.callbacks import EarlyStopping, ReduceLROnPlateau
+
+    callbacks: List[Any] = []
+    if params.early_stopping:
+        try:
+            callbacks.append(
+                EarlyStopping(
+                    monitor=params.es_monitor,
+                    mode=params.es_mode,
+                    patience=int(params.es_patience),
+                    min_delta=float(params.es_min_delta),
+                    restore_best_weights=bool(params.es_restore_best_weights),
+                    verbose=0,
+                )
+            )
+        except Exception:
+            pass
+    if params.reduce_lr:
+        try:
+            callbacks.append(
+                ReduceLROnPlateau(
+                    monitor=params.rlrop_monitor,
+                    factor=float(params.rlrop_factor),
+                    patience=int(params.rlrop_patience),
+                    min_lr=float(params.rlrop_min_lr),
+                    verbose=0,
+                )
+            )
+        except Exception:
+            pass
+    return callbacks
+
+
+def split_indices(n: int, validation_split: float, test_split: float, seed: int = 42) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Shuffled ``(train, validation, test)`` row indices (simple random split)."""
+    rng = np.random.default_rng(seed=seed)
+    idx = np.arange(n)
+    rng.shuffle(idx)
+    n_test = int(n * test_split)
+    n_val = int(n * validation_split)
+    n_train = n - n_test - n_val
+    return idx[:n_train], idx[n_train:n_train + n_val], idx[n_train + n_val:]
+
+
+def kfold_indices(n: int, folds: int, seed: int = 42) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Shuffled ``(train, held-out)`` row indices of each of `folds` folds."""
+    rng = np.random.default_rng(seed=seed)
+    idx = np.arange(n)
+    rng.shuffle(idx)
+    parts = np.array_split(idx, folds)
+    return [(np.concatenate(parts[:k] + parts[k + 1:]), parts[k]) for k in range(folds)]
+
+
+def evaluate_model(model, X, y, callbacks: List[Any] | None = None) -> Dict[str, float] | None:
+    if len(X) == 0:
+        return None
+    result = model.evaluate(X, y, verbose=0, callbacks=callbacks, return_dict=True)
+    return {k: float(v) for k, v in result.items()}
@@ -0,0 +1,225 @@
+"""Where a training job's time and memory go, for ``result["profile"]``.
+
+`TrainingProfiler` collects:
+
+- phase wall times (dataset load, graph build, compile, fit, evaluate,
+  artifact save) through ``with profiler.phase(name)`` or `begin`/`end`;
+- per epoch (from `profiler.callback`): wall time, mean and p95 step time,
+  samples/sec, and the split between compute (inside the train step) and
+  data/overhead (between steps: input pipeline, host-device copies and
+  callbacks);
+- the job's peak RSS and process CPU time.
+
+Peak RSS is the kernel's high-water mark, reset at the start of the job
+where Linux allows it (``/proc/self/clear_refs``); otherwise it is the
+worker process's lifetime peak, flagged by ``peak_rss_scope``.
+
+With ``profile_trace`` the callback also records a TensorFlow profiler
+trace of up to `TRACE_STEPS` train steps of the second epoch (the first
+one is dominated by tracing), zipped into an artifact that the
+``artifact`` action serves with ``type=profile``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import resource
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TRACE_STEPS = 20
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        # "5" resets the VmHWM high-water mark of the process (Linux >= 4.0)
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def current_rss_mb() -> float:
+    """Resident memory of this process right now (its peak where that is unavailable)."""
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return _peak_rss_mb()
+
+
+def _cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system
+
+
+class TrainingProfiler:
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self.phases: Dict[str, float] = {}
+        self.epochs: List[Dict[str, Any]] = []
+        self.trace_dir: str | None = None
+        self._tracing = False
+        self._open: Dict[str, float] = {}
+        self._peak_reset = _reset_peak_rss()
+        self._cpu_start = _cpu_seconds()
+        self._wall_start = time.perf_counter()
+
+    def begin(self, name: str) -> None:
+        self._open[name] = time.perf_counter()
+
+    def end(self, name: str) -> None:
+        start = self._open.pop(name, None)
+        if start is not None:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def callback(self, samples: int):
+        """Keras callback recording per-epoch step statistics (and the optional trace)."""
+        from keras.callbacks import Callback
+
+        profiler = self
+
+        class _ProfileCallback(Callback):  # pragma: no cover - relies on Keras runtime
+            def __init__(self):
+                super().__init__()
+                self._durations: List[float] = []
+                self._gaps: List[float] = []
+                self._epoch_start = self._batch_start = self._last_end = 0.0
+                self._traced = self._seen = 0
+                self._tracing = self._trace_epoch = False
+
+            def on_epoch_begin(self, epoch, logs=None):  # type: ignore[override]
+                self._durations, self._gaps = [], []
+                self._epoch_start = self._last_end = time.perf_counter()
+                self._seen += 1
+                # The second epoch of this run (the first one traces the graph), else past the
+                # first step of a single-epoch run
+                self._trace_epoch = self._seen == 2 or self.params.get("epochs") == 1  # type: ignore[attr-defined]
+
+            def on_train_batch_begin(self, batch, logs=None):  # type: ignore[override]
+                now = time.perf_counter()
+                self._gaps.append(now - self._last_end)
+                self._batch_start = now
+                if profiler.trace and profiler.trace_dir is None and self._trace_epoch and (batch > 0 or self._seen == 2):
+                    self._start_trace()
+
+            def on_train_batch_end(self, batch, logs=None):  # type: ignore[override]
+                self._last_end = time.perf_counter()
+                self._durations.append(self._last_end - self._batch_start)
+                if self._tracing:
+                    self._traced += 1
+                    if self._traced >= TRACE_STEPS:
+                        self._stop_trace()
+
+            def on_epoch_end(self, epoch, logs=None):  # type: ignore[override]
+                if self._tracing:
+                    self._stop_trace()
+                wall = time.perf_counter() - self._epoch_start
+                steps_per_call = max(int(getattr(self.model, "steps_per_execution", 1) or 1), 1)
+                durations = np.asarray(self._durations or [0.0]) / steps_per_call
+                compute = float(sum(self._durations))
+                data = float(sum(self._gaps))
+                profiler.epochs.append({
+                    "epoch": int(epoch) + 1,
+                    "wall_s": wall,
+                    "steps": int(self.params.get("steps") or 0),  # type: ignore[attr-defined]
+                    "step_mean_ms": 1000.0 * float(durations.mean()),
+                    "step_p95_ms": 1000.0 * float(np.percentile(durations, 95)),
+                    "samples_per_sec": samples / compute if compute > 0 else None,
+                    "compute_s": compute,
+                    "data_s": data,
+                    # Validation and epoch-end callbacks
+                    "other_s": max(wall - compute - data, 0.0),
+                })
+
+            def on_train_end(self, logs=None):  # type: ignore[override]
+                if self._tracing:
+                    self._stop_trace()
+
+            def _start_trace(self):
+                import tensorflow as tf
+
+                profiler.trace_dir = tempfile.mkdtemp(prefix="maid-profile-")
+                try:
+                    tf.profiler.experimental.start(profiler.trace_dir)
+                    self._tracing = profiler._tracing = True
+                except Exception:
+                    logger.warning("Could not start the TensorFlow profiler", exc_info=True)
+
+            def _stop_trace(self):
+                self._tracing = False
+                profiler._stop_profiler()
+
+        return _ProfileCallback()
+
+    def export_trace(self, destination: str) -> str | None:
+        """Zip the recorded trace to ``destination`` (without extension); returns the zip path."""
+        if not self.trace_dir:
+            return None
+        try:
+            return shutil.make_archive(destination, "zip", self.trace_dir) if os.listdir(self.trace_dir) else None
+        finally:
+            shutil.rmtree(self.trace_dir, ignore_errors=True)
+
+    def _stop_profiler(self) -> None:
+        import tensorflow as tf
+
+        self._tracing = False
+        try:
+            tf.profiler.experimental.stop()
+        except Exception:
+            logger.warning("Could not stop the TensorFlow profiler", exc_info=True)
+
+    def discard_trace(self) -> None:
+        """Drop the trace, first stopping the TensorFlow profiler if a failed fit left it running."""
+        if self._tracing:
+            self._stop_profiler()
+        if self.trace_dir:
+            shutil.rmtree(self.trace_dir, ignore_errors=True)
+            self.trace_dir = None
+
+    def summary(self) -> Dict[str, Any]:
+        steps = [e for e in self.epochs if e["steps"]]
+        steady = steps[1:] or steps
+        return {
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "epochs": self.epochs,
+            "step_mean_ms": float(np.mean([e["step_mean_ms"] for e in steady])) if steady else None,
+            "step_p95_ms": float(np.mean([e["step_p95_ms"] for e in steady])) if steady else None,
+            "samples_per_sec": float(np.mean([e["samples_per_sec"] or 0.0 for e in steady])) if steady else None,
+            "wall_s": time.perf_counter() - self._wall_start,
+            "cpu_s": _cpu_seconds() - self._cpu_start,
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "peak_rss_scope": "job" if self._peak_reset else "process",
+        }
@@ -0,0 +1,115 @@
+"""Per-job TensorFlow runtime settings: XLA, mixed precision, steps per execution, threads.
+
+Each setting is a `TrainParams` field whose ``auto``/0 default is resolved
+from the model's size:
+
+- ``jit_compile``: XLA-compile the train step. Fusing kernels pays off once
+  the model is large enough; for small models the compile time of a short
+  CPU run outweighs it, so ``auto`` enables XLA only from
+  `XLA_MIN_PARAMS` parameters.
+- ``mixed_precision``: a Keras dtype policy. ``auto`` picks
+  ``mixed_bfloat16`` on CPUs with native bfloat16 (AVX512-BF16/AMX) for
+  models of at least `BF16_MIN_PARAMS` parameters, else ``float32``.
+- ``steps_per_execution``: train steps per `tf.function` call. Batching them
+  cuts the per-call overhead of small steps, but Keras runs the batch
+  callbacks (progress, cancellation) only once per call, so ``0`` (auto)
+  keeps one step per call and larger values are opt-in.
+- ``intra_op_threads``/``inter_op_threads``: TensorFlow's thread pools
+  (0 = the worker's budget). TensorFlow fixes them when it initializes, so a
+  worker applies them to its first job only; the effective values are
+  reported either way.
+
+The resolved configuration is stored in ``result["runtime"]``, with the
+mean step time measured by the job's profiler (network/services/profiling.py).
+"""
+from __future__ import annotations
+
+import functools
+import math
+import sys
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+from config.runtime_limits import configure_tensorflow, threads_per_worker
+
+XLA_MIN_PARAMS = 100_000
+BF16_MIN_PARAMS = 1_000_000
+PRECISION_POLICIES = ("auto", "float32", "mixed_bfloat16", "mixed_float16")
+
+
+@functools.lru_cache(maxsize=1)
+def cpu_supports_bf16() -> bool:
+    """Whether the CPU has native bfloat16 arithmetic (Linux; False when unknown)."""
+    try:
+        with open("/proc/cpuinfo") as fh:
+            for line in fh:
+                if line.startswith("flags"):
+                    flags = set(line.split(":", 1)[1].split())
+                    return bool(flags & {"avx512_bf16", "amx_bf16"})
+    except OSError:
+        pass
+    return False
+
+
+@dataclass
+class RuntimeConfig:
+    jit_compile: bool
+    mixed_precision: str
+    steps_per_execution: int
+    intra_op_threads: int
+    inter_op_threads: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _flag(value: Any) -> bool | None:
+    text = str(value).strip().lower()
+    if text in {"1", "true", "yes", "on"}:
+        return True
+    if text in {"0", "false", "no", "off"}:
+        return False
+    return None
+
+
+def resolve_runtime(params, param_count: int, train_rows: int) -> RuntimeConfig:
+    """Resolve the job's ``auto`` runtime settings for a model of `param_count` parameters."""
+    jit = _flag(params.jit_compile)
+    if jit is None:
+        jit = param_count >= XLA_MIN_PARAMS
+
+    policy = str(params.mixed_precision or "auto")
+    if policy == "auto":
+        policy = "mixed_bfloat16" if cpu_supports_bf16() and param_count >= BF16_MIN_PARAMS else "float32"
+
+    steps_per_epoch = max(math.ceil(train_rows / max(params.batch_size, 1)), 1)
+    steps = int(params.steps_per_execution or 0) or 1
+
+    intra = int(params.intra_op_threads or 0) or threads_per_worker()
+    inter = int(params.inter_op_threads or 0) or min(2, intra)
+    return RuntimeConfig(
+        jit_compile=bool(jit),
+        mixed_precision=policy,
+        steps_per_execution=max(min(steps, steps_per_epoch), 1),
+        intra_op_threads=intra,
+        inter_op_threads=inter,
+    )
+
+
+def set_precision_policy(name: str) -> None:
+    from keras import mixed_precision
+
+    mixed_precision.set_global_policy(name)
+
+
+def apply_threads(config: RuntimeConfig) -> Dict[str, Any]:
+    """Apply the thread counts if TensorFlow still allows it; returns the effective values."""
+    applied = configure_tensorflow(config.intra_op_threads, config.inter_op_threads)
+    tf = sys.modules.get("tensorflow")
+    effective: Dict[str, Any] = {"threads_applied": applied}
+    if tf is not None:
+        # 0 means TensorFlow sized the pool itself (from TF_NUM_*_THREADS or the core count)
+        effective["effective_intra_op_threads"] = tf.config.threading.get_intra_op_parallelism_threads()
+        effective["effective_inter_op_threads"] = tf.config.threading.get_inter_op_parallelism_threads()
+    return effective
+
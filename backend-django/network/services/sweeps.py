@@ -0,0 +1,316 @@
+"""Hyperparameter sweeps: many trials of one graph over one loaded dataset.
+
+A sweep job (`TrainingJobKind.SWEEP`) loads, validates and encodes its CSV
+once, then runs candidate parameter sets concurrently in a `TrialPool`.
+
+- ``grid``: every combination of the listed values
+- ``random``: ``n_trials`` samples; a value is a list of choices or a
+  ``{"low", "high", "log", "int"}`` range
+- ``halving``: successive halving over ``n_trials`` random samples. All
+  trials train ``min_epochs``, the best ``1/eta`` continue (from their saved
+  model and optimizer state) for ``eta`` times as many epochs, and so on up
+  to ``epochs``; poor trials are stopped early instead of trained to the end.
+
+Trials are ranked by the last value of ``objective`` (``val_loss`` by
+default). The best trial's model becomes the job artifact, and its history
+and evaluation are the job's; every trial and the leaderboard are kept
+under ``result["sweep"]``.
+"""
+from __future__ import annotations
+
+import itertools
+import math
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Dict, List
+
+import numpy as np
+from django.conf import settings
+
+from config.runtime_limits import threads_per_worker
+from network.models import TrainingJob
+from network.services import events
+from network.services.batch_tuning import free_memory_mb
+from network.services.cancellation import CancellationToken, TrainingCancelled
+from network.services.fitting import TrainParams, split_indices
+from network.services.trial_pool import TrialPool, TrialSpec, pool_size
+
+STRATEGIES = ("grid", "random", "halving")
+
+# Parameters a sweep may vary; the data columns and splits are fixed for all trials
+SWEEPABLE_PARAMS = {
+    "learning_rate": float,
+    "batch_size": int,
+    "gradient_accumulation_steps": int,
+    "optimizer": str,
+    "epochs": int,
+    "loss": str,
+    "clipnorm": float,
+    "clipvalue": float,
+    "es_patience": int,
+    "rlrop_factor": float,
+    "shuffle": bool,
+}
+
+
+def _validate_space(space: Any, strategy: str) -> Dict[str, Any]:
+    if not isinstance(space, dict) or not space:
+        raise ValueError("'space' must be a non-empty object of parameter -> values")
+    for name, values in space.items():
+        if name not in SWEEPABLE_PARAMS:
+            raise ValueError(f"Cannot sweep '{name}'; allowed: {sorted(SWEEPABLE_PARAMS)}")
+        if isinstance(values, list):
+            if not values:
+                raise ValueError(f"'space.{name}' has no values")
+        elif isinstance(values, dict) and strategy != "grid":
+            if "low" not in values or "high" not in values or float(values["low"]) > float(values["high"]):
+                raise ValueError(f"'space.{name}' range needs 'low' <= 'high'")
+            if values.get("log") and float(values["low"]) <= 0:
+                raise ValueError(f"'space.{name}' log range must be positive")
+        else:
+            raise ValueError(f"'space.{name}' must be a list of values" + ("" if strategy == "grid" else " or a range"))
+    return space
+
+
+def parse_sweep(config: Any, epochs: int) -> Dict[str, Any]:
+    """Validate and fill defaults of a sweep configuration; raises ValueError."""
+    if not isinstance(config, dict):
+        raise ValueError("'sweep' must be an object")
+    strategy = str(config.get("strategy", "grid")).lower()
+    if strategy not in STRATEGIES:
+        raise ValueError(f"'sweep.strategy' must be one of {STRATEGIES}")
+    space = _validate_space(config.get("space"), strategy)
+    limit = int(getattr(settings, "NETWORK_SWEEP_MAX_TRIALS", 64))
+    if strategy == "grid":
+        n_trials = math.prod(len(v) for v in space.values())
+    else:
+        n_trials = int(config.get("n_trials", 8))
+    if not 1 <= n_trials <= limit:
+        raise ValueError(f"A sweep may run between 1 and {limit} trials (got {n_trials})")
+    mode = str(config.get("mode", "min")).lower()
+    if mode not in ("min", "max"):
+        raise ValueError("'sweep.mode' must be 'min' or 'max'")
+    eta = int(config.get("eta", 3))
+    min_epochs = int(config.get("min_epochs", 1))
+    if strategy == "halving" and (eta < 2 or not 1 <= min_epochs <= epochs):
+        raise ValueError("Successive halving needs 'eta' >= 2 and 1 <= 'min_epochs' <= 'epochs'")
+    if strategy == "halving" and "epochs" in space:
+        raise ValueError("Successive halving sets the epochs itself; remove 'epochs' from the space")
+    return {
+        "strategy": strategy,
+        "space": space,
+        "n_trials": n_trials,
+        "objective": str(config.get("objective", "val_loss")),
+        "mode": mode,
+        "eta": eta,
+        "min_epochs": min_epochs,
+        "max_concurrent": int(config.get("max_concurrent") or 0),
+        "seed": int(config.get("seed", 42)),
+    }
+
+
+def _sample(values: Any, caster, rng: np.random.Generator) -> Any:
+    if isinstance(values, list):
+        return caster(values[int(rng.integers(len(values)))])
+    low, high = float(values["low"]), float(values["high"])
+    value = math.exp(rng.uniform(math.log(low), math.log(high))) if values.get("log") else rng.uniform(low, high)
+    return int(round(value)) if values.get("int") or caster is int else caster(value)
+
+
+def candidates(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Parameter overrides of every trial, in trial order."""
+    space = config["space"]
+    names = sorted(space)
+    if config["strategy"] == "grid":
+        return [
+            {name: SWEEPABLE_PARAMS[name](value) for name, value in zip(names, combo)}
+            for combo in itertools.product(*(space[name] for name in names))
+        ]
+    rng = np.random.default_rng(config["seed"])
+    return [
+        {name: _sample(space[name], SWEEPABLE_PARAMS[name], rng) for name in names}
+        for _ in range(config["n_trials"])
+    ]
+
+
+def halving_rungs(n_trials: int, eta: int, min_epochs: int, max_epochs: int) -> List[tuple[int, int]]:
+    """``(trials, epoch budget)`` per rung: 1/eta of the trials continue with eta x the epochs."""
+    rungs = []
+    size, budget = n_trials, min_epochs
+    while True:
+        budget = min(budget, max_epochs)
+        rungs.append((size, budget))
+        if budget >= max_epochs:
+            return rungs
+        size = max(size // eta, 1)
+        budget *= eta
+
+
+def objective_value(trial: Dict[str, Any], objective: str) -> float | None:
+    values = (trial.get("history") or {}).get(objective) or (trial.get("history") or {}).get("loss")
+    if not values:
+        return None
+    value = float(values[-1])
+    return value if math.isfinite(value) else None
+
+
+def leaderboard(trials: List[Dict[str, Any]], objective: str, mode: str) -> List[Dict[str, Any]]:
+    """Trials ranked by their objective; pruned trials and trials without a score come last."""
+    sign = 1.0 if mode == "min" else -1.0
+    scored = sorted(
+        trials,
+        key=lambda t: (t["status"] == "pruned", t.get("score") is None, sign * (t.get("score") or 0.0)),
+    )
+    return [
+        {
+            "rank": rank,
+            "trial": t["trial"],
+            "params": t["params"],
+            "score": t.get("score"),
+            "epochs_trained": t.get("epochs_trained", 0),
+            "status": t["status"],
+        }
+        for rank, t in enumerate(scored, start=1)
+    ]
+
+
+def run_trials(
+    token: CancellationToken,
+    pool: TrialPool,
+    specs: List[TrialSpec],
+    reporter: events.ProgressReporter,
+    done_epochs: Dict[str, float],
+    total_epochs: float,
+) -> Dict[str, Dict[str, Any]]:
+    """Run `specs` in the pool, streaming their aggregated progress; returns results by trial id."""
+    futures = {pool.submit(spec): spec.trial_id for spec in specs}
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = set(futures)
+    while pending:
+        finished, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+        for future in finished:
+            results[futures[future]] = future.result()
+        for trial_id, epoch, logs in pool.drain_progress():
+            done_epochs[trial_id] = max(done_epochs.get(trial_id, 0.0), float(epoch))
+            reporter.live.setdefault("trials", {})[trial_id] = {"epoch": round(float(epoch), 2), **logs}
+        if token.cancelled:
+            pool.cancel()
+        reporter.live["trials_running"] = len(pending)
+        progress = 0.05 + 0.9 * min(sum(done_epochs.values()) / max(total_epochs, 1.0), 1.0)
+        reporter.report(progress)
+    return results
+
+
+def run_sweep(job: TrainingJob, params: TrainParams, model, X: np.ndarray, y: np.ndarray, metric_names: List[str], token: CancellationToken) -> Dict[str, Any]:
+    """Run the job's sweep on an already validated model/dataset and return the job result."""
+    from network.services.training import _ensure_artifacts_dir
+
+    config = parse_sweep((job.params or {}).get("sweep"), params.epochs)
+    overrides = candidates(config)
+    train_idx, val_idx, test_idx = split_indices(len(X), params.validation_split, params.test_split)
+    if config["objective"].startswith("val_") and len(val_idx) == 0:
+        raise ValueError(f"Objective '{config['objective']}' needs a validation_split > 0")
+
+    trials = [
+        {
+            "trial": f"t{i:03d}",
+            "params": override,
+            "status": "pending",
+            "history": {},
+            "epochs_trained": 0,
+        }
+        for i, override in enumerate(overrides)
+    ]
+    by_id = {t["trial"]: t for t in trials}
+    if config["strategy"] == "halving":
+        rungs = halving_rungs(len(trials), config["eta"], config["min_epochs"], params.epochs)
+        starts = [0] + [budget for _, budget in rungs[:-1]]
+        total_epochs = float(sum(size * (budget - start) for (size, budget), start in zip(rungs, starts)))
+    else:
+        rungs = [(len(trials), None)]
+        total_epochs = float(sum(int(t["params"].get("epochs", params.epochs)) for t in trials))
+
+    workers, threads = pool_size(
+        len(trials),
+        min(config["max_concurrent"] or settings.NETWORK_TRIAL_WORKERS, settings.NETWORK_TRIAL_WORKERS),
+        threads_per_worker(),
+        free_memory_mb(),
+        settings.NETWORK_TRIAL_PROCESS_MB,
+    )
+    reporter = events.ProgressReporter(str(job.id))
+    reporter.live.update(strategy=config["strategy"], trials_total=len(trials))
+    done_epochs: Dict[str, float] = {}
+    base = dict(job.params or {})
+    base.pop("sweep", None)
+    started = time.perf_counter()
+
+    with TrialPool(X, y, model.to_json(), workers, threads, inline_cancel_event=token.event) as pool:
+        alive = list(trials)
+        start_epoch = 0
+        for rung, (size, budget) in enumerate(rungs):
+            final = budget is None or rung == len(rungs) - 1
+            specs = []
+            for trial in alive:
+                trial["status"] = "running"
+                trial_params = {**base, **trial["params"]}
+                specs.append(TrialSpec(
+                    trial_id=trial["trial"],
+                    params=trial_params,
+                    metric_names=metric_names,
+                    train_idx=train_idx,
+                    val_idx=val_idx,
+                    test_idx=test_idx,
+                    epochs=budget if budget is not None else int(trial_params.get("epochs", params.epochs)),
+                    initial_epoch=start_epoch,
+                    checkpoint=pool.checkpoint_path(trial["trial"]),
+                    evaluate=final,
+                ))
+            reporter.live["rung"] = rung
+            results = run_trials(token, pool, specs, reporter, done_epochs, total_epochs)
+            for trial_id, outcome in results.items():
+                trial = by_id[trial_id]
+                for key, values in outcome["history"].items():
+                    trial["history"].setdefault(key, []).extend(values)
+                trial["epochs_trained"] = outcome["epochs_trained"]
+                trial["elapsed"] = trial.get("elapsed", 0.0) + outcome["elapsed"]
+                trial["evaluation"] = outcome["evaluation"]
+                trial["score"] = objective_value(trial, config["objective"])
+                trial["status"] = "completed" if final else "running"
+            if token.cancelled:
+                raise TrainingCancelled(f"Sweep {job.id} was cancelled")
+            if not final:
+                # Keep the best `next size` trials; the rest are stopped at this rung
+                ranked = [row["trial"] for row in leaderboard(alive, config["objective"], config["mode"])]
+                next_size = rungs[rung + 1][0]
+                for trial_id in ranked[next_size:]:
+                    by_id[trial_id]["status"] = "pruned"
+                    by_id[trial_id]["pruned_at_epoch"] = budget
+                alive = [by_id[trial_id] for trial_id in ranked[:next_size]]
+                start_epoch = budget
+
+        board = leaderboard(trials, config["objective"], config["mode"])
+        best = by_id[board[0]["trial"]]
+        best_artifact = None
+        checkpoint = pool.checkpoint_path(best["trial"])
+        if os.path.exists(checkpoint):
+            best_artifact = os.path.join(_ensure_artifacts_dir(), f"{job.id}.keras")
+            shutil.copy2(checkpoint, best_artifact)
+
+    reporter.flush()
+    return {
+        "history": best["history"],
+        "evaluation": best.get("evaluation"),
+        "artifact_path": best_artifact,
+        "sweep": {
+            "config": config,
+            "best_trial": best["trial"],
+            "best_params": best["params"],
+            "leaderboard": board,
+            "trials": trials,
+            "workers": workers,
+            "threads_per_trial": threads,
+            "elapsed": time.perf_counter() - started,
+        },
+    }
@@ -2,98 +2,50 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass
 from typing import Any, Dict, List, Tuple
 
 import numpy as np
-import pandas as pd
 from celery import shared_task
 from django.conf import settings
 from network import storage
 from django.db import close_old_connections
 
-from network.models import TrainingJob, TrainingStatus, NetworkGraph
+from config.runtime_limits import configure_tensorflow, limit_threads
+
+from network.models import TrainingJob, TrainingJobKind, TrainingStatus, NetworkGraph
+from network.services import events
+from network.services.cancellation import (
+    CancellationToken,
+    TrainingCancelled,
+    cancellation_callback,
+    read_csv_cancellable,
+)
 from network.services.builders import build_keras_model
+from network.services.checkpoints import (
+    checkpoint_callback,
+    clear_checkpoints,
+    load_latest_checkpoint,
+    restore_rng_state,
+)
+from network.services.fitting import (
+    TrainParams,
+    compile_model,
+    evaluate_model,
+    normalize_metric_names,
+    schedule_callbacks,
+    split_indices,
+)
+from network.services.batch_tuning import after_worker_lost, fallback_batch_size, tune_batch_size
+from network.services.profiling import TrainingProfiler
+from network.services.runtime_config import apply_threads, resolve_runtime, set_precision_policy
 from network.services.validators import validate_graph_payload
-
-
-@dataclass
-class TrainParams:
-    x_columns: List[str]
-    y_column: str
-    optimizer: str = "adam"
-    loss: str = "mse"
-    metrics: List[str] | None = None
-    epochs: int = 100
-    batch_size: int = 25
-    validation_split: float = 0.1
-    test_split: float = 0.1
-    y_one_hot: bool = False
-    learning_rate: float | None = None
-    shuffle: bool = True
-    validation_batch_size: int | None = None
-    # EarlyStopping
-    early_stopping: bool = False
-    es_monitor: str = "val_loss"
-    es_mode: str = "auto"
-    es_patience: int = 5
-    es_min_delta: float = 0.0
-    es_restore_best_weights: bool = True
-    # ReduceLROnPlateau
-    reduce_lr: bool = False
-    rlrop_monitor: str = "val_loss"
-    rlrop_factor: float = 0.1
-    rlrop_patience: int = 3
-    rlrop_min_lr: float = 1e-6
-    # Gradient Clipping
-    clipnorm: float | None = None
-    clipvalue: float | None = None
-    # Auto-Balancing
-    auto_balance: bool = False
-    # Learning Rate Schedule
-    lr_schedule: str = "constant"
-    lr_decay_steps: int = 1000
-    lr_decay_rate: float = 0.96
-    # Checkpointing & Logs
-    save_best_model: bool = False
-    save_training_logs: bool = False
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "TrainParams":
-        return cls(
-            x_columns=list(data.get("x_columns") or []),
-            y_column=str(data.get("y_column")),
-            optimizer=str(data.get("optimizer", "adam")),
-            loss=str(data.get("loss", "mse")),
-            metrics=list(data.get("metrics") or []),
-            epochs=int(data.get("epochs", 10)),
-            batch_size=int(data.get("batch_size", 32)),
-            validation_split=float(data.get("validation_split", 0.1)),
-            test_split=float(data.get("test_split", 0.1)),
-            y_one_hot=bool(str(data.get("y_one_hot", "false")).lower() in {"1", "true", "yes", "on"}),
-            learning_rate=(float(data["learning_rate"]) if data.get("learning_rate") not in (None, "") else None),
-            shuffle=bool(str(data.get("shuffle", "true")).lower() in {"1", "true", "yes", "on"}),
-            validation_batch_size=(int(data["validation_batch_size"]) if data.get("validation_batch_size") not in (None, "") else None),
-            early_stopping=bool(str(data.get("early_stopping", "false")).lower() in {"1", "true", "yes", "on"}),
-            es_monitor=str(data.get("es_monitor", "val_loss")),
-            es_mode=str(data.get("es_mode", "auto")),
-            es_patience=int(data.get("es_patience", 5)),
-            es_min_delta=float(data.get("es_min_delta", 0.0)),
-            es_restore_best_weights=bool(str(data.get("es_restore_best_weights", "true")).lower() in {"1", "true", "yes", "on"}),
-            reduce_lr=bool(str(data.get("reduce_lr", "false")).lower() in {"1", "true", "yes", "on"}),
-            rlrop_monitor=str(data.get("rlrop_monitor", "val_loss")),
-            rlrop_factor=float(data.get("rlrop_factor", 0.1)),
-            rlrop_patience=int(data.get("rlrop_patience", 3)),
-            rlrop_min_lr=float(data.get("rlrop_min_lr", 1e-6)),
-            clipnorm=(float(data["clipnorm"]) if data.get("clipnorm") not in (None, "") else None),
-            clipvalue=(float(data["clipvalue"]) if data.get("clipvalue") not in (None, "") else None),
-            auto_balance=bool(str(data.get("auto_balance", "false")).lower() in {"1", "true", "yes", "on"}),
-            lr_schedule=str(data.get("lr_schedule", "constant")),
-            lr_decay_steps=int(data.get("lr_decay_steps", 1000)),
-            lr_decay_rate=float(data.get("lr_decay_rate", 0.96)),
-            save_best_model=bool(str(data.get("save_best_model", "false")).lower() in {"1", "true", "yes", "on"}),
-            save_training_logs=bool(str(data.get("save_training_logs", "false")).lower() in {"1", "true", "yes", "on"}),
-        )
+from network.services.warm_start import (
+    appended_rows,
+    apply_warm_start,
+    dataset_fingerprint,
+    get_source_job,
+    model_signature,
+)
 
 
 def _ensure_artifacts_dir() -> str:
@@ -108,8 +60,200 @@ def _ensure_artifacts_dir() -> str:
     return out_dir
 
 
+def build_job_model(job: TrainingJob):
+    """Build the (uncompiled) Keras model of the job's graph under the current dtype policy."""
+    try:
+        structure = validate_graph_payload(
+            list(job.graph.nodes.order_by("created_at").values("id", "type", "label", "params", "position", "notes")),
+            [
+                dict(
+                    id=e["id"],
+                    source=e.get("source_id"),
+                    target=e.get("target_id"),
+                    meta=e.get("meta"),
+                )
+                for e in job.graph.edges.order_by("created_at").values("id", "source_id", "target_id", "meta")
+            ],
+        )
+    except Exception:
+        # already validated above; if it fails here, rethrow and let outer handler deal with it
+        structure = None  # type: ignore
+    model = build_keras_model(structure,  # type: ignore[arg-type]
+                              list(job.graph.nodes.order_by("created_at").values("id", "type", "label", "params", "position", "notes")),
+                              [
+                                  {
+                                      "id": e["id"],
+                                      "source": e.get("source_id"),
+                                      "target": e.get("target_id"),
+                                      "meta": e.get("meta"),
+                                  }
+                                  for e in job.graph.edges.order_by("created_at").values("id", "source_id", "target_id", "meta")
+                              ])
+    return model
+
+
+def prepare_training_data(
+    job: TrainingJob, params: TrainParams, token: CancellationToken, profiler: TrainingProfiler | None = None,
+) -> Tuple[Any, np.ndarray, np.ndarray, List[str]]:
+    """
+    Load the job's dataset, build its model and check that they fit together.
+    Returns ``(model, X, y, metric_names)``; raises ValueError with actionable hints otherwise.
+    """
+    profiler = profiler or TrainingProfiler()
+    profiler.begin("dataset_load")
+    # 4) Load dataset (support storage-backed keys)
+    if not job.dataset_path:
+        raise FileNotFoundError("Uploaded dataset CSV file not found for job")
+
+    # If storage.exists indicates presence, open stream; otherwise treat as local path
+    try:
+        if storage.exists(job.dataset_path):
+            with storage.open_stream(job.dataset_path) as fh:
+                df = read_csv_cancellable(fh, token)
+        else:
+            if not os.path.exists(job.dataset_path):
+                raise FileNotFoundError("Uploaded dataset CSV file not found for job")
+            df = read_csv_cancellable(job.dataset_path, token)
+    except Exception as exc:
+        raise
+    x_cols = params.x_columns
+    y_col = params.y_column
+    if not x_cols or not y_col:
+        raise ValueError("Missing x_columns or y_column in params")
+    X = df[x_cols].to_numpy(dtype=np.float32)
+    y = df[y_col].to_numpy()
+    profiler.end("dataset_load")
+
+    # Heuristics about target
+    def _is_integer_array(arr: np.ndarray) -> bool:
+        try:
+            return np.issubdtype(arr.dtype, np.integer) or np.all(np.equal(np.mod(arr, 1), 0))
+        except Exception:
+            return False
+
+    def _is_one_hot(arr: np.ndarray) -> bool:
+        if arr.ndim != 2 or arr.shape[1] < 2:
+            return False
+        vals = np.unique(arr)
+        if not np.all(np.isin(vals, [0, 1])):
+            return False
+        row_sums = arr.sum(axis=1)
+        # allow small numeric tolerance
+        return np.all(np.isclose(row_sums, 1.0, atol=1e-6))
+
+    # Probe selected loss to decide on one-hot conversion
+    try:
+        from keras import losses as _k_losses
+        _probe_los = _k_losses.get(params.loss)
+        loss_name_probe = getattr(_probe_los, "name", None) or str(_probe_los)
+    except Exception:
+        loss_name_probe = str(params.loss)
+
+    def _coerce_one_hot_if_needed(arr: np.ndarray) -> np.ndarray:
+        if arr.ndim == 1 and _is_integer_array(arr):
+            classes = np.unique(arr)
+            class_to_idx = {c: i for i, c in enumerate(classes)}
+            idx = np.vectorize(lambda v: class_to_idx.get(v, 0))(arr)
+            oh = np.eye(len(classes), dtype=np.float32)[idx]
+            return oh
+        return arr
+
+    loss_lc = (loss_name_probe or str(params.loss)).lower()
+    if params.y_one_hot or ("categorical_crossentropy" in loss_lc and "sparse_categorical_crossentropy" not in loss_lc):
+        if y.ndim == 1 and _is_integer_array(y):
+            y = _coerce_one_hot_if_needed(y)
+
+    # Infer task and classes after potential conversion
+    y_shape = y.shape
+    y_is_sparse_labels = (y.ndim == 1) and _is_integer_array(y)
+    y_is_one_hot = _is_one_hot(y)
+    n_classes = int(len(np.unique(y))) if y_is_sparse_labels else (int(y.shape[1]) if y_is_one_hot else None)
+
+    # 5) Build model to inspect output shape
+    from keras import losses
+    with profiler.phase("graph_build"):
+        model = build_job_model(job)
+
+    # Inspect output units
+    out_shape = model.output_shape
+    if isinstance(out_shape, (list, tuple)) and out_shape and isinstance(out_shape[0], (list, tuple)):
+        oshape = out_shape[0]
+    else:
+        oshape = out_shape
+    try:
+        out_units = int(oshape[-1]) if isinstance(oshape, (list, tuple)) else int(getattr(oshape, "-1", 1))
+    except Exception:
+        out_units = None  # type: ignore
+
+    # Normalize/identify loss & metrics
+    los = losses.get(params.loss)
+    loss_name = getattr(los, "name", None) or str(los)
+    metric_names = normalize_metric_names(params.metrics or [], loss_name)
+
+    # 6) Validate compatibility and provide actionable messages
+    errors: List[str] = []
+    suggestions: List[str] = []
+
+    # Classification vs regression heuristics
+    is_binary = (n_classes == 2)
+    is_multiclass = (n_classes is not None and n_classes > 2) or y_is_one_hot
+    is_regression_target = not (y_is_sparse_labels or y_is_one_hot)
+
+    def _require(cond: bool, msg: str):
+        if not cond:
+            errors.append(msg)
+
+    # Loss-based expectations
+    ln = loss_name.lower()
+    if "sparse_categorical_crossentropy" in ln:
+        _require(y_is_sparse_labels, "Loss 'sparse_categorical_crossentropy' expects integer class labels (e.g., 0..K-1) with shape [batch].")
+        if out_units is not None:
+            _require(out_units >= 2, f"Model output units should be the number of classes (>=2). Got {out_units}.")
+            if n_classes is not None:
+                _require(out_units == n_classes, f"Model outputs {out_units} units but dataset has {n_classes} classes. Align final Dense units to number of classes.")
+        suggestions.append("Use a final Dense(num_classes, activation='softmax') layer for multiclass classification.")
+    elif "categorical_crossentropy" in ln:
+        _require(y_is_one_hot, "Loss 'categorical_crossentropy' expects one-hot encoded targets with shape [batch, num_classes]. Consider one-hot encoding your labels or use 'sparse_categorical_crossentropy'.")
+        if out_units is not None and y_is_one_hot:
+            _require(out_units == y.shape[1], f"Model outputs {out_units} units but target one-hot dimension is {y.shape[1]}.")
+        suggestions.append("Use a final Dense(num_classes, activation='softmax') layer for multiclass classification.")
+    elif "binary_crossentropy" in ln:
+        _require(is_binary or (y_is_one_hot and y.shape[1] == 1) or (y.ndim == 1), "'binary_crossentropy' expects binary targets (0/1).")
+        if out_units is not None:
+            _require(out_units == 1, f"Binary classification typically uses a single output unit with sigmoid. Got {out_units} units.")
+        suggestions.append("Use a final Dense(1, activation='sigmoid') for binary classification.")
+    else:
+        # Assume regression-style loss
+        if is_multiclass or (y_is_sparse_labels and (n_classes or 0) > 2):
+            errors.append("Regression loss selected but the target looks like classification labels. Consider using 'sparse_categorical_crossentropy' (integer labels) or 'categorical_crossentropy' (one-hot).")
+        if out_units is not None and y.ndim == 1:
+            _require(out_units == 1, f"Regression targets with shape [batch] expect a single output unit. Got {out_units} units.")
+
+    if errors:
+        # Aggregate a friendly message and stop early before compile/fit
+        message = (
+            "Training configuration is incompatible:\n- "
+            + "\n- ".join(errors)
+        )
+        if suggestions:
+            message += "\n\nHow to fix:\n- " + "\n- ".join(suggestions)
+        raise ValueError(message)
+
+    return model, X, y, metric_names
+
+
 def run_training_job(job_id: str) -> None:
     """Train a compiled Keras model and update the associated job record."""
+    # Cancellation is watched off the training thread for the whole run
+    with CancellationToken(job_id) as token:
+        try:
+            _run_training_job(job_id, token)
+        finally:
+            # A job's mixed precision policy must not leak into the worker's next job
+            set_precision_policy("float32")
+
+
+def _run_training_job(job_id: str, token: CancellationToken) -> None:
     # Make sure DB connections are not shared across task worker processes
     close_old_connections()
 
@@ -123,9 +267,24 @@ def run_training_job(job_id: str) -> None:
         if job.status == TrainingStatus.CANCELLED:
             return
 
+        # Still queued or running at delivery means every earlier run lost its worker
+        if job.attempts >= max(int(settings.NETWORK_MAX_ATTEMPTS), 1):
+            job.status = TrainingStatus.FAILED
+            job.error = (
+                f"Training failed: the worker stopped during each of {job.attempts} attempts "
+                "(it may have run out of memory)"
+            )
+            job.save(update_fields=["status", "error", "updated_at"])
+            clear_checkpoints(str(job.id))
+            return
+
         job.status = TrainingStatus.RUNNING
         job.progress = 0.01
-        job.save(update_fields=["status", "progress", "updated_at"])
+        job.attempts += 1
+        # A redelivered run starts clean (it may resume from a checkpoint)
+        job.error = ""
+        job.save(update_fields=["status", "progress", "error", "attempts", "updated_at"])
+        events.publish_status(job)
 
         # 1) Load graph payload
         graph: NetworkGraph = job.graph
@@ -160,242 +319,99 @@ def run_training_job(job_id: str) -> None:
         job.save(update_fields=["status", "error", "updated_at"])
         return
 
+    profiler = None
     try:
         # 3) Load params and dataset first (so we can validate compatibility before fitting)
         params = TrainParams.from_dict(job.params)
+        profiler = TrainingProfiler(trace=params.profile_trace)
+        model, X, y, metric_names = prepare_training_data(job, params, token, profiler)
+        token.raise_if_cancelled()
 
-        # 4) Load dataset (support storage-backed keys)
-        if not job.dataset_path:
-            raise FileNotFoundError("Uploaded dataset CSV file not found for job")
+        if job.kind == TrainingJobKind.SWEEP or params.cv_folds >= 2:
+            # Imported lazily: both reuse this module's helpers
+            from network.services.cross_validation import run_cross_validation
+            from network.services.sweeps import run_sweep
 
-        # If storage.exists indicates presence, open stream; otherwise treat as local path
-        try:
-            if storage.exists(job.dataset_path):
-                with storage.open_stream(job.dataset_path) as fh:
-                    df = pd.read_csv(fh)
-            else:
-                if not os.path.exists(job.dataset_path):
-                    raise FileNotFoundError("Uploaded dataset CSV file not found for job")
-                df = pd.read_csv(job.dataset_path)
-        except Exception as exc:
-            raise
-        x_cols = params.x_columns
-        y_col = params.y_column
-        if not x_cols or not y_col:
-            raise ValueError("Missing x_columns or y_column in params")
-        X = df[x_cols].to_numpy(dtype=np.float32)
-        y = df[y_col].to_numpy()
-
-        # Heuristics about target
-        def _is_integer_array(arr: np.ndarray) -> bool:
-            try:
-                return np.issubdtype(arr.dtype, np.integer) or np.all(np.equal(np.mod(arr, 1), 0))
-            except Exception:
-                return False
-
-        def _is_one_hot(arr: np.ndarray) -> bool:
-            if arr.ndim != 2 or arr.shape[1] < 2:
-                return False
-            vals = np.unique(arr)
-            if not np.all(np.isin(vals, [0, 1])):
-                return False
-            row_sums = arr.sum(axis=1)
-            # allow small numeric tolerance
-            return np.all(np.isclose(row_sums, 1.0, atol=1e-6))
-
-        # Probe selected loss to decide on one-hot conversion
-        try:
-            from keras import losses as _k_losses
-            _probe_los = _k_losses.get(params.loss)
-            loss_name_probe = getattr(_probe_los, "name", None) or str(_probe_los)
-        except Exception:
-            loss_name_probe = str(params.loss)
-
-        def _coerce_one_hot_if_needed(arr: np.ndarray) -> np.ndarray:
-            if arr.ndim == 1 and _is_integer_array(arr):
-                classes = np.unique(arr)
-                class_to_idx = {c: i for i, c in enumerate(classes)}
-                idx = np.vectorize(lambda v: class_to_idx.get(v, 0))(arr)
-                oh = np.eye(len(classes), dtype=np.float32)[idx]
-                return oh
-            return arr
-
-        loss_lc = (loss_name_probe or str(params.loss)).lower()
-        if params.y_one_hot or ("categorical_crossentropy" in loss_lc and "sparse_categorical_crossentropy" not in loss_lc):
-            if y.ndim == 1 and _is_integer_array(y):
-                y = _coerce_one_hot_if_needed(y)
-
-        # Infer task and classes after potential conversion
-        y_shape = y.shape
-        y_is_sparse_labels = (y.ndim == 1) and _is_integer_array(y)
-        y_is_one_hot = _is_one_hot(y)
-        n_classes = int(len(np.unique(y))) if y_is_sparse_labels else (int(y.shape[1]) if y_is_one_hot else None)
-
-        # 5) Build model to inspect output shape
-        from keras import optimizers, losses, metrics as kmetrics
-        try:
-            structure = validate_graph_payload(
-                list(job.graph.nodes.order_by("created_at").values("id", "type", "label", "params", "position", "notes")),
-                [
-                    dict(
-                        id=e["id"],
-                        source=e.get("source_id"),
-                        target=e.get("target_id"),
-                        meta=e.get("meta"),
-                    )
-                    for e in job.graph.edges.order_by("created_at").values("id", "source_id", "target_id", "meta")
-                ],
-            )
-        except Exception:
-            # already validated above; if it fails here, rethrow and let outer handler deal with it
-            structure = None  # type: ignore
-        model = build_keras_model(structure,  # type: ignore[arg-type]
-                                  list(job.graph.nodes.order_by("created_at").values("id", "type", "label", "params", "position", "notes")),
-                                  [
-                                      {
-                                          "id": e["id"],
-                                          "source": e.get("source_id"),
-                                          "target": e.get("target_id"),
-                                          "meta": e.get("meta"),
-                                      }
-                                      for e in job.graph.edges.order_by("created_at").values("id", "source_id", "target_id", "meta")
-                                  ])
-
-        # Inspect output units
-        out_shape = model.output_shape
-        if isinstance(out_shape, (list, tuple)) and out_shape and isinstance(out_shape[0], (list, tuple)):
-            oshape = out_shape[0]
-        else:
-            oshape = out_shape
-        try:
-            out_units = int(oshape[-1]) if isinstance(oshape, (list, tuple)) else int(getattr(oshape, "-1", 1))
-        except Exception:
-            out_units = None  # type: ignore
-
-        # Normalize/identify loss & metrics
-        los = losses.get(params.loss)
-        loss_name = getattr(los, "name", None) or str(los)
-        mets_raw = params.metrics or []
-
-        # Auto-normalize 'accuracy' when possible
-        normalized_metrics: List[Any] = []
-        for m in mets_raw:
-            m_low = str(m).lower()
-            if m_low in {"accuracy", "acc"}:
-                if "sparse_categorical_crossentropy" in loss_name:
-                    normalized_metrics.append(kmetrics.get("sparse_categorical_accuracy"))
-                elif "categorical_crossentropy" in loss_name:
-                    normalized_metrics.append(kmetrics.get("categorical_accuracy"))
-                elif "binary_crossentropy" in loss_name:
-                    normalized_metrics.append(kmetrics.get("binary_accuracy"))
-                else:
-                    # For regression, 'accuracy' is meaningless; skip it
-                    continue
+            if job.kind == TrainingJobKind.SWEEP:
+                result = run_sweep(job, params, model, X, y, metric_names, token)
             else:
-                normalized_metrics.append(kmetrics.get(m))
-
-        # 6) Validate compatibility and provide actionable messages
-        errors: List[str] = []
-        suggestions: List[str] = []
-
-        # Classification vs regression heuristics
-        is_binary = (n_classes == 2)
-        is_multiclass = (n_classes is not None and n_classes > 2) or y_is_one_hot
-        is_regression_target = not (y_is_sparse_labels or y_is_one_hot)
-
-        def _require(cond: bool, msg: str):
-            if not cond:
-                errors.append(msg)
-
-        # Loss-based expectations
-        ln = loss_name.lower()
-        if "sparse_categorical_crossentropy" in ln:
-            _require(y_is_sparse_labels, "Loss 'sparse_categorical_crossentropy' expects integer class labels (e.g., 0..K-1) with shape [batch].")
-            if out_units is not None:
-                _require(out_units >= 2, f"Model output units should be the number of classes (>=2). Got {out_units}.")
-                if n_classes is not None:
-                    _require(out_units == n_classes, f"Model outputs {out_units} units but dataset has {n_classes} classes. Align final Dense units to number of classes.")
-            suggestions.append("Use a final Dense(num_classes, activation='softmax') layer for multiclass classification.")
-        elif "categorical_crossentropy" in ln:
-            _require(y_is_one_hot, "Loss 'categorical_crossentropy' expects one-hot encoded targets with shape [batch, num_classes]. Consider one-hot encoding your labels or use 'sparse_categorical_crossentropy'.")
-            if out_units is not None and y_is_one_hot:
-                _require(out_units == y.shape[1], f"Model outputs {out_units} units but target one-hot dimension is {y.shape[1]}.")
-            suggestions.append("Use a final Dense(num_classes, activation='softmax') layer for multiclass classification.")
-        elif "binary_crossentropy" in ln:
-            _require(is_binary or (y_is_one_hot and y.shape[1] == 1) or (y.ndim == 1), "'binary_crossentropy' expects binary targets (0/1).")
-            if out_units is not None:
-                _require(out_units == 1, f"Binary classification typically uses a single output unit with sigmoid. Got {out_units} units.")
-            suggestions.append("Use a final Dense(1, activation='sigmoid') for binary classification.")
-        else:
-            # Assume regression-style loss
-            if is_multiclass or (y_is_sparse_labels and (n_classes or 0) > 2):
-                errors.append("Regression loss selected but the target looks like classification labels. Consider using 'sparse_categorical_crossentropy' (integer labels) or 'categorical_crossentropy' (one-hot).")
-            if out_units is not None and y.ndim == 1:
-                _require(out_units == 1, f"Regression targets with shape [batch] expect a single output unit. Got {out_units} units.")
-
-        if errors:
-            # Aggregate a friendly message and stop early before compile/fit
-            message = (
-                "Training configuration is incompatible:\n- "
-                + "\n- ".join(errors)
-            )
-            if suggestions:
-                message += "\n\nHow to fix:\n- " + "\n- ".join(suggestions)
-            raise ValueError(message)
-
-        # 7) Compile model with normalized metrics
-        opt_config: Dict[str, Any] = {}
-        if params.clipnorm is not None:
-            opt_config['clipnorm'] = params.clipnorm
-        if params.clipvalue is not None:
-            opt_config['clipvalue'] = params.clipvalue
-
-        try:
-            # Get the class from the string name
-            opt_instance = optimizers.get(params.optimizer)
-            opt_class = opt_instance.__class__
-            # Re-instantiate with user params
-            opt = opt_class(**opt_config)
-        except Exception:
-            # Fallback
-            opt = optimizers.get(params.optimizer)
-        # Apply learning rate override if provided
-        try:
-            if params.learning_rate is not None and hasattr(opt, "learning_rate"):
-                # Some optimizers expose a tf.Variable; assign via attribute works in Keras 3
-                opt.learning_rate = params.learning_rate  # type: ignore[attr-defined]
-        except Exception:
-            pass
-        model.compile(optimizer=opt, loss=los, metrics=normalized_metrics)
+                result = run_cross_validation(job, params, model, X, y, metric_names, token)
+            job.artifact_path = result.pop("artifact_path", None) or ""
+            job.result = result
+            job.status = TrainingStatus.SUCCEEDED
+            job.progress = 1.0
+            job.save(update_fields=["status", "result", "artifact_path", "progress", "updated_at"])
+            return
 
-        job.progress = 0.05
-        job.save(update_fields=["progress", "updated_at"])
+        # Warm start from an earlier job's weights, optionally on the rows appended since
+        dataset = dataset_fingerprint(X, y)
+        source = get_source_job(params.warm_start_from) if params.warm_start_from else None
+        skipped_rows = 0
+        if source is not None and params.new_rows_only:
+            skipped_rows = appended_rows(source, X, y)
+            X, y = X[skipped_rows:], y[skipped_rows:]
 
         # 5) Train/val/test split (simple random split)
-        rng = np.random.default_rng(seed=42)
-        idx = np.arange(len(X))
-        rng.shuffle(idx)
-        n = len(idx)
-        n_test = int(n * params.test_split)
-        n_val = int(n * params.validation_split)
-        n_train = n - n_test - n_val
-        train_idx = idx[:n_train]
-        val_idx = idx[n_train:n_train + n_val]
-        test_idx = idx[n_train + n_val:]
+        train_idx, val_idx, test_idx = split_indices(len(X), params.validation_split, params.test_split)
 
         X_train, y_train = X[train_idx], y[train_idx]
         X_val, y_val = X[val_idx], y[val_idx]
         X_test, y_test = X[test_idx], y[test_idx]
 
+        # 6) Resolve the TensorFlow runtime (XLA, precision, steps per execution, threads);
+        # a mixed precision policy only applies to layers built under it
+        runtime = resolve_runtime(params, model.count_params(), len(train_idx))
+        runtime_info = {**runtime.as_dict(), **apply_threads(runtime)}
+        if runtime.mixed_precision != "float32":
+            set_precision_policy(runtime.mixed_precision)
+            with profiler.phase("graph_build"):
+                model = build_job_model(job)
+
+        warm_start = None
+        if source is not None:
+            warm_start = apply_warm_start(model, source, params.freeze_layers)
+            warm_start["skipped_rows"] = skipped_rows
+
+        # The latest checkpoint of an earlier run of this job, requeued after its worker was lost
+        resumed = load_latest_checkpoint(str(job.id))
+
+        # Pick the batch size from timed probes (or the lost run's); steps per execution follow the choice
+        batch_tuning = None
+        if params.auto_batch_size:
+            if resumed is not None and resumed.extra.get("batch_tuning"):
+                batch_tuning = after_worker_lost(resumed.extra["batch_tuning"], resumed.epoch)
+            else:
+                with profiler.phase("batch_tuning"):
+                    batch_tuning = tune_batch_size(model, params, metric_names, X_train, y_train)
+            params.batch_size = batch_tuning["batch_size"]
+            runtime = resolve_runtime(params, model.count_params(), len(train_idx))
+            runtime_info.update(runtime.as_dict())
+
+        # 7) Compile model with normalized metrics, or resume from the checkpoint
+        with profiler.phase("compile"):
+            compile_model(model, params, metric_names, runtime.jit_compile, runtime.steps_per_execution)
+        initial_epoch = 0
+        previous_history: Dict[str, List[float]] = {}
+        if resumed is not None:
+            model = resumed.model
+            initial_epoch = min(resumed.epoch, params.epochs)
+            previous_history = resumed.history
+            restore_rng_state(resumed.rng)
+
+        job.progress = 0.05
+        job.save(update_fields=["progress", "updated_at"])
+
         # 8) Fit
         # Callback to push progress and live metrics after each epoch
         from tensorflow.keras.callbacks import Callback  # type: ignore
-        from keras.callbacks import EarlyStopping, ReduceLROnPlateau, ModelCheckpoint, CSVLogger  # type: ignore
+        from keras.callbacks import ModelCheckpoint, CSVLogger, History  # type: ignore
 
         class _JobProgressCallback(Callback):  # pragma: no cover - relies on Keras runtime
+            """Streams per-batch progress and live metrics through an `events.ProgressReporter`."""
+
             def __init__(self, jid: str, total_epochs: int):
                 super().__init__()
-                self.jid = jid
+                self.reporter = events.ProgressReporter(jid)
                 self.total = max(int(total_epochs), 1)
                 self.current_epoch = 0
 
@@ -408,30 +424,15 @@ def run_training_job(job_id: str) -> None:
                     frac = (epoch + 1) / float(self.total)
                     prog = 0.05 + 0.9 * float(frac)
                     # update live metrics snapshot
-                    job_live = {
-                        "epoch": int(epoch + 1),
-                        "loss": float(logs.get("loss", 0.0)),
-                    }
+                    live = self.reporter.live
+                    live["epoch"] = int(epoch + 1)
+                    live["loss"] = float(logs.get("loss", 0.0))
                     # include common metrics if present
                     for k in ("accuracy", "sparse_categorical_accuracy", "categorical_accuracy", "binary_accuracy", "val_loss"):
                         if k in logs:
-                            job_live[k] = float(logs[k])
-                    # perform atomic update
-                    tj = TrainingJob.objects.filter(id=self.jid)
-                    # read current result to merge live key without dropping history/evaluation
-                    current = TrainingJob.objects.get(id=self.jid)
-                    res = dict(current.result or {})
-                    res["live"] = job_live
-                    tj.update(progress=prog, result=res)
-
-                    # Check for cancellation request and stop training early
-                    if current.status == TrainingStatus.CANCELLED:
-                        try:
-                            self.model.stop_training = True  # type: ignore[attr-defined]
-                        except Exception:
-                            pass
+                            live[k] = float(logs[k])
+                    self.reporter.report(prog, force_publish=True)
                 except Exception:
-                    # best-effort; don't crash training on DB update issues
                     pass
 
             def on_train_batch_end(self, batch, logs=None):  # type: ignore[override]
@@ -445,40 +446,26 @@ def run_training_job(job_id: str) -> None:
                     overall = (self.current_epoch + frac_epoch) / float(self.total)
                     prog = 0.05 + 0.9 * float(overall)
 
-                    job_live = {
-                        "epoch": int(self.current_epoch + 1),  # human-friendly epoch index
-                        "loss": float(logs.get("loss", 0.0)),
-                    }
+                    # human-friendly epoch index; val_loss keeps its last epoch-end value
+                    live = self.reporter.live
+                    live["epoch"] = int(self.current_epoch + 1)
+                    live["loss"] = float(logs.get("loss", 0.0))
                     for k in ("accuracy", "sparse_categorical_accuracy", "categorical_accuracy", "binary_accuracy"):
                         if k in logs:
-                            job_live[k] = float(logs[k])
-
-                    # atomic update
-                    tj = TrainingJob.objects.filter(id=self.jid)
-                    current = TrainingJob.objects.get(id=self.jid)
-                    res = dict(current.result or {})
-                    # Preserve last known values for metrics not available at batch granularity (e.g., val_loss)
-                    prev_live = dict((res.get("live") or {}))
-                    for k in ("val_loss", "accuracy", "sparse_categorical_accuracy", "categorical_accuracy", "binary_accuracy"):
-                        if k not in job_live and k in prev_live:
-                            try:
-                                job_live[k] = float(prev_live[k])
-                            except Exception:
-                                job_live[k] = prev_live[k]
-                    res["live"] = job_live
-                    tj.update(progress=prog, result=res)
-
-                    if current.status == TrainingStatus.CANCELLED:
-                        try:
-                            self.model.stop_training = True  # type: ignore[attr-defined]
-                        except Exception:
-                            pass
+                            live[k] = float(logs[k])
+                    self.reporter.report(prog)
                 except Exception:
                     pass
 
+            def on_train_end(self, logs=None):  # type: ignore[override]
+                # Persist the final snapshot regardless of the throttle
+                self.reporter.flush()
+
         cb = _JobProgressCallback(str(job.id), params.epochs)
         # Add optional callbacks
-        callbacks_list: List[Any] = [cb]
+        # The cancellation check goes first so no other callback runs after a cancel
+        cancel_cb = cancellation_callback(token)
+        callbacks_list: List[Any] = [cancel_cb, profiler.callback(len(X_train)), cb]
         
         # Checkpointing & Logs
         best_model_path = None
@@ -511,75 +498,77 @@ def run_training_job(job_id: str) -> None:
             except Exception:
                 pass
 
-        if params.early_stopping:
-            try:
-                callbacks_list.append(
-                    EarlyStopping(
-                        monitor=params.es_monitor,
-                        mode=params.es_mode,
-                        patience=int(params.es_patience),
-                        min_delta=float(params.es_min_delta),
-                        restore_best_weights=bool(params.es_restore_best_weights),
-                        verbose=0,
-                    )
-                )
-            except Exception:
-                pass
-        if params.reduce_lr:
+        callbacks_list.extend(schedule_callbacks(params))
+        if settings.NETWORK_CHECKPOINT_INTERVAL > 0:
+            # The tuning travels with the checkpoints (updated in place on fallbacks)
+            extra = {"batch_tuning": batch_tuning} if batch_tuning is not None else None
+            callbacks_list.append(checkpoint_callback(str(job.id), previous_history, extra=extra))
+
+        profiler.begin("fit")
+        while True:
+            history = History()
             try:
-                callbacks_list.append(
-                    ReduceLROnPlateau(
-                        monitor=params.rlrop_monitor,
-                        factor=float(params.rlrop_factor),
-                        patience=int(params.rlrop_patience),
-                        min_lr=float(params.rlrop_min_lr),
-                        verbose=0,
-                    )
+                model.fit(
+                    X_train,
+                    y_train,
+                    epochs=params.epochs,
+                    initial_epoch=initial_epoch,
+                    batch_size=params.batch_size,
+                    validation_data=(X_val, y_val) if len(X_val) > 0 else None,
+                    validation_batch_size=(params.validation_batch_size or None),
+                    verbose=0,
+                    callbacks=[*callbacks_list, history],
+                    shuffle=bool(params.shuffle),
                 )
-            except Exception:
-                pass
-
-        history = model.fit(
-            X_train,
-            y_train,
-            epochs=params.epochs,
-            batch_size=params.batch_size,
-            validation_data=(X_val, y_val) if len(X_val) > 0 else None,
-            validation_batch_size=(params.validation_batch_size or None),
-            verbose=0,
-            callbacks=callbacks_list,
-            shuffle=bool(params.shuffle),
-        )
-
-        # Refresh job to observe cancellation state set by API during training
-        job.refresh_from_db()
-        if job.status == TrainingStatus.CANCELLED:
+                break
+            except Exception as exc:
+                smaller = fallback_batch_size(batch_tuning, params.batch_size, exc)
+                if smaller is None:
+                    raise
+                # Out of memory with a tuned batch size: keep the completed epochs, go on with a smaller one
+                for k, v in (history.history or {}).items():
+                    previous_history.setdefault(k, []).extend(float(x) for x in v)
+                initial_epoch += len(history.epoch)
+                batch_tuning["fallbacks"].append({"from": params.batch_size, "to": smaller, "epoch": initial_epoch})
+                batch_tuning["batch_size"] = params.batch_size = smaller
+        profiler.end("fit")
+
+        # History of this run, after the epochs restored from a checkpoint
+        full_history = {k: list(v) for k, v in previous_history.items()}
+        for k, v in (history.history or {}).items():
+            full_history.setdefault(k, []).extend(float(x) for x in v)
+
+        def _stop_cancelled() -> None:
             # Preserve partial history; skip evaluation/artifact
+            clear_checkpoints(str(job.id))
+            profiler.discard_trace()
+            job.status = TrainingStatus.CANCELLED
             job.result = {
-                "history": {k: [float(x) for x in v] for k, v in (history.history or {}).items()},
+                "history": full_history,
                 "evaluation": None,
             }
             # Progress was updated incrementally during training; keep as-is
-            job.save(update_fields=["result", "updated_at"])
+            job.save(update_fields=["status", "result", "updated_at"])
+
+        if token.cancelled:
+            _stop_cancelled()
             return
 
         job.progress = 0.95
         job.save(update_fields=["progress", "updated_at"])
 
         # 9) Evaluate
-        eval_res = None
-        if len(X_test) > 0:
-            eval_res = model.evaluate(X_test, y_test, verbose=0)
-            # Keras returns list if metrics set; map to names
-            names = ["loss"] + [m.name if hasattr(m, "name") else str(m) for m in (normalized_metrics or [])]
-            if isinstance(eval_res, (list, tuple)):
-                eval_res = {k: float(v) for k, v in zip(names, eval_res)}
-            else:
-                eval_res = {"loss": float(eval_res)}
+        with profiler.phase("evaluate"):
+            eval_res = evaluate_model(model, X_test, y_test, callbacks=[cancel_cb])
+        if token.cancelled:
+            _stop_cancelled()
+            return
 
         # 10) Save artifact: write to a temp path and push to configured storage
         import tempfile, shutil
 
+        profiler.begin("artifact_save")
+
         tmpf = None
         tmp_path = None
         try:
@@ -647,22 +636,47 @@ def run_training_job(job_id: str) -> None:
                 except Exception:
                     pass
 
+        # TensorFlow profiler trace (profile_trace), served as artifact type=profile
+        profile_trace_artifact = profiler.export_trace(os.path.join(_ensure_artifacts_dir(), f"{job.id}_profile"))
+        profiler.end("artifact_save")
+        profile = profiler.summary()
+
         # 11) Persist results
         job.result = {
-            "history": {k: [float(x) for x in v] for k, v in (history.history or {}).items()},
+            "history": full_history,
             "evaluation": eval_res,
+            # Let later jobs warm-start from this one (network/services/warm_start.py)
+            "model_signature": model_signature(model),
+            "dataset": dataset,
+            "warm_start": warm_start,
+            "runtime": {**runtime_info, "step_time_ms": profile["step_mean_ms"]},
+            "batch_tuning": batch_tuning,
+            # Samples per optimizer update (batch_size x gradient_accumulation_steps)
+            "effective_batch_size": params.batch_size * max(params.gradient_accumulation_steps, 1),
+            "profile": profile,
+            "profile_trace_artifact": profile_trace_artifact,
             "best_model_artifact": best_model_artifact,
             "training_log_artifact": training_log_artifact,
         }
+        if resumed is not None:
+            job.result["resumed_from_epoch"] = resumed.epoch
         job.status = TrainingStatus.SUCCEEDED
         job.progress = 1.0
         job.save(update_fields=["status", "result", "artifact_path", "progress", "error", "updated_at"])
+        clear_checkpoints(str(job.id))
 
     except Exception as exc:
+        # No trace artifact without a finished run (the profiler is None if loading failed)
+        if profiler is not None:
+            profiler.discard_trace()
         # If cancellation was requested, do not override with FAILED
         job.refresh_from_db()
-        if job.status == TrainingStatus.CANCELLED:
+        if job.status == TrainingStatus.CANCELLED or isinstance(exc, TrainingCancelled):
             # Keep whatever was persisted already
+            if job.status != TrainingStatus.CANCELLED:
+                job.status = TrainingStatus.CANCELLED
+                job.save(update_fields=["status", "updated_at"])
+            clear_checkpoints(str(job.id))
             return
         job.status = TrainingStatus.FAILED
         # Improve common keras/tf messages with hints
@@ -673,12 +687,28 @@ def run_training_job(job_id: str) -> None:
             msg += "\nHint: Check that your target shape matches model outputs. Integer labels require sparse_categorical_crossentropy; one-hot labels require categorical_crossentropy."
         job.error = f"Training failed: {msg}"
         job.save(update_fields=["status", "error", "updated_at"])
-
-
-@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, retry_jitter=True, max_retries=3, name="network.run_training_job")
+        # Failed jobs are not retried, so nothing will resume from the checkpoints
+        clear_checkpoints(str(job.id))
+
+
+# Acknowledged only after it finishes: a killed worker's job is redelivered and resumes from its
+# checkpoint, up to NETWORK_MAX_ATTEMPTS runs. Errors raised by training itself fail the job instead
+@shared_task(
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    name="network.run_training_job",
+)
 def run_training_job_task(self, job_id: str) -> None:
     """Celery task entry point for executing a training job."""
-    run_training_job(job_id)
+    # No-op once TF is initialized; the TF_NUM_*_THREADS exported at start-up then apply
+    configure_tensorflow()
+    with limit_threads("network.training"):
+        run_training_job(job_id)
+    # Tell watchers the final state (every exit path of run_training_job ends here)
+    job = TrainingJob.objects.filter(id=job_id).first()
+    if job is not None and job.status in events.TERMINAL_STATUSES:
+        events.publish_status(job)
 
 
 def launch_training_job(job: TrainingJob) -> None:
@@ -0,0 +1,284 @@
+"""Process pool running training trials (sweep candidates, CV folds) over one dataset.
+
+The parent loads, validates and encodes the dataset once and writes ``X``/``y``
+as ``.npy`` files to shared memory (``/dev/shm`` when available); every trial
+process memory-maps them read-only, so concurrent trials share one copy of
+the data. The model travels as its Keras JSON config (built and checked once
+by the parent) and is recompiled per trial with the trial's parameters.
+
+Each process caps TensorFlow and BLAS threads to its share of the worker's
+budget so concurrent trials do not oversubscribe the CPU, and the number of
+processes is capped by the worker's free memory, since every process loads
+its own TensorFlow runtime. Trials report
+per-batch progress through a queue and stop on a shared cancellation event.
+This module must stay importable without Django: trial processes are
+spawned and never set up the ORM.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+
+from network.services.fitting import TrainParams, compile_model, evaluate_model, schedule_callbacks
+
+# Estimated RSS of one spawned trial process once TensorFlow is imported, in MiB
+TRIAL_PROCESS_MB = 700
+
+# Per-process state set by `_init_worker` (or by `TrialPool` itself when running inline)
+_state: Dict[str, Any] = {}
+
+
+def _shared_dir() -> str | None:
+    # tmpfs-backed, so the memory maps never touch the disk
+    return "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+
+class SharedDataset:
+    """``X``/``y`` saved once as ``.npy`` files and memory-mapped by every trial process."""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray):
+        self.directory = tempfile.mkdtemp(prefix="maid-trials-", dir=_shared_dir())
+        self.x_path = os.path.join(self.directory, "X.npy")
+        self.y_path = os.path.join(self.directory, "y.npy")
+        np.save(self.x_path, np.ascontiguousarray(X))
+        np.save(self.y_path, np.ascontiguousarray(y))
+
+    def load(self) -> tuple[np.ndarray, np.ndarray]:
+        return np.load(self.x_path, mmap_mode="r"), np.load(self.y_path, mmap_mode="r")
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+@dataclass
+class TrialSpec:
+    """One trial run: train on `train_idx` up to `epochs`, optionally resuming from `checkpoint`."""
+
+    trial_id: str
+    params: Dict[str, Any]
+    metric_names: List[str]
+    train_idx: np.ndarray
+    val_idx: np.ndarray
+    test_idx: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    epochs: int = 1
+    initial_epoch: int = 0
+    # .keras file the trial resumes from (if present) and saves to (model + optimizer state)
+    checkpoint: str | None = None
+    evaluate: bool = False
+    seed: int = 42
+
+
+def _init_worker(x_path: str, y_path: str, model_json: str, threads: int, progress, cancel_event) -> None:
+    # Size TF's pools before it initializes, and shrink the BLAS pools numpy already created
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = str(min(2, threads))
+    for name in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[name] = str(threads)
+    from threadpoolctl import threadpool_limits
+
+    threadpool_limits(limits=threads)
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(min(2, threads))
+    except RuntimeError:
+        pass
+    _state.update(
+        X=np.load(x_path, mmap_mode="r"),
+        y=np.load(y_path, mmap_mode="r"),
+        model_json=model_json,
+        progress=progress,
+        cancel=cancel_event,
+    )
+
+
+def _trial_callback(spec: TrialSpec):
+    from keras.callbacks import Callback
+
+    progress = _state.get("progress")
+    cancel = _state.get("cancel")
+
+    class _TrialCallback(Callback):  # pragma: no cover - relies on Keras runtime
+        """Reports (trial, fractional epoch, logs) to the parent and honours cancellation."""
+
+        def __init__(self):
+            super().__init__()
+            self.epoch = spec.initial_epoch
+            self._sent = 0.0
+
+        def _send(self, epoch: float, logs, force: bool = False) -> None:
+            now = time.monotonic()
+            if progress is None or (not force and now - self._sent < 0.25):
+                return
+            self._sent = now
+            metrics = {k: float(v) for k, v in (logs or {}).items() if isinstance(v, (int, float, np.floating))}
+            progress.put((spec.trial_id, epoch, metrics))
+
+        def on_epoch_begin(self, epoch, logs=None):  # type: ignore[override]
+            self.epoch = int(epoch)
+
+        def on_train_batch_end(self, batch, logs=None):  # type: ignore[override]
+            steps = max(int(self.params.get("steps") or 1), 1)  # type: ignore[attr-defined]
+            self._send(self.epoch + (int(batch) + 1) / steps, logs)
+            if cancel is not None and cancel.is_set():
+                self.model.stop_training = True
+
+        def on_test_batch_end(self, batch, logs=None):  # type: ignore[override]
+            if cancel is not None and cancel.is_set():
+                self.model.stop_evaluating = True
+
+        def on_epoch_end(self, epoch, logs=None):  # type: ignore[override]
+            self._send(epoch + 1, logs, force=True)
+
+    return _TrialCallback()
+
+
+def run_trial(spec: TrialSpec) -> Dict[str, Any]:
+    """Train one trial in the current (pool) process and return its history and evaluation."""
+    import keras
+
+    started = time.perf_counter()
+    X, y = _state["X"], _state["y"]
+    params = TrainParams.from_dict(spec.params)
+    keras.utils.set_random_seed(spec.seed)
+    if spec.checkpoint and os.path.exists(spec.checkpoint):
+        model = keras.models.load_model(spec.checkpoint)
+    else:
+        model = keras.models.model_from_json(_state["model_json"])
+        compile_model(model, params, spec.metric_names)
+
+    # Fancy indexing copies only this trial's rows out of the shared map
+    X_val, y_val = X[spec.val_idx], y[spec.val_idx]
+    callback = _trial_callback(spec)
+    history = model.fit(
+        X[spec.train_idx],
+        y[spec.train_idx],
+        epochs=spec.epochs,
+        initial_epoch=spec.initial_epoch,
+        batch_size=params.batch_size,
+        validation_data=(X_val, y_val) if len(X_val) > 0 else None,
+        validation_batch_size=(params.validation_batch_size or None),
+        verbose=0,
+        callbacks=[callback, *schedule_callbacks(params)],
+        shuffle=bool(params.shuffle),
+    )
+    cancel = _state.get("cancel")
+    cancelled = bool(cancel is not None and cancel.is_set())
+    if spec.checkpoint and not cancelled:
+        model.save(spec.checkpoint)
+    evaluation = None
+    if spec.evaluate and not cancelled:
+        evaluation = evaluate_model(model, X[spec.test_idx], y[spec.test_idx], callbacks=[callback])
+    return {
+        "trial_id": spec.trial_id,
+        "history": {k: [float(x) for x in v] for k, v in (history.history or {}).items()},
+        "epochs_trained": spec.initial_epoch + len(history.epoch or []),
+        "evaluation": evaluation,
+        "cancelled": cancelled,
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+def pool_size(
+    n_trials: int, max_workers: int, thread_budget: int,
+    memory_mb: float | None = None, process_mb: float = TRIAL_PROCESS_MB,
+) -> tuple[int, int]:
+    """
+    ``(processes, threads per trial)`` splitting `thread_budget` between concurrent trials,
+    with at most one process per `process_mb` of `memory_mb` (the worker's free memory).
+    Returns 0 processes (run inline) when only one trial would run at a time.
+    """
+    workers = min(n_trials, max_workers, thread_budget)
+    if memory_mb is not None and process_mb > 0:
+        workers = min(workers, int(memory_mb // process_mb))
+    if workers <= 1:
+        return 0, max(thread_budget, 1)
+    return workers, max(thread_budget // workers, 1)
+
+
+class TrialPool:
+    """
+    Runs `TrialSpec`s concurrently in spawned processes over a `SharedDataset`.
+    With ``workers=0`` trials run inline in the calling process (tests, tiny sweeps).
+    """
+
+    def __init__(
+        self, X: np.ndarray, y: np.ndarray, model_json: str, workers: int, threads_per_trial: int,
+        inline_cancel_event=None,
+    ):
+        self.workers = max(int(workers), 0)
+        self.threads = max(int(threads_per_trial), 1)
+        self.dataset = SharedDataset(X, y)
+        self.checkpoint_dir = tempfile.mkdtemp(prefix="maid-ckpt-")
+        self.model_json = model_json
+        self._executor: ProcessPoolExecutor | None = None
+        ctx = multiprocessing.get_context("spawn")
+        if self.workers:
+            self._progress = ctx.Queue()
+            self._cancel = ctx.Event()
+        else:
+            # Inline trials block the caller, so they watch the caller's own cancellation event
+            self._progress = queue.Queue()
+            self._cancel = inline_cancel_event or threading.Event()
+
+    def __enter__(self) -> "TrialPool":
+        if self.workers:
+            # Spawn, not fork: the Celery worker's TF runtime and DB connections must not be inherited
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    self.dataset.x_path, self.dataset.y_path, self.model_json,
+                    self.threads, self._progress, self._cancel,
+                ),
+            )
+        else:
+            X, y = self.dataset.load()
+            _state.update(X=X, y=y, model_json=self.model_json, progress=self._progress, cancel=self._cancel)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        else:
+            _state.clear()
+        self.dataset.cleanup()
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+
+    def checkpoint_path(self, trial_id: str) -> str:
+        return os.path.join(self.checkpoint_dir, f"{trial_id}.keras")
+
+    def submit(self, spec: TrialSpec) -> Future:
+        if self._executor is not None:
+            return self._executor.submit(run_trial, spec)
+        future: Future = Future()
+        try:
+            future.set_result(run_trial(spec))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    def drain_progress(self) -> List[tuple]:
+        """Progress messages ``(trial_id, epoch, logs)`` received since the last call."""
+        messages = []
+        while True:
+            try:
+                messages.append(self._progress.get_nowait())
+            except (queue.Empty, OSError, ValueError):
+                return messages
+
+    def cancel(self) -> None:
+        self._cancel.set()
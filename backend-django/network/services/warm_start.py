@@ -0,0 +1,126 @@
+"""Warm-starting a training job from the weights of an earlier job.
+
+Every successful training job records the signature of its model (the
+ordered layer types and weight shapes, hashed) and a fingerprint of its
+encoded dataset (row count and a hash of X/y) in its result. A job started
+with ``warm_start_from=<job id>`` checks its freshly built model against the
+source job's signature before copying the source artifact's weights, so an
+incompatible graph fails fast with a clear message instead of a shape error.
+
+Options:
+
+- ``freeze_layers``: keep the first N layers that have weights frozen
+  (e.g. fine-tune only the head of a network)
+- ``new_rows_only``: train only on the rows appended since the source job's
+  dataset; the leading rows must match the source's fingerprint
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict
+
+import numpy as np
+
+from network import storage
+from network.models import TrainingJob, TrainingStatus
+
+
+def model_signature(model) -> str:
+    """Hash of the ordered layer types and weight shapes: equal signatures can share weights."""
+    layers = [
+        [layer.__class__.__name__, [list(w.shape) for w in layer.weights]]
+        for layer in model.layers
+        if layer.weights
+    ]
+    return hashlib.sha256(json.dumps(layers).encode()).hexdigest()
+
+
+def _hash_rows(X: np.ndarray, y: np.ndarray) -> str:
+    digest = hashlib.sha256()
+    for arr in (X, y):
+        arr = np.ascontiguousarray(arr)
+        if arr.dtype == object:
+            arr = arr.astype(str)
+        digest.update(arr.dtype.str.encode())
+        # Hashes the array's buffer in place (no copy of large datasets)
+        digest.update(memoryview(arr).cast("B"))
+    return digest.hexdigest()
+
+
+def dataset_fingerprint(X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
+    return {"rows": int(len(X)), "sha256": _hash_rows(X, y)}
+
+
+def get_source_job(job_id: Any) -> TrainingJob:
+    """The job to warm-start from; raises ValueError unless it finished with an artifact."""
+    source = TrainingJob.objects.filter(id=job_id).first()
+    if source is None:
+        raise ValueError(f"Training job {job_id} does not exist")
+    if source.status != TrainingStatus.SUCCEEDED or not source.artifact_path:
+        raise ValueError(f"Training job {job_id} has no trained model to start from")
+    return source
+
+
+def load_artifact_model(job: TrainingJob):
+    """Load a job's saved model from the local artifacts dir or from storage."""
+    from keras.models import load_model
+
+    if os.path.exists(job.artifact_path):
+        return load_model(job.artifact_path)
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".keras")
+    try:
+        with storage.open_stream(job.artifact_path) as stream:
+            shutil.copyfileobj(stream, tmp)
+        tmp.close()
+        return load_model(tmp.name)
+    finally:
+        tmp.close()
+        os.remove(tmp.name)
+
+
+def apply_warm_start(model, source: TrainingJob, freeze_layers: int = 0) -> Dict[str, Any]:
+    """Copy the source job's weights into `model` (before it is compiled) and freeze leading layers."""
+    signature = model_signature(model)
+    expected = (source.result or {}).get("model_signature")
+    if expected and expected != signature:
+        raise ValueError(
+            f"The graph is not compatible with job {source.id}'s model: layer types or weight shapes differ"
+        )
+    trained = load_artifact_model(source)
+    if model_signature(trained) != signature:
+        raise ValueError(
+            f"The graph is not compatible with job {source.id}'s model: layer types or weight shapes differ"
+        )
+    model.set_weights(trained.get_weights())
+
+    weighted = [layer for layer in model.layers if layer.weights]
+    if freeze_layers > len(weighted):
+        raise ValueError(f"freeze_layers ({freeze_layers}) exceeds the model's {len(weighted)} layers with weights")
+    for layer in weighted[:freeze_layers]:
+        layer.trainable = False
+    return {
+        "job": str(source.id),
+        "frozen_layers": [layer.name for layer in weighted[:freeze_layers]],
+    }
+
+
+def appended_rows(source: TrainingJob, X: np.ndarray, y: np.ndarray) -> int:
+    """
+    Number of leading rows of `X`/`y` that the source job already trained on.
+    Raises ValueError unless they are exactly the source job's dataset.
+    """
+    seen = (source.result or {}).get("dataset") or {}
+    rows = int(seen.get("rows") or 0)
+    if not rows or "sha256" not in seen:
+        raise ValueError(f"Training job {source.id} did not record its dataset; train on all rows instead")
+    if rows > len(X) or _hash_rows(X[:rows], y[:rows]) != seen["sha256"]:
+        raise ValueError(
+            f"The dataset does not start with job {source.id}'s rows; new_rows_only needs the same CSV with rows appended"
+        )
+    if rows == len(X):
+        raise ValueError(f"The dataset has no rows appended since job {source.id}")
+    return rows
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import os
-from typing import BinaryIO, Optional
+from datetime import datetime, timezone
+from typing import BinaryIO, List, Optional
 
 from django.conf import settings
 from django.core.files.storage import default_storage
@@ -63,6 +64,31 @@ def exists(key: str) -> bool:
         return os.path.exists(os.path.join(str(settings.ARTIFACTS_DIR), key))
 
 
+def list_files(prefix: str) -> List[str]:
+    """Return the names of the files directly under the `prefix` "directory" (empty if missing)."""
+    try:
+        return list(default_storage.listdir(prefix)[1])
+    except Exception:
+        local = os.path.join(str(settings.ARTIFACTS_DIR), prefix)
+        try:
+            return [name for name in os.listdir(local) if os.path.isfile(os.path.join(local, name))]
+        except OSError:
+            return []
+
+
+def modified_time(key: str) -> Optional[datetime]:
+    """Last modification time of the key (timezone-aware), or None if it does not exist."""
+    try:
+        modified = default_storage.get_modified_time(key)
+    except Exception:
+        local = os.path.join(str(settings.ARTIFACTS_DIR), key)
+        try:
+            return datetime.fromtimestamp(os.path.getmtime(local), tz=timezone.utc)
+        except OSError:
+            return None
+    return modified if modified.tzinfo else modified.replace(tzinfo=timezone.utc)
+
+
 def delete(key: str) -> None:
     try:
         if default_storage.exists(key):
@@ -0,0 +1,19 @@
+"""Test helpers shared by the apps' test suites."""
+from __future__ import annotations
+
+import shutil
+import tempfile
+
+from django.test import override_settings
+
+
+class TempStorageMixin:
+    """Points `network.storage` (MEDIA_ROOT and ARTIFACTS_DIR) at a temporary directory per test."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root, ARTIFACTS_DIR=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
@@ -7,11 +7,13 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth import get_user_model
 
 from network.models import ModelImportJob, ImportJobStatus
+from network.testing import TempStorageMixin
 
 
 @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
-class ImportJobsTests(APITestCase):
+class ImportJobsTests(TempStorageMixin, APITestCase):
     def setUp(self):
+        super().setUp()
         User = get_user_model()
         self.user = User.objects.create_user(username="tester", password="testpass")
         self.client.force_authenticate(user=self.user)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from network.serializers import TrainingStartSerializer
+from network.services.batch_tuning import after_worker_lost, candidate_sizes, estimate_step_mb, fallback_batch_size, tune_batch_size
+from network.services.fitting import TrainParams
+
+
+def _model():
+    import keras
+
+    return keras.Sequential([keras.Input(shape=(2,)), keras.layers.Dense(8, activation="relu"), keras.layers.Dense(1)])
+
+
+class BatchTuningTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(256, 2)).astype(np.float32)
+        self.y = self.X.sum(axis=1)
+        self.params = TrainParams.from_dict({"x_columns": ["a", "b"], "y_column": "y", "batch_size": 25})
+
+    def test_candidates_cover_requested_size_within_rows(self):
+        self.assertEqual(candidate_sizes(100, 25), [8, 16, 25, 32, 64])
+        self.assertEqual(candidate_sizes(4, 25), [4])
+        self.assertLess(estimate_step_mb(1000, 10, 32), estimate_step_mb(1000, 10, 64))
+
+    @override_settings(NETWORK_WORKER_MEMORY_MB=1 << 20)
+    def test_picks_a_probed_size(self):
+        tuning = tune_batch_size(_model(), self.params, [], self.X, self.y)
+
+        self.assertEqual(tuning["requested_batch_size"], 25)
+        self.assertEqual([p["batch_size"] for p in tuning["probes"]], [8, 16, 25, 32, 64, 128, 256])
+        self.assertTrue(all(p["status"] == "ok" and p["samples_per_sec"] > 0 for p in tuning["probes"]))
+        best = max(tuning["probes"], key=lambda p: p["samples_per_sec"])
+        self.assertEqual(tuning["batch_size"], best["batch_size"])
+
+    @override_settings(NETWORK_WORKER_MEMORY_MB=1)
+    def test_stops_at_memory_budget(self):
+        tuning = tune_batch_size(_model(), self.params, [], self.X, self.y)
+
+        self.assertEqual([p["status"] for p in tuning["probes"]], ["over_budget"])
+        self.assertEqual(tuning["batch_size"], 8)
+
+    def test_fallback_only_after_oom(self):
+        tuning = {"probes": [{"batch_size": 32, "status": "ok"}, {"batch_size": 64, "status": "ok"}]}
+
+        self.assertEqual(fallback_batch_size(tuning, 128, MemoryError()), 64)
+        self.assertEqual(fallback_batch_size(tuning, 32, MemoryError()), 16)
+        self.assertIsNone(fallback_batch_size(tuning, 128, ValueError()))
+        self.assertIsNone(fallback_batch_size(None, 128, MemoryError()))
+
+    def test_lost_worker_resumes_one_size_down(self):
+        tuning = {
+            "batch_size": 64,
+            "probes": [{"batch_size": 32, "status": "ok"}, {"batch_size": 64, "status": "ok"}],
+            "fallbacks": [],
+        }
+        after_worker_lost(tuning, 3)
+        self.assertEqual(tuning["batch_size"], 32)
+        self.assertEqual(tuning["fallbacks"], [{"from": 64, "to": 32, "epoch": 3, "worker_lost": True}])
+
+    def test_serializer_rejects_cross_validation(self):
+        serializer = TrainingStartSerializer(
+            data={"x_columns": ["a", "b"], "y_column": "y", "auto_batch_size": True, "cv_folds": 3}
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("auto_batch_size", serializer.errors)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import io
+import time
+
+from django.test import TestCase, override_settings
+
+from network.models import NetworkGraph, TrainingJob, TrainingStatus
+from network.services import events
+from network.services.cancellation import (
+    CancellationToken,
+    TrainingCancelled,
+    read_csv_cancellable,
+    request_cancel,
+)
+
+
+@override_settings(NETWORK_EVENT_BACKEND="memory", NETWORK_CANCEL_DB_POLL_INTERVAL=0)
+class CancellationTokenTests(TestCase):
+    def setUp(self):
+        graph = NetworkGraph.objects.create(name="cancel-graph")
+        self.job = TrainingJob.objects.create(graph=graph, status=TrainingStatus.RUNNING)
+
+    def _cancel(self):
+        self.job.status = TrainingStatus.CANCELLED
+        request_cancel(self.job)
+
+    def test_running_token_sees_cancel_event(self):
+        with CancellationToken(str(self.job.id)) as token:
+            self.assertFalse(token.cancelled)
+            self._cancel()
+            deadline = time.monotonic() + 2
+            while not token.cancelled and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(token.cancelled)
+            with self.assertRaises(TrainingCancelled):
+                token.raise_if_cancelled()
+
+    def test_flag_set_before_start_is_honoured(self):
+        self._cancel()
+        with CancellationToken(str(self.job.id)) as token:
+            self.assertTrue(token.cancelled)
+        self.assertEqual(events.get_event_bus().latest(str(self.job.id))["status"], TrainingStatus.CANCELLED)
+
+    def test_chunked_csv_load(self):
+        csv = "a,b\n" + "".join(f"{i},{2 * i}\n" for i in range(25))
+        token = CancellationToken(str(self.job.id))
+        df = read_csv_cancellable(io.StringIO(csv), token, chunk_rows=10)
+        self.assertEqual(len(df), 25)
+        self.assertEqual(df["b"].iloc[-1], 48)
+        self.assertEqual(len(read_csv_cancellable(io.StringIO("a,b\n"), token)), 0)
+
+        token.cancel()
+        with self.assertRaises(TrainingCancelled):
+            read_csv_cancellable(io.StringIO(csv), token, chunk_rows=10)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from network import storage
+from network.services.checkpoints import (
+    capture_rng_state,
+    checkpoint_prefix,
+    clear_checkpoints,
+    load_latest_checkpoint,
+    restore_rng_state,
+    save_checkpoint,
+)
+from network.testing import TempStorageMixin
+
+
+class CheckpointTests(TempStorageMixin, SimpleTestCase):
+    def _model(self):
+        import keras
+
+        model = keras.Sequential([keras.Input(shape=(2,)), keras.layers.Dense(1)])
+        model.compile(optimizer="adam", loss="mse")
+        model.fit(np.ones((8, 2)), np.ones(8), epochs=1, verbose=0)
+        return model
+
+    def test_latest_checkpoint_restores_model_and_history(self):
+        self.assertIsNone(load_latest_checkpoint("job1"))
+        model = self._model()
+        save_checkpoint("job1", model, 1, {"loss": [2.0]})
+        save_checkpoint("job1", model, 3, {"loss": [2.0, 1.5, 1.0]}, {"batch_tuning": {"batch_size": 16}})
+        # Older checkpoints are dropped once a newer one is complete
+        self.assertEqual(sorted(storage.list_files(checkpoint_prefix("job1"))), ["epoch-00003.json", "epoch-00003.keras"])
+
+        restored = load_latest_checkpoint("job1")
+        self.assertEqual(restored.epoch, 3)
+        self.assertEqual(restored.history, {"loss": [2.0, 1.5, 1.0]})
+        self.assertEqual(restored.extra, {"batch_tuning": {"batch_size": 16}})
+        self.assertEqual(int(restored.model.optimizer.iterations.numpy()), int(model.optimizer.iterations.numpy()))
+        for saved, loaded in zip(model.get_weights(), restored.model.get_weights()):
+            np.testing.assert_allclose(saved, loaded)
+
+        clear_checkpoints("job1")
+        self.assertIsNone(load_latest_checkpoint("job1"))
+
+    def test_rng_state_round_trip(self):
+        state = capture_rng_state()
+        expected = np.random.rand(3)
+        np.random.rand(10)
+        restore_rng_state(state)
+        np.testing.assert_array_equal(np.random.rand(3), expected)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from network.serializers import TrainingStartSerializer
+from network.services.cross_validation import summarize_folds
+from network.services.fitting import TrainParams, kfold_indices
+
+
+class CrossValidationTests(SimpleTestCase):
+    def test_folds_partition_rows(self):
+        splits = kfold_indices(23, 5)
+        self.assertEqual(len(splits), 5)
+        held_out = np.concatenate([fold for _, fold in splits])
+        self.assertEqual(sorted(held_out.tolist()), list(range(23)))
+        for train_idx, fold in splits:
+            self.assertEqual(len(train_idx) + len(fold), 23)
+            self.assertFalse(set(train_idx) & set(fold))
+
+    def test_summary_aggregates_folds(self):
+        summary = summarize_folds([
+            {"history": {"loss": [3.0, 2.0, 1.0]}, "evaluation": {"loss": 1.0, "mae": 0.5}},
+            {"history": {"loss": [5.0, 4.0]}, "evaluation": {"loss": 3.0, "mae": 1.5}},
+        ])
+        self.assertEqual(summary["mean"], {"loss": 2.0, "mae": 1.0})
+        self.assertEqual(summary["std"], {"loss": 1.0, "mae": 0.5})
+        # Mean history covers the epochs every fold reached
+        self.assertEqual(summary["history"], {"loss": [4.0, 3.0]})
+
+    def test_cv_folds_param(self):
+        base = {"x_columns": ["a", "b"], "y_column": "y"}
+        self.assertFalse(TrainingStartSerializer(data={**base, "cv_folds": 1}).is_valid())
+        serializer = TrainingStartSerializer(data={**base, "cv_folds": "4"})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(TrainParams.from_dict(serializer.validated_data).cv_folds, 4)
+        self.assertEqual(TrainParams.from_dict(base).cv_folds, 0)
+
+    def test_rejects_single_run_options(self):
+        base = {"x_columns": ["a", "b"], "y_column": "y", "cv_folds": 3}
+        for option in ({"jit_compile": "true"}, {"steps_per_execution": 4}, {"save_best_model": True}):
+            serializer = TrainingStartSerializer(data={**base, **option})
+            self.assertFalse(serializer.is_valid())
+            self.assertEqual(set(serializer.errors), set(option))
+        # Defaults sent explicitly are fine
+        self.assertTrue(TrainingStartSerializer(data={**base, "jit_compile": "auto", "profile_trace": False}).is_valid())
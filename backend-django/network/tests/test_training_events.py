@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from network.models import NetworkGraph, TrainingJob, TrainingStatus
+from network.services import events
+
+
+def _frames(body: str):
+    return [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+
+
+@override_settings(NETWORK_EVENT_BACKEND="memory", NETWORK_EVENT_HEARTBEAT=0.05, NETWORK_EVENT_STREAM_MAX_AGE=5)
+class TrainingEventsTests(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="tester", password="pw")
+        self.client.force_authenticate(user=self.user)
+        graph = NetworkGraph.objects.create(name="events-graph")
+        self.job = TrainingJob.objects.create(graph=graph, status=TrainingStatus.RUNNING, progress=0.3)
+
+    def test_stream_replays_latest_state_and_ends_on_terminal_status(self):
+        events.publish_progress(str(self.job.id), 0.4, {"epoch": 2, "loss": 0.5})
+        self.job.status = TrainingStatus.SUCCEEDED
+        self.job.progress = 1.0
+        self.job.save()
+        events.publish_status(self.job)
+
+        url = reverse("training-job-stream-events", args=[str(self.job.id)])
+        response = self.client.get(url, HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        frames = _frames(b"".join(response.streaming_content).decode())
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(frames[0]["status"], TrainingStatus.SUCCEEDED)
+
+    def test_async_stream_pushes_progress_until_cancelled(self):
+        async def consume():
+            received = []
+            stream = events.astream_events(self.job)
+            async for frame in stream:
+                received.extend(_frames(frame))
+                if len(received) == 1 and frame.startswith("event: "):
+                    # Publish from another thread, as the training worker does
+                    threading.Thread(target=publish).start()
+            return received
+
+        def publish():
+            events.publish_progress(str(self.job.id), 0.6, {"epoch": 3, "loss": 0.25})
+            cancelled = TrainingJob(id=self.job.id, status=TrainingStatus.CANCELLED, progress=0.6)
+            events.publish_status(cancelled)
+
+        received = asyncio.run(consume())
+        self.assertEqual([event["type"] for event in received], ["status", "progress", "status"])
+        self.assertEqual(received[0]["status"], TrainingStatus.RUNNING)
+        self.assertEqual(received[1]["live"]["epoch"], 3)
+        self.assertEqual(received[2]["status"], TrainingStatus.CANCELLED)
+
+    def test_cancel_publishes_status(self):
+        url = reverse("training-job-cancel", args=[str(self.job.id)])
+        self.assertEqual(self.client.post(url).status_code, 202)
+        latest = events.get_event_bus().latest(str(self.job.id))
+        self.assertTrue(events.is_terminal(latest))
+        self.assertEqual(latest["status"], TrainingStatus.CANCELLED)
+
+    def test_publish_failures_warn_once_per_interval(self):
+        broken = mock.Mock()
+        broken.publish.side_effect = ConnectionError("down")
+        with mock.patch.object(events, "get_event_bus", return_value=broken), \
+                mock.patch.object(events, "_publish_warned_at", float("-inf")), \
+                self.assertLogs(events.logger, "WARNING") as logs:
+            for _ in range(5):
+                events.publish_progress(str(self.job.id), 0.5, {})
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(broken.publish.call_count, 5)
+
+    def test_redis_clients_use_short_socket_timeouts(self):
+        bus = events.RedisEventBus("redis://localhost:6379/0", 60, timeout=1.5)
+        kwargs = bus._client.connection_pool.connection_kwargs
+        self.assertEqual((kwargs["socket_connect_timeout"], kwargs["socket_timeout"]), (1.5, 1.5))
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from network.services.fitting import TrainParams, build_optimizer, compile_model
+
+
+class GradientAccumulationTests(SimpleTestCase):
+    def _params(self, steps):
+        return TrainParams.from_dict({"x_columns": ["a", "b"], "y_column": "y", "gradient_accumulation_steps": steps})
+
+    def test_optimizer_accumulates_only_from_two_steps(self):
+        self.assertIsNone(build_optimizer(self._params(0)).gradient_accumulation_steps)
+        self.assertIsNone(build_optimizer(self._params(1)).gradient_accumulation_steps)
+        self.assertEqual(build_optimizer(self._params(4)).gradient_accumulation_steps, 4)
+
+    def test_updates_once_per_accumulated_batches_and_survives_save(self):
+        import keras
+
+        model = keras.Sequential([keras.Input(shape=(2,)), keras.layers.Dense(1)])
+        compile_model(model, self._params(4), [])
+        X = np.random.default_rng(0).normal(size=(64, 2)).astype(np.float32)
+        model.fit(X, X.sum(axis=1), batch_size=8, epochs=1, verbose=0)
+        self.assertEqual(int(model.optimizer.iterations), 2)
+
+        # Checkpoints restore the accumulation setting with the optimizer
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.keras")
+            model.save(path)
+            restored = keras.models.load_model(path)
+        self.assertEqual(restored.optimizer.gradient_accumulation_steps, 4)
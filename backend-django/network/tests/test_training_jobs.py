@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import os
+from unittest import mock
+
+import numpy as np
+from django.test import TestCase, override_settings
+
+from network import storage
+from network.models import Edge, LayerNode, NetworkGraph, TrainingJob, TrainingJobKind, TrainingStatus
+from network.services import training
+from network.services.checkpoints import checkpoint_prefix, save_checkpoint
+from network.services.training import run_training_job
+from network.testing import TempStorageMixin
+
+
+@override_settings(NETWORK_EVENT_BACKEND="memory", NETWORK_TRIAL_WORKERS=0, NETWORK_CHECKPOINT_INTERVAL=0)
+class TrainingJobRunTests(TempStorageMixin, TestCase):
+    """Runs whole jobs over a two-layer graph; trials run inline in the test process."""
+
+    def setUp(self):
+        super().setUp()
+        self.graph = NetworkGraph.objects.create(name="two-layer")
+        source = LayerNode.objects.create(id="in", graph=self.graph, type="Input", params={"shape": [2]})
+        hidden = LayerNode.objects.create(id="hidden", graph=self.graph, type="Dense", params={"units": 4, "activation": "relu"})
+        out = LayerNode.objects.create(id="out", graph=self.graph, type="Dense", params={"units": 1})
+        Edge.objects.create(id="e1", graph=self.graph, source=source, target=hidden)
+        Edge.objects.create(id="e2", graph=self.graph, source=hidden, target=out)
+
+        X = np.random.default_rng(0).normal(size=(60, 2))
+        self.dataset = os.path.join(self.media_root, "data.csv")
+        with open(self.dataset, "w") as fh:
+            fh.write("a,b,y\n")
+            fh.writelines(f"{a},{b},{1.5 * a - 2 * b}\n" for a, b in X)
+
+    def _run(self, kind=TrainingJobKind.TRAINING, **params):
+        job = TrainingJob.objects.create(
+            graph=self.graph,
+            kind=kind,
+            dataset_path=self.dataset,
+            params={"x_columns": ["a", "b"], "y_column": "y", "epochs": 2, "batch_size": 16, **params},
+        )
+        run_training_job(str(job.id))
+        job.refresh_from_db()
+        self.assertEqual(job.status, TrainingStatus.SUCCEEDED, job.error)
+        return job
+
+    def test_training_job(self):
+        job = self._run()
+        self.assertEqual(len(job.result["history"]["loss"]), 2)
+        self.assertIn("loss", job.result["evaluation"])
+        self.assertEqual(job.attempts, 1)
+
+    @override_settings(NETWORK_CHECKPOINT_INTERVAL=0.001)
+    def test_failed_job_drops_its_checkpoints(self):
+        import keras
+
+        class Crash(keras.callbacks.Callback):
+            def on_epoch_end(self, epoch, logs=None):
+                if epoch == 1:
+                    raise RuntimeError("boom")
+
+        schedule_callbacks = training.schedule_callbacks
+        job = TrainingJob.objects.create(
+            graph=self.graph,
+            dataset_path=self.dataset,
+            params={"x_columns": ["a", "b"], "y_column": "y", "epochs": 3, "batch_size": 16},
+        )
+        with mock.patch.object(training, "schedule_callbacks", lambda params: [*schedule_callbacks(params), Crash()]):
+            run_training_job(str(job.id))
+        job.refresh_from_db()
+        self.assertEqual(job.status, TrainingStatus.FAILED)
+        self.assertIn("boom", job.error)
+        self.assertEqual(storage.list_files(checkpoint_prefix(str(job.id))), [])
+
+    @override_settings(NETWORK_WORKER_MEMORY_MB=1 << 20)
+    def test_lost_worker_resumes_with_a_smaller_tuned_batch(self):
+        job = TrainingJob.objects.create(
+            graph=self.graph,
+            status=TrainingStatus.RUNNING,
+            attempts=1,
+            dataset_path=self.dataset,
+            params={"x_columns": ["a", "b"], "y_column": "y", "epochs": 3, "batch_size": 16, "auto_batch_size": True},
+        )
+        model = training.build_job_model(job)
+        model.compile(optimizer="adam", loss="mse")
+        tuning = {
+            "batch_size": 32,
+            "probes": [{"batch_size": 16, "status": "ok"}, {"batch_size": 32, "status": "ok"}],
+            "fallbacks": [],
+        }
+        save_checkpoint(str(job.id), model, 1, {"loss": [1.0]}, {"batch_tuning": tuning})
+
+        run_training_job(str(job.id))
+        job.refresh_from_db()
+        self.assertEqual(job.status, TrainingStatus.SUCCEEDED, job.error)
+        self.assertEqual(job.result["resumed_from_epoch"], 1)
+        self.assertEqual(job.result["batch_tuning"]["batch_size"], 16)
+        self.assertEqual(job.result["batch_tuning"]["fallbacks"], [{"from": 32, "to": 16, "epoch": 1, "worker_lost": True}])
+        self.assertNotIn("batch_tuning", job.result["profile"]["phases"])
+
+    @override_settings(NETWORK_MAX_ATTEMPTS=2)
+    def test_fails_after_repeated_redeliveries(self):
+        job = TrainingJob.objects.create(graph=self.graph, status=TrainingStatus.RUNNING, attempts=2, dataset_path=self.dataset)
+        run_training_job(str(job.id))
+        job.refresh_from_db()
+        self.assertEqual(job.status, TrainingStatus.FAILED)
+        self.assertIn("2 attempts", job.error)
+
+    def test_sweep_job(self):
+        sweep = {"strategy": "grid", "space": {"learning_rate": [0.01, 0.001]}}
+        job = self._run(TrainingJobKind.SWEEP, sweep=sweep)
+        trials = job.result["sweep"]["trials"]
+        self.assertEqual([t["status"] for t in trials], ["completed", "completed"], json.dumps(trials))
+        self.assertEqual(job.result["sweep"]["workers"], 0)
+        self.assertTrue(os.path.exists(job.artifact_path))
+
+    def test_cross_validation_job(self):
+        job = self._run(cv_folds=3)
+        folds = job.result["cross_validation"]["folds"]
+        self.assertEqual(len(folds), 3)
+        self.assertTrue(all(f["evaluation"] for f in folds))
+        self.assertIn("loss", job.result["evaluation"])
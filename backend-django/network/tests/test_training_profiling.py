@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from network.services.profiling import TrainingProfiler
+
+
+class TrainingProfilerTests(SimpleTestCase):
+    def test_phases_accumulate(self):
+        profiler = TrainingProfiler()
+        with profiler.phase("graph_build"):
+            pass
+        profiler.begin("graph_build")
+        profiler.end("graph_build")
+        profiler.end("never_started")
+
+        summary = profiler.summary()
+        self.assertEqual(set(summary["phases"]), {"graph_build"})
+        self.assertGreaterEqual(summary["phases"]["graph_build"], 0.0)
+        self.assertGreater(summary["peak_rss_mb"], 0)
+        self.assertIn(summary["peak_rss_scope"], {"job", "process"})
+        self.assertIsNone(summary["step_mean_ms"])
+
+    def test_callback_records_epoch_throughput(self):
+        import keras
+        import numpy as np
+
+        model = keras.Sequential([keras.Input(shape=(2,)), keras.layers.Dense(1)])
+        model.compile(optimizer="sgd", loss="mse")
+        X = np.random.default_rng(0).normal(size=(64, 2)).astype("float32")
+        y = X.sum(axis=1)
+
+        profiler = TrainingProfiler()
+        model.fit(X, y, epochs=2, batch_size=16, verbose=0, callbacks=[profiler.callback(len(X))])
+
+        summary = profiler.summary()
+        self.assertEqual([e["epoch"] for e in summary["epochs"]], [1, 2])
+        self.assertEqual(summary["epochs"][0]["steps"], 4)
+        self.assertGreater(summary["step_mean_ms"], 0)
+        self.assertGreater(summary["samples_per_sec"], 0)
+
+    def test_no_trace_artifact_without_trace(self):
+        profiler = TrainingProfiler()
+        self.assertIsNone(profiler.export_trace(os.path.join(tempfile.gettempdir(), "unused_profile")))
+
+    def test_discard_stops_a_trace_left_running_by_a_failed_fit(self):
+        import keras
+        import numpy as np
+        import tensorflow as tf
+
+        class Crash(keras.callbacks.Callback):
+            def on_train_batch_end(self, batch, logs=None):
+                if batch == 2:
+                    raise RuntimeError("boom")
+
+        model = keras.Sequential([keras.Input(shape=(2,)), keras.layers.Dense(1)])
+        model.compile(optimizer="sgd", loss="mse")
+        X = np.random.default_rng(0).normal(size=(64, 2)).astype("float32")
+
+        profiler = TrainingProfiler(trace=True)
+        with self.assertRaises(RuntimeError):
+            model.fit(X, X.sum(axis=1), epochs=1, batch_size=8, verbose=0, callbacks=[profiler.callback(len(X)), Crash()])
+        trace_dir = profiler.trace_dir
+        self.assertTrue(os.path.isdir(trace_dir))
+
+        profiler.discard_trace()
+        self.assertFalse(os.path.exists(trace_dir))
+        # The next job can trace again
+        with tempfile.TemporaryDirectory() as tmp:
+            tf.profiler.experimental.start(tmp)
+            tf.profiler.experimental.stop()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from network.serializers import TrainingStartSerializer
+from network.services import runtime_config
+from network.services.fitting import TrainParams
+from network.services.runtime_config import resolve_runtime
+
+
+class RuntimeConfigTests(SimpleTestCase):
+    def _params(self, **overrides):
+        return TrainParams.from_dict({"x_columns": ["a"], "y_column": "y", "batch_size": 32, **overrides})
+
+    def test_auto_defaults_follow_model_size(self):
+        with mock.patch.object(runtime_config, "cpu_supports_bf16", return_value=True):
+            small = resolve_runtime(self._params(), param_count=1_000, train_rows=320)
+            large = resolve_runtime(self._params(), param_count=5_000_000, train_rows=320)
+        self.assertEqual((small.jit_compile, small.mixed_precision, small.steps_per_execution), (False, "float32", 1))
+        self.assertEqual((large.jit_compile, large.mixed_precision, large.steps_per_execution), (True, "mixed_bfloat16", 1))
+
+        with mock.patch.object(runtime_config, "cpu_supports_bf16", return_value=False):
+            self.assertEqual(resolve_runtime(self._params(), 5_000_000, 320).mixed_precision, "float32")
+
+    def test_explicit_settings_win(self):
+        params = self._params(jit_compile="true", mixed_precision="float32", steps_per_execution=4, intra_op_threads=3)
+        config = resolve_runtime(params, param_count=5_000_000, train_rows=320)
+        self.assertEqual(
+            (config.jit_compile, config.mixed_precision, config.steps_per_execution, config.intra_op_threads, config.inter_op_threads),
+            (True, "float32", 4, 3, 2),
+        )
+        # Capped at the steps of one epoch
+        self.assertEqual(resolve_runtime(self._params(steps_per_execution=64), 1_000, 320).steps_per_execution, 10)
+
+    def test_serializer_accepts_boolean_jit_compile(self):
+        serializer = TrainingStartSerializer(data={"x_columns": ["a", "b"], "y_column": "y", "jit_compile": True})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["jit_compile"], "true")
+        self.assertFalse(TrainingStartSerializer(data={"x_columns": ["a", "b"], "y_column": "y", "mixed_precision": "int8"}).is_valid())
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+
+from django.test import SimpleTestCase
+
+from network.serializers import TrainingSweepSerializer
+from network.services.sweeps import candidates, halving_rungs, leaderboard, parse_sweep
+from network.services.trial_pool import pool_size
+
+
+class SweepPlanningTests(SimpleTestCase):
+    def test_grid_expands_every_combination(self):
+        config = parse_sweep({"space": {"learning_rate": [0.1, 0.01], "batch_size": [16, 32, 64]}}, epochs=10)
+        trials = candidates(config)
+        self.assertEqual(config["n_trials"], 6)
+        self.assertEqual(len({json.dumps(t, sort_keys=True) for t in trials}), 6)
+        self.assertIsInstance(trials[0]["batch_size"], int)
+
+    def test_random_samples_ranges_reproducibly(self):
+        config = parse_sweep({
+            "strategy": "random",
+            "n_trials": 20,
+            "space": {
+                "learning_rate": {"low": 1e-4, "high": 1e-1, "log": True},
+                "batch_size": {"low": 8, "high": 64},
+                "optimizer": ["adam", "sgd"],
+            },
+        }, epochs=10)
+        trials = candidates(config)
+        self.assertEqual(trials, candidates(config))
+        for trial in trials:
+            self.assertTrue(1e-4 <= trial["learning_rate"] <= 1e-1)
+            self.assertTrue(8 <= trial["batch_size"] <= 64)
+            self.assertIn(trial["optimizer"], ("adam", "sgd"))
+
+    def test_halving_schedule_and_leaderboard(self):
+        self.assertEqual(halving_rungs(9, 3, 1, 20), [(9, 1), (3, 3), (1, 9), (1, 20)])
+        self.assertEqual(halving_rungs(8, 2, 5, 10), [(8, 5), (4, 10)])
+        board = leaderboard([
+            {"trial": "a", "params": {}, "status": "pruned", "score": 0.1},
+            {"trial": "b", "params": {}, "status": "completed", "score": 0.5},
+            {"trial": "c", "params": {}, "status": "completed", "score": 0.3},
+            {"trial": "d", "params": {}, "status": "completed", "score": None},
+        ], "val_loss", "min")
+        self.assertEqual([row["trial"] for row in board], ["c", "b", "d", "a"])
+
+    def test_pool_size_splits_thread_budget(self):
+        self.assertEqual(pool_size(6, 4, 8), (4, 2))
+        self.assertEqual(pool_size(2, 4, 8), (2, 4))
+        # One trial at a time runs inline with the whole budget
+        self.assertEqual(pool_size(6, 1, 8), (0, 8))
+        self.assertEqual(pool_size(6, 4, 1), (0, 1))
+
+    def test_pool_size_fits_processes_in_memory(self):
+        self.assertEqual(pool_size(6, 4, 8, memory_mb=1500, process_mb=700), (2, 4))
+        # A small worker runs its trials one at a time, inline
+        self.assertEqual(pool_size(6, 4, 8, memory_mb=512, process_mb=700), (0, 8))
+        self.assertEqual(pool_size(6, 4, 8, memory_mb=1 << 20), (4, 2))
+
+    def test_serializer_validates_sweep(self):
+        base = {"x_columns": '["a","b"]', "y_column": "y", "epochs": 9}
+        ok = TrainingSweepSerializer(data={
+            **base,
+            "sweep": json.dumps({"strategy": "halving", "n_trials": 9, "space": {"learning_rate": [0.1, 0.01]}}),
+        })
+        self.assertTrue(ok.is_valid(), ok.errors)
+        self.assertEqual(ok.validated_data["sweep"]["eta"], 3)
+
+        for sweep in (
+            {"space": {"x_columns": [["a"]]}},
+            {"strategy": "bayes", "space": {"learning_rate": [0.1]}},
+            {"strategy": "grid", "space": {"learning_rate": {"low": 0.1, "high": 1}}},
+            {"strategy": "halving", "min_epochs": 20, "space": {"learning_rate": [0.1]}},
+            "not json",
+        ):
+            serializer = TrainingSweepSerializer(data={**base, "sweep": sweep if isinstance(sweep, str) else json.dumps(sweep)})
+            self.assertFalse(serializer.is_valid())
+            self.assertIn("sweep", serializer.errors)
+
+        sweep = json.dumps({"space": {"learning_rate": [0.1, 0.01]}})
+        serializer = TrainingSweepSerializer(data={**base, "sweep": sweep, "mixed_precision": "mixed_bfloat16"})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("mixed_precision", serializer.errors)
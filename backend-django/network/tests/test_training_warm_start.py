@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import uuid
+
+import numpy as np
+from django.test import TestCase
+
+from network.models import NetworkGraph, TrainingJob, TrainingStatus
+from network.serializers import TrainingStartSerializer
+from network.services.warm_start import appended_rows, dataset_fingerprint, model_signature
+
+
+class WarmStartTests(TestCase):
+    def test_signature_tracks_layer_shapes(self):
+        import keras
+
+        def build(units):
+            return keras.Sequential([keras.Input(shape=(3,)), keras.layers.Dense(units), keras.layers.Dense(1)])
+
+        self.assertEqual(model_signature(build(4)), model_signature(build(4)))
+        self.assertNotEqual(model_signature(build(4)), model_signature(build(5)))
+
+    def test_appended_rows_must_extend_source_dataset(self):
+        X = np.arange(20, dtype=np.float32).reshape(10, 2)
+        y = np.arange(10, dtype=np.float32)
+        source = TrainingJob(result={"dataset": dataset_fingerprint(X[:6], y[:6])})
+        self.assertEqual(appended_rows(source, X, y), 6)
+
+        changed = X.copy()
+        changed[0, 0] = -1
+        with self.assertRaises(ValueError):
+            appended_rows(source, changed, y)
+        with self.assertRaises(ValueError):
+            appended_rows(source, X[:6], y[:6])
+
+    def test_serializer_requires_finished_source(self):
+        graph = NetworkGraph.objects.create(name="warm-graph")
+        running = TrainingJob.objects.create(graph=graph, status=TrainingStatus.RUNNING)
+        done = TrainingJob.objects.create(graph=graph, status=TrainingStatus.SUCCEEDED, artifact_path="/tmp/m.keras")
+        base = {"x_columns": ["a", "b"], "y_column": "y"}
+
+        for data in (
+            {"freeze_layers": 1},
+            {"warm_start_from": str(uuid.uuid4())},
+            {"warm_start_from": str(running.id)},
+            {"warm_start_from": str(done.id), "cv_folds": 3},
+        ):
+            serializer = TrainingStartSerializer(data={**base, **data})
+            self.assertFalse(serializer.is_valid())
+            self.assertIn("warm_start_from", serializer.errors)
+
+        serializer = TrainingStartSerializer(data={**base, "warm_start_from": str(done.id), "new_rows_only": True})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["warm_start_from"], str(done.id))
@@ -22,7 +22,12 @@ from django.urls import reverse
 import csv
 
 from network.models import NetworkGraph
-from network.serializers import NetworkGraphSerializer, TrainingJobSerializer, TrainingStartSerializer
+from network.serializers import (
+    NetworkGraphSerializer,
+    TrainingJobSerializer,
+    TrainingStartSerializer,
+    TrainingSweepSerializer,
+)
 
 from network.services import (
     GraphValidationError,
@@ -31,7 +36,7 @@ from network.services import (
     import_keras_json_to_graph,
     load_graph_from_keras_artifact,
 )
-from network.models import TrainingJob
+from network.models import TrainingJob, TrainingJobKind
 from network.services.training import launch_training_job
 from network import storage
 
@@ -348,11 +353,37 @@ class NetworkGraphViewSet(viewsets.ModelViewSet):
           - metrics: JSON array of metric names
           - epochs: int
           - batch_size: int
+          - auto_batch_size: bool (probe batch sizes and use the fastest that fits in the worker's memory)
+          - gradient_accumulation_steps: int (>= 2 updates once per N batches, for an effective batch of N x batch_size)
           - validation_split: float (0..1)
           - test_split: float (0..1)
+          - cv_folds: int (>= 2 trains k folds concurrently and reports mean/std metrics)
+          - warm_start_from: id of a finished job whose weights initialize a compatible graph,
+            with optional freeze_layers (int) and new_rows_only (bool)
+          - jit_compile (auto|true|false), mixed_precision (auto|float32|mixed_bfloat16|mixed_float16),
+            steps_per_execution, intra_op_threads, inter_op_threads (0 = auto)
+          - profile_trace: bool (records a TensorFlow profiler trace, artifact type=profile)
 
         Returns 202 Accepted with job payload {id, status, ...} and Location header to poll.
         """
+        return self._start_training(request, TrainingStartSerializer, TrainingJobKind.TRAINING)
+
+    @action(detail=True, methods=["post"], url_path="sweep")
+    def sweep(self, request, pk=None):
+        """
+        Start an asynchronous hyperparameter sweep for a graph.
+
+        Accepts the same multipart/form-data as `train` plus:
+          - sweep: JSON object {strategy: grid|random|halving, space: {param: [values] | {low, high, log, int}},
+            n_trials, objective, mode, eta, min_epochs, max_concurrent}
+
+        The dataset is loaded once and the trials run concurrently; the job result holds
+        every trial, a leaderboard and the best trial's history, and the artifact is the best model.
+        """
+        return self._start_training(request, TrainingSweepSerializer, TrainingJobKind.SWEEP)
+
+    def _start_training(self, request, serializer_class, kind: str) -> Response:
+        """Validate the upload and parameters, store the dataset and enqueue a `kind` job."""
         graph = self.get_object()
 
         uploaded = request.FILES.get("file")
@@ -373,7 +404,7 @@ class NetworkGraphViewSet(viewsets.ModelViewSet):
             return Response({"detail": f"Unsupported file extension '{suffix}'"}, status=status.HTTP_400_BAD_REQUEST)
 
         # Validate training parameters using a dedicated serializer
-        serializer = TrainingStartSerializer(data=request.data)
+        serializer = serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         params = serializer.validated_data
 
@@ -416,6 +447,7 @@ class NetworkGraphViewSet(viewsets.ModelViewSet):
         # Persist dataset to a temp path tied to the job id (create job now)
         job = TrainingJob.objects.create(
             graph=graph,
+            kind=kind,
             params=dict(params),
         )
 
@@ -3,18 +3,34 @@ from __future__ import annotations
 import os
 from pathlib import Path
 from django.conf import settings
-from django.http import FileResponse, Http404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from rest_framework import viewsets, status
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.decorators import action
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.response import Response
 
 from network.models import TrainingJob, TrainingStatus
 from network.serializers import TrainingJobSerializer
 from network import storage
+from network.services import events
+from network.services.cancellation import request_cancel
 from network.services.training import launch_training_job
 from network.services.export_tasks import run_model_export
+from config.runtime_limits import limit_threads
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets `Accept: text/event-stream` clients through content negotiation; errors are sent as JSON."""
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return JSONRenderer().render(data)
 
 
 class TrainingJobViewSet(viewsets.ReadOnlyModelViewSet):
@@ -44,6 +60,11 @@ class TrainingJobViewSet(viewsets.ReadOnlyModelViewSet):
             download_filename = f"job_{job.id}_training_log.csv"
             if not target_path_or_key:
                 target_path_or_key = f"{job.id}_log.csv"
+        elif artifact_type == 'profile':
+            target_path_or_key = (job.result or {}).get('profile_trace_artifact')
+            download_filename = f"job_{job.id}_profile.zip"
+            if not target_path_or_key:
+                target_path_or_key = f"{job.id}_profile.zip"
         elif artifact_type == 'tflite':
             target_path_or_key = f"{job.id}.tflite"
             download_filename = f"job_{job.id}_model.tflite"
@@ -149,8 +170,8 @@ class TrainingJobViewSet(viewsets.ReadOnlyModelViewSet):
     def cancel(self, request, pk=None):
         """Request cancellation of a running or queued training job.
 
-        Sets the job status to CANCELLED. The training worker will detect this
-        and stop as soon as possible, preserving any collected history.
+        Sets the job status to CANCELLED and signals the worker through the
+        event bus; it stops within one batch, preserving any collected history.
         """
         job = self.get_object()
         if job.status in {TrainingStatus.SUCCEEDED, TrainingStatus.FAILED, TrainingStatus.CANCELLED}:
@@ -159,8 +180,29 @@ class TrainingJobViewSet(viewsets.ReadOnlyModelViewSet):
 
         job.status = TrainingStatus.CANCELLED
         job.save(update_fields=["status", "updated_at"])
+        # Reaches the worker's cancellation watcher (and SSE watchers) immediately
+        request_cancel(job)
         return Response(TrainingJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
+    @action(detail=True, methods=["get"], url_path="events", renderer_classes=[EventStreamRenderer, JSONRenderer])
+    def stream_events(self, request, pk=None):
+        """Stream live progress and status changes as Server-Sent Events.
+
+        The current state is sent on connect; the stream ends once the job
+        succeeds, fails or is cancelled (or after NETWORK_EVENT_STREAM_MAX_AGE,
+        after which EventSource clients reconnect).
+        """
+        job = self.get_object()
+        if isinstance(request._request, ASGIRequest):
+            stream = events.astream_events(job)
+        else:
+            stream = events.stream_events(job)
+        response = StreamingHttpResponse(stream, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # Disable proxy buffering (nginx) so events are delivered as they happen
+        response["X-Accel-Buffering"] = "no"
+        return response
+
     @action(detail=True, methods=["post"], url_path="predict")
     def predict(self, request, pk=None):
         """Run inference using a trained model artifact for the given job.
@@ -291,7 +333,8 @@ class TrainingJobViewSet(viewsets.ReadOnlyModelViewSet):
                         return Response({"detail": "Model artifact not available for this job"}, status=status.HTTP_400_BAD_REQUEST)
                     model = load_model(job.artifact_path)
 
-                preds = model.predict(X_arr, verbose=0)
+                with limit_threads("network.predict"):
+                    preds = model.predict(X_arr, verbose=0)
             finally:
                 # cleanup temporary file if used
                 try:
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class RegressorConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "regressor"
+    verbose_name = "Classical Regression"
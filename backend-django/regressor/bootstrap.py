@@ -0,0 +1,116 @@
+"""Bootstrap confidence bands for fitted curves and surfaces.
+
+The model is refitted on ``n`` resamples of the rows and each refit is
+evaluated on the same prediction grid the plots use; the band is the
+pointwise percentile interval of those predictions. Resamples are split
+into one batch per worker of a loky pool; ``X``/``y`` are memory-mapped
+read-only so workers share them instead of receiving copies. Every batch
+checks a common deadline, so the total compute time stays capped and the
+band is built from however many resamples finished.
+"""
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+from django.conf import settings
+from joblib import Parallel, delayed
+
+from .compare import max_workers, prediction_grid
+from .estimators import build_estimator, param_float, param_int, prepare_xy
+
+
+def _resample_batch(algorithm: str, params: Dict[str, Any], X, y, grid, seeds: List[int], deadline: float) -> np.ndarray:
+    """Fit one bootstrap replicate per seed and predict on the grid (runs inside a pool worker)."""
+    rows = []
+    n = len(y)
+    for seed in seeds:
+        if time.time() > deadline:
+            break
+        idx = np.random.default_rng(seed).integers(0, n, size=n)
+        try:
+            model = build_estimator(algorithm, params).fit(X[idx], y[idx])
+            rows.append(model.predict(grid))
+        except Exception:
+            # A degenerate resample (e.g. too few distinct rows) is simply skipped
+            continue
+    return np.asarray(rows).reshape(len(rows), len(grid))
+
+
+def band_settings(data: Dict[str, Any]) -> Dict[str, Any] | None:
+    """
+    Validated band options from `parameters`, or None when no band is requested:
+    - `bootstrap_resamples`: number of resamples
+    - `confidence`: interval coverage, default 0.95
+    - `bootstrap_time_limit`: seconds of compute before the remaining resamples are dropped
+    """
+    params = dict(data.get("parameters") or {})
+    requested = param_int(params, "bootstrap_resamples", 0)
+    if not requested:
+        return None
+    limit = int(getattr(settings, "REGRESSOR_BOOTSTRAP_MAX_RESAMPLES", 1000))
+    if not 2 <= requested <= limit:
+        raise ValueError(f"'bootstrap_resamples' must be between 2 and {limit}")
+    confidence = param_float(params, "confidence", 0.95)
+    if not 0 < confidence < 1:
+        raise ValueError("'confidence' must be between 0 and 1")
+    time_limit = min(
+        param_float(params, "bootstrap_time_limit", None) or math.inf,
+        float(getattr(settings, "REGRESSOR_BOOTSTRAP_TIME_LIMIT", 60)),
+    )
+    return {"requested": requested, "confidence": confidence, "time_limit": time_limit}
+
+
+def confidence_band(algorithm: str, data: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Pointwise bootstrap band for the fitted curve/surface, or None when not requested (see `band_settings`)."""
+    options = band_settings(data)
+    if options is None:
+        return None
+    params = dict(data.get("parameters") or {})
+    requested, confidence, time_limit = options["requested"], options["confidence"], options["time_limit"]
+
+    try:
+        X, y = prepare_xy(data)
+    except ValueError as exc:
+        raise ValueError(f"Bootstrap bands need numeric X and a single target: {exc}")
+    grid = prediction_grid(X)
+    if grid is None:
+        return None
+
+    n_jobs = min(requested, max_workers())
+    seed = param_int(params, "random_state", 42)
+    seeds = np.random.default_rng(seed).integers(0, 2 ** 32, size=requested)
+    batches = [seeds[i::n_jobs].tolist() for i in range(n_jobs)]
+    started = time.perf_counter()
+    deadline = time.time() + time_limit
+    results = Parallel(n_jobs=n_jobs, backend="loky", mmap_mode="r")(
+        delayed(_resample_batch)(algorithm, params, X, y, grid, batch, deadline) for batch in batches
+    )
+    predictions = np.vstack(results)
+    completed = predictions.shape[0]
+    if completed < 2:
+        raise ValueError("Too few bootstrap resamples finished within the time limit")
+
+    tail = (1 - confidence) / 2 * 100
+    lower, upper = np.percentile(predictions, [tail, 100 - tail], axis=0)
+    band: Dict[str, Any] = {
+        "confidence": confidence,
+        "n_resamples": int(completed),
+        "requested": int(requested),
+        "timed_out": bool(completed < requested and time.time() > deadline),
+        "elapsed": time.perf_counter() - started,
+        "n_jobs": n_jobs,
+    }
+    if X.shape[1] == 1:
+        band.update(x=grid[:, 0].tolist(), lower=lower.tolist(), upper=upper.tolist())
+    else:
+        side = int(round(math.sqrt(len(grid))))
+        band.update(
+            x1=grid[:side, 0].tolist(),
+            x2=grid[::side, 1].tolist(),
+            lower=lower.reshape(side, side).tolist(),
+            upper=upper.reshape(side, side).tolist(),
+        )
+    return band
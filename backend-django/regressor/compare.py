@@ -0,0 +1,196 @@
+"""Side-by-side comparison of several regressors on the same dataset.
+
+All candidate models are fitted concurrently in a joblib (loky) process pool.
+The input arrays are handed to the pool once; joblib memory-maps large arrays
+so workers read the same buffer instead of receiving a pickled copy each.
+"""
+from __future__ import annotations
+
+import math
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from django.conf import settings
+from joblib import Parallel, delayed
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold, ShuffleSplit
+
+from .estimators import build_estimator, param_float, param_int, param_str, prepare_xy
+
+
+def max_workers() -> int:
+    """Upper bound on worker processes for the parallel regressor endpoints."""
+    configured = getattr(settings, "REGRESSOR_MAX_WORKERS", None)
+    return max(int(configured or os.cpu_count() or 1), 1)
+
+
+def finite_or_none(value: Any) -> float | None:
+    """Convert to float, mapping NaN/inf to None so the result stays JSON-safe."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def make_splits(n_samples: int, evaluation: Dict[str, Any]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Build the common train/test index pairs shared by every compared model."""
+    method = param_str(evaluation, "method", "holdout").lower()
+    random_state = param_int(evaluation, "random_state", 42)
+    if method == "holdout":
+        test_size = param_float(evaluation, "test_size", 0.2)
+        if not 0.0 < test_size < 1.0:
+            raise ValueError("'test_size' must be between 0 and 1")
+        if int(n_samples * test_size) < 2 or n_samples - int(n_samples * test_size) < 2:
+            raise ValueError("Not enough samples for a hold-out split")
+        splitter = ShuffleSplit(n_splits=1, test_size=test_size, random_state=random_state)
+    elif method == "cv":
+        folds = param_int(evaluation, "folds", 5)
+        if folds < 2:
+            raise ValueError("'folds' must be at least 2")
+        if n_samples < 2 * folds:
+            raise ValueError(f"Not enough samples for {folds}-fold cross-validation")
+        splitter = KFold(n_splits=folds, shuffle=True, random_state=random_state)
+    else:
+        raise ValueError("Evaluation 'method' must be 'holdout' or 'cv'")
+    return list(splitter.split(np.zeros((n_samples, 1))))
+
+
+def prediction_grid(X: np.ndarray, points_1d: int = 200, points_2d: int = 30):
+    """Return the evaluation grid used to sample fitted curves/surfaces, or None for >2 features."""
+    if X.shape[1] == 1:
+        return np.linspace(X.min(), X.max(), points_1d).reshape(-1, 1)
+    if X.shape[1] == 2:
+        x_surf, y_surf = np.meshgrid(
+            np.linspace(X[:, 0].min(), X[:, 0].max(), points_2d),
+            np.linspace(X[:, 1].min(), X[:, 1].max(), points_2d),
+        )
+        return np.column_stack((x_surf.ravel(), y_surf.ravel()))
+    return None
+
+
+def curve_samples(model, X: np.ndarray) -> Dict[str, Any] | None:
+    """Sample a fitted model on the prediction grid for client-side plotting."""
+    grid = prediction_grid(X)
+    if grid is None:
+        return None
+    pred = model.predict(grid)
+    if X.shape[1] == 1:
+        return {"x": grid[:, 0].tolist(), "y": pred.tolist()}
+    side = int(round(math.sqrt(len(grid))))
+    return {
+        "x1": grid[:side, 0].tolist(),
+        "x2": grid[::side, 1].tolist(),
+        # Multi-target models add a trailing target axis
+        "y": pred.reshape((side, side) + pred.shape[1:]).tolist(),
+    }
+
+
+def _evaluate_spec(spec: Dict[str, Any], X: np.ndarray, y: np.ndarray, splits, refit: bool) -> Dict[str, Any]:
+    """Fit one model spec on every split and collect its scores (runs inside a pool worker)."""
+    started = time.perf_counter()
+    outcome: Dict[str, Any] = {
+        "label": spec["label"],
+        "algorithm": spec["algorithm"],
+        "parameters": spec["parameters"],
+    }
+    try:
+        r2, mse, mae = [], [], []
+        model = None
+        for train_idx, test_idx in splits:
+            model = build_estimator(spec["algorithm"], spec["parameters"])
+            model.fit(X[train_idx], y[train_idx])
+            pred = model.predict(X[test_idx])
+            r2.append(r2_score(y[test_idx], pred))
+            mse.append(mean_squared_error(y[test_idx], pred))
+            mae.append(mean_absolute_error(y[test_idx], pred))
+
+        # With k-fold CV no single fold model represents the data; refit once for the curve
+        if refit:
+            model = build_estimator(spec["algorithm"], spec["parameters"]).fit(X, y)
+
+        outcome.update({
+            "r2": finite_or_none(np.mean(r2)),
+            "r2_std": finite_or_none(np.std(r2)),
+            "mse": finite_or_none(np.mean(mse)),
+            "mae": finite_or_none(np.mean(mae)),
+            "curve": curve_samples(model, X),
+            "error": None,
+        })
+    except Exception as exc:
+        # One failing candidate must not sink the whole comparison
+        outcome.update({"r2": None, "r2_std": None, "mse": None, "mae": None, "curve": None, "error": str(exc)})
+    outcome["fit_time"] = time.perf_counter() - started
+    return outcome
+
+
+def _parse_specs(models: Any) -> List[Dict[str, Any]]:
+    if not isinstance(models, (list, tuple)) or not models:
+        raise ValueError("'models' must be a non-empty list of {algorithm, parameters} objects")
+    limit = int(getattr(settings, "REGRESSOR_COMPARE_MAX_MODELS", 20))
+    if len(models) > limit:
+        raise ValueError(f"At most {limit} models can be compared in one request")
+
+    specs = []
+    seen: Dict[str, int] = {}
+    for i, item in enumerate(models, start=1):
+        if not isinstance(item, dict) or not item.get("algorithm"):
+            raise ValueError(f"Model {i} must be an object with an 'algorithm' key")
+        algorithm = str(item["algorithm"]).lower()
+        parameters = dict(item.get("parameters") or {})
+        # Validate eagerly so bad specs are reported before any work is scheduled
+        build_estimator(algorithm, parameters)
+
+        label = str(item.get("label") or algorithm)
+        seen[label] = seen.get(label, 0) + 1
+        if seen[label] > 1:
+            label = f"{label} #{seen[label]}"
+        specs.append({"label": label, "algorithm": algorithm, "parameters": parameters})
+    return specs
+
+
+def compare_models(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fits several regressors on the same data and ranks them.
+    - `models`: list of {"algorithm", "parameters", "label"} specs
+    - `evaluation`: {"method": "holdout"|"cv", "test_size", "folds", "random_state"}
+    - Models are fitted in parallel; wall time tracks the slowest model
+    Returns a ranking table (best test R² first) and per-model curve samples.
+    """
+    X, y = prepare_xy(data)
+    specs = _parse_specs(data.get("models"))
+    evaluation = dict(data.get("evaluation") or {})
+    splits = make_splits(len(y), evaluation)
+    refit = len(splits) > 1
+
+    n_jobs = min(len(specs), max_workers())
+    started = time.perf_counter()
+    # Large arrays are memory-mapped read-only and shared by all workers
+    outcomes = Parallel(n_jobs=n_jobs, backend="loky", mmap_mode="r")(
+        delayed(_evaluate_spec)(spec, X, y, splits, refit) for spec in specs
+    )
+    wall_time = time.perf_counter() - started
+
+    ok = sorted((o for o in outcomes if o["error"] is None), key=lambda o: -(o["r2"] if o["r2"] is not None else -math.inf))
+    failed = [o for o in outcomes if o["error"] is not None]
+
+    ranking = []
+    for rank, outcome in enumerate(ok + failed, start=1):
+        row = {k: v for k, v in outcome.items() if k != "curve"}
+        row["rank"] = rank if outcome["error"] is None else None
+        ranking.append(row)
+
+    return {
+        "n_samples": int(X.shape[0]),
+        "n_features": int(X.shape[1]),
+        "evaluation": {
+            "method": "cv" if refit else "holdout",
+            "n_splits": len(splits),
+        },
+        "ranking": ranking,
+        "curves": {o["label"]: o["curve"] for o in outcomes},
+        "n_jobs": n_jobs,
+        "wall_time": wall_time,
+    }
@@ -0,0 +1,197 @@
+"""Shared estimator factory and input helpers for the regressor endpoints.
+
+`build_estimator` turns an algorithm name plus a parameter dict into a
+fresh, unfitted model. The SVR, random forest and gradient boosting
+endpoints in `regressor.services` use it, as do the endpoints that work
+with several algorithms at once (model comparison, hyperparameter search,
+bootstrap bands); the remaining single-model endpoints build their
+estimators inline.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+from django.conf import settings
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+from sklearn.tree import DecisionTreeRegressor
+
+from .kernel_approximation import ScalableSVR
+
+# Values the ASP.NET backend sends for "not set" (parameters arrive as strings)
+_EMPTY_VALUES = (None, "", "None", "none", "null")
+
+
+def param_float(params: Dict[str, Any], key: str, default: float | None) -> float | None:
+    value = params.get(key, default)
+    return default if value in _EMPTY_VALUES else float(value)
+
+
+def param_int(params: Dict[str, Any], key: str, default: int | None) -> int | None:
+    value = params.get(key, default)
+    return default if value in _EMPTY_VALUES else int(float(value))
+
+
+def param_bool(params: Dict[str, Any], key: str, default: bool) -> bool:
+    value = params.get(key, default)
+    if value in _EMPTY_VALUES:
+        return default
+    return str(value).lower() in {"1", "true", "yes", "on"}
+
+
+def param_str(params: Dict[str, Any], key: str, default: str) -> str:
+    value = params.get(key, default)
+    return default if value in _EMPTY_VALUES else str(value)
+
+
+def prepare_xy(data: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Extract `X` (2D float array) and `y` (1D float array) from a request payload."""
+    X = data.get("X")
+    y = data.get("y")
+    if X is None or y is None:
+        raise ValueError("Both 'X' and 'y' are required")
+    try:
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"'X' and 'y' must be numeric arrays: {exc}")
+
+    # Ensure X is 2D
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    if X.ndim != 2 or y.ndim != 1:
+        raise ValueError("'X' must be a 1D or 2D array and 'y' a 1D array")
+    if X.shape[0] != y.shape[0]:
+        raise ValueError(f"'X' has {X.shape[0]} rows but 'y' has {y.shape[0]} values")
+    if X.shape[0] < 2:
+        raise ValueError("At least two samples are required")
+    return X, y
+
+
+def _linear(params: Dict[str, Any]):
+    return LinearRegression()
+
+
+def _polynomial(params: Dict[str, Any]):
+    degree = param_int(params, "degree", 2)
+    return make_pipeline(PolynomialFeatures(degree=degree, include_bias=False), LinearRegression())
+
+
+def _ridge(params: Dict[str, Any]):
+    return Ridge(alpha=param_float(params, "alpha", 0.1))
+
+
+def _lasso(params: Dict[str, Any]):
+    return Lasso(alpha=param_float(params, "alpha", 1.0))
+
+
+def _elasticnet(params: Dict[str, Any]):
+    return ElasticNet(
+        alpha=param_float(params, "alpha", 1.0),
+        l1_ratio=param_float(params, "l1_ratio", 0.5),
+    )
+
+
+def _svr(params: Dict[str, Any]):
+    gamma = param_str(params, "gamma", "scale")
+    return ScalableSVR(
+        kernel=param_str(params, "kernel", "rbf"),
+        C=param_float(params, "C", 1.0),
+        epsilon=param_float(params, "epsilon", 0.1),
+        gamma=gamma if gamma in ("scale", "auto") else float(gamma),
+        approximation=param_str(params, "approximation", "auto").lower(),
+        approximation_threshold=param_int(
+            params, "approximation_threshold", getattr(settings, "REGRESSOR_SVR_APPROX_THRESHOLD", 20000)
+        ),
+        n_components=param_int(params, "n_components", 300),
+        solver=param_str(params, "solver", "ridge").lower(),
+        random_state=param_int(params, "random_state", 42),
+    )
+
+
+def _decision_tree(params: Dict[str, Any]):
+    return DecisionTreeRegressor(
+        max_depth=param_int(params, "max_depth", None),
+        random_state=param_int(params, "random_state", 42),
+    )
+
+
+def param_max_samples(params: Dict[str, Any]) -> float | int | None:
+    """Bootstrap size: a fraction of the rows when <= 1, otherwise a row count."""
+    value = param_float(params, "max_samples", None)
+    if value is None:
+        return None
+    if value <= 0:
+        raise ValueError("'max_samples' must be positive")
+    return value if value <= 1 else int(value)
+
+
+def _random_forest(params: Dict[str, Any]):
+    return RandomForestRegressor(
+        n_estimators=param_int(params, "n_estimators", 200),
+        max_depth=param_int(params, "max_depth", None),
+        max_samples=param_max_samples(params),
+        random_state=param_int(params, "random_state", 42),
+    )
+
+
+def _gradient_boosting(params: Dict[str, Any]):
+    # Histogram-based boosting: bins features once and builds trees with OpenMP threads
+    early_stopping = params.get("early_stopping", "auto")
+    if early_stopping not in _EMPTY_VALUES and str(early_stopping).lower() != "auto":
+        early_stopping = param_bool(params, "early_stopping", True)
+    else:
+        early_stopping = "auto"
+    return HistGradientBoostingRegressor(
+        max_iter=param_int(params, "max_iter", param_int(params, "n_estimators", 100)),
+        learning_rate=param_float(params, "learning_rate", 0.1),
+        max_leaf_nodes=param_int(params, "max_leaf_nodes", 31),
+        max_depth=param_int(params, "max_depth", None),
+        min_samples_leaf=param_int(params, "min_samples_leaf", 20),
+        l2_regularization=param_float(params, "l2_regularization", 0.0),
+        early_stopping=early_stopping,
+        validation_fraction=param_float(params, "validation_fraction", 0.1),
+        n_iter_no_change=param_int(params, "n_iter_no_change", 10),
+        random_state=param_int(params, "random_state", 42),
+    )
+
+
+def _knn(params: Dict[str, Any]):
+    return KNeighborsRegressor(
+        n_neighbors=param_int(params, "n_neighbors", 5),
+        weights=param_str(params, "weights", "uniform").lower(),
+        algorithm=param_str(params, "algorithm", "auto").lower(),
+        leaf_size=param_int(params, "leaf_size", 40),
+    )
+
+
+# Keys match the URL names of the single-model endpoints
+ESTIMATOR_BUILDERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "linear": _linear,
+    "polynomial": _polynomial,
+    "ridge": _ridge,
+    "lasso": _lasso,
+    "elasticnet": _elasticnet,
+    "svr": _svr,
+    "decision-tree": _decision_tree,
+    "random-forest": _random_forest,
+    "gradient-boosting": _gradient_boosting,
+    "knn": _knn,
+}
+
+
+def build_estimator(algorithm: str, params: Dict[str, Any] | None = None):
+    """Return a new unfitted estimator for `algorithm` configured from `params`."""
+    builder = ESTIMATOR_BUILDERS.get(str(algorithm).lower())
+    if builder is None:
+        raise ValueError(
+            f"Unknown algorithm '{algorithm}'. Supported: {sorted(ESTIMATOR_BUILDERS)}"
+        )
+    try:
+        return builder(params or {})
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid parameters for '{algorithm}': {exc}")
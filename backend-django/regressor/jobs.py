@@ -0,0 +1,83 @@
+"""Decides which single-model fits leave the web tier for a Celery worker.
+
+Every regressor endpoint accepts ``async`` (top level or in ``parameters``):
+``true`` always queues the fit, ``false`` always runs it inline, and when it
+is not set the fit is queued if its rough cost exceeds
+``REGRESSOR_ASYNC_COST_LIMIT``. The cost is ``rows x features`` scaled by
+how the algorithm grows with the data, so short fits stay synchronous.
+
+Queued job ids are recorded in the shared Django cache (`remember_job`) so
+the polling endpoint only reports on regressor jobs it issued.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .estimators import param_bool, param_int, param_str
+
+# Work per (row x feature) relative to an ordinary least-squares fit
+_COST_FACTORS: Dict[str, Callable[[Dict[str, Any], int], float]] = {
+    "linear": lambda params, n: 1,
+    "polynomial": lambda params, n: 2 ** param_int(params, "degree", 2),
+    "ridge": lambda params, n: 1,
+    "lasso": lambda params, n: 10,
+    "elasticnet": lambda params, n: 10,
+    # Exact SVR is roughly quadratic in rows; the approximate path is linear
+    "svr": lambda params, n: (
+        n if param_str(params, "approximation", "auto").lower() == "exact"
+        or n <= param_int(params, "approximation_threshold", getattr(settings, "REGRESSOR_SVR_APPROX_THRESHOLD", 20000))
+        else param_int(params, "n_components", 300)
+    ),
+    "decision-tree": lambda params, n: 20,
+    "random-forest": lambda params, n: 20 * param_int(params, "n_estimators", 200),
+    "gradient-boosting": lambda params, n: 5 * param_int(params, "max_iter", param_int(params, "n_estimators", 100)),
+    # Tree build is n log n; the in-sample score queries every row once more
+    "knn": lambda params, n: 2 * param_int(params, "n_neighbors", 5),
+}
+
+
+def _async_flag(data: Dict[str, Any]):
+    params = data.get("parameters") or {}
+    for source in (data, params):
+        if param_str(source, "async", ""):
+            return param_bool(source, "async", False)
+    return None
+
+
+def estimate_cost(algorithm: str, data: Dict[str, Any]) -> float:
+    """Rough relative cost of fitting `algorithm` on the request payload."""
+    X = data.get("X") or []
+    n_samples = len(X)
+    first = X[0] if n_samples else None
+    n_features = len(first) if isinstance(first, (list, tuple)) else 1
+    params = data.get("parameters") or {}
+    try:
+        factor = _COST_FACTORS[algorithm](params, n_samples)
+        # Each bootstrap resample is another full fit
+        factor *= 1 + (param_int(params, "bootstrap_resamples", 0) or 0)
+    except (KeyError, TypeError, ValueError):
+        factor = 1
+    return float(n_samples) * n_features * factor
+
+
+def should_run_async(algorithm: str, data: Dict[str, Any]) -> bool:
+    """Whether the fit should be queued as a Celery task instead of run inline."""
+    flag = _async_flag(data)
+    if flag is not None:
+        return flag
+    return estimate_cost(algorithm, data) > float(getattr(settings, "REGRESSOR_ASYNC_COST_LIMIT", 50_000_000))
+
+
+def _job_key(job_id: str) -> str:
+    return f"regressor:job:{job_id}"
+
+
+def remember_job(job_id: str) -> None:
+    cache.set(_job_key(job_id), True, timeout=int(getattr(settings, "REGRESSOR_JOB_TTL", 86400)))
+
+
+def is_known_job(job_id: str) -> bool:
+    return bool(cache.get(_job_key(job_id)))
@@ -0,0 +1,162 @@
+"""SVR with an automatic kernel-approximation fast path for large inputs.
+
+Exact `SVR` scales quadratically to cubically with the number of samples.
+Above a size threshold `ScalableSVR` instead maps the inputs through a
+low-rank kernel feature map (Nystroem, or random Fourier features for the
+RBF kernel) and solves a linear problem in that space:
+
+- ``solver="ridge"`` streams the feature map in chunks and accumulates the
+  normal equations, so memory stays at ``rank x rank`` regardless of rows;
+- ``solver="linear_svr"`` keeps the epsilon-insensitive loss via `LinearSVR`
+  but materializes the full ``n_samples x rank`` feature matrix.
+"""
+from __future__ import annotations
+
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.kernel_approximation import Nystroem, RBFSampler
+from sklearn.svm import SVR, LinearSVR
+from sklearn.utils.validation import check_is_fitted
+
+APPROXIMATIONS = ("auto", "exact", "nystroem", "rff")
+SOLVERS = ("ridge", "linear_svr")
+
+
+class ScalableSVR(RegressorMixin, BaseEstimator):
+    def __init__(
+        self,
+        kernel="rbf",
+        C=1.0,
+        epsilon=0.1,
+        gamma="scale",
+        degree=3,
+        coef0=0.0,
+        approximation="auto",
+        approximation_threshold=20000,
+        n_components=300,
+        solver="ridge",
+        chunk_size=50000,
+        random_state=42,
+    ):
+        self.kernel = kernel
+        self.C = C
+        self.epsilon = epsilon
+        self.gamma = gamma
+        self.degree = degree
+        self.coef0 = coef0
+        self.approximation = approximation
+        self.approximation_threshold = approximation_threshold
+        self.n_components = n_components
+        self.solver = solver
+        self.chunk_size = chunk_size
+        self.random_state = random_state
+
+    def _resolve_mode(self, n_samples: int) -> str:
+        if self.approximation not in APPROXIMATIONS:
+            raise ValueError(f"approximation must be one of {APPROXIMATIONS}")
+        if self.solver not in SOLVERS:
+            raise ValueError(f"solver must be one of {SOLVERS}")
+        mode = self.approximation
+        if mode == "auto":
+            mode = "nystroem" if n_samples > self.approximation_threshold else "exact"
+        if mode != "exact" and self.kernel == "linear":
+            # A linear kernel needs no feature map; solve directly in input space
+            return "linear"
+        if mode == "rff" and self.kernel != "rbf":
+            raise ValueError("Random Fourier features ('rff') only approximate the 'rbf' kernel")
+        return mode
+
+    def _resolve_gamma(self, X: np.ndarray) -> float:
+        # Same definition SVR uses for gamma='scale' / 'auto'
+        if self.gamma == "scale":
+            var = X.var()
+            return 1.0 / (X.shape[1] * var) if var > 0 else 1.0
+        if self.gamma == "auto":
+            return 1.0 / X.shape[1]
+        return float(self.gamma)
+
+    def _features(self, X: np.ndarray) -> np.ndarray:
+        return X if self.feature_map_ is None else self.feature_map_.transform(X)
+
+    def _chunks(self, n: int):
+        step = max(int(self.chunk_size), 1)
+        for start in range(0, n, step):
+            yield slice(start, min(start + step, n))
+
+    def _fit_ridge(self, X: np.ndarray, y: np.ndarray) -> None:
+        # Accumulate Z'Z, Z'y and column sums chunk by chunk, then solve the
+        # centered ridge system so the intercept is not penalized.
+        n = X.shape[0]
+        gram = z_sum = zy = None
+        for sl in self._chunks(n):
+            Z = self._features(X[sl])
+            if gram is None:
+                gram = np.zeros((Z.shape[1], Z.shape[1]))
+                z_sum = np.zeros(Z.shape[1])
+                zy = np.zeros(Z.shape[1])
+            gram += Z.T @ Z
+            z_sum += Z.sum(axis=0)
+            zy += Z.T @ y[sl]
+        z_mean = z_sum / n
+        y_mean = y.mean()
+        gram_c = gram - n * np.outer(z_mean, z_mean)
+        zy_c = zy - n * z_mean * y_mean
+        # C is an inverse regularization strength, as for SVR
+        alpha = 1.0 / float(self.C)
+        self.weights_ = np.linalg.solve(gram_c + alpha * np.eye(len(z_mean)), zy_c)
+        self.bias_ = float(y_mean - z_mean @ self.weights_)
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        n_samples = X.shape[0]
+        self.mode_ = self._resolve_mode(n_samples)
+        self.n_features_in_ = X.shape[1]
+        self.approximation_rank_ = None
+        self.feature_map_ = None
+        self.exact_ = None
+        self.linear_ = None
+
+        if self.mode_ == "exact":
+            self.exact_ = SVR(
+                kernel=self.kernel, C=self.C, epsilon=self.epsilon,
+                gamma=self.gamma, degree=self.degree, coef0=self.coef0,
+            ).fit(X, y)
+            return self
+
+        if self.mode_ != "linear":
+            gamma = self._resolve_gamma(X)
+            rank = min(int(self.n_components), n_samples)
+            if self.mode_ == "rff":
+                self.feature_map_ = RBFSampler(gamma=gamma, n_components=rank, random_state=self.random_state)
+            else:
+                self.feature_map_ = Nystroem(
+                    kernel=self.kernel, gamma=gamma, degree=self.degree, coef0=self.coef0,
+                    n_components=rank, random_state=self.random_state,
+                )
+            # Nystroem samples `rank` landmark rows; RBFSampler only needs the input width
+            self.feature_map_.fit(X)
+            self.approximation_rank_ = rank
+
+        if self.solver == "ridge":
+            self._fit_ridge(X, y)
+        else:
+            self.linear_ = LinearSVR(
+                C=self.C, epsilon=self.epsilon, random_state=self.random_state, max_iter=5000,
+            ).fit(self._features(X), y)
+        return self
+
+    def predict(self, X):
+        check_is_fitted(self, "mode_")
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        if self.exact_ is not None:
+            return self.exact_.predict(X)
+        out = np.empty(X.shape[0])
+        for sl in self._chunks(X.shape[0]):
+            Z = self._features(X[sl])
+            out[sl] = self.linear_.predict(Z) if self.linear_ is not None else Z @ self.weights_ + self.bias_
+        return out
@@ -0,0 +1,134 @@
+"""Persistence for fitted regressors.
+
+Fitted estimators are serialized with joblib into the configured storage
+(`network.storage`) under ``regressors/<model_id>.joblib`` so they can be
+scored later without refitting. Recently used models are kept in a small
+per-process LRU so repeated predictions skip deserialization.
+
+Every fit stores a model (k-NN models include their training data, so they
+are stored once per index and query settings), and the
+``cleanup_artifacts`` command deletes models older than
+``REGRESSOR_MODEL_RETENTION_DAYS`` through `prune_models`.
+"""
+from __future__ import annotations
+
+import io
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Tuple
+
+import joblib
+import numpy as np
+from django.conf import settings
+
+from network import storage
+
+_MODEL_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+_cache: "OrderedDict[str, Tuple[Any, Dict[str, Any]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+_STORAGE_PREFIX = "regressors"
+
+
+def _storage_key(model_id: str) -> str:
+    return f"{_STORAGE_PREFIX}/{model_id}.joblib"
+
+
+def _cache_put(model_id: str, entry: Tuple[Any, Dict[str, Any]]) -> None:
+    size = int(getattr(settings, "REGRESSOR_MODEL_CACHE_SIZE", 32))
+    with _cache_lock:
+        _cache[model_id] = entry
+        _cache.move_to_end(model_id)
+        while len(_cache) > max(size, 0):
+            _cache.popitem(last=False)
+
+
+def save_model(model, algorithm: str, n_features: int, model_id: str | None = None, **extra: Any) -> str:
+    """
+    Serialize a fitted estimator to storage and return its model id. A given `model_id`
+    (derived from what the model was built from) is only written when not stored yet.
+    """
+    if model_id is not None and storage.exists(_storage_key(model_id)):
+        return model_id
+    model_id = model_id or uuid.uuid4().hex
+    metadata = {
+        "model_id": model_id,
+        "algorithm": algorithm,
+        "n_features": int(n_features),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **extra,
+    }
+    buf = io.BytesIO()
+    joblib.dump({"model": model, "metadata": metadata}, buf)
+    storage.save_file(_storage_key(model_id), buf)
+    _cache_put(model_id, (model, metadata))
+    return model_id
+
+
+def load_model(model_id: str) -> Tuple[Any, Dict[str, Any]]:
+    """Return ``(estimator, metadata)`` for a stored model, using the LRU when possible."""
+    model_id = str(model_id or "").strip().lower()
+    if not _MODEL_ID_RE.match(model_id):
+        raise ValueError("Invalid 'model_id'")
+
+    with _cache_lock:
+        entry = _cache.get(model_id)
+        if entry is not None:
+            _cache.move_to_end(model_id)
+            return entry
+
+    try:
+        with storage.open_stream(_storage_key(model_id)) as fh:
+            payload = joblib.load(io.BytesIO(fh.read()))
+    except (FileNotFoundError, OSError):
+        raise LookupError(f"Model '{model_id}' not found")
+    entry = (payload["model"], payload["metadata"])
+    _cache_put(model_id, entry)
+    return entry
+
+
+def prune_models(max_age_days: float) -> int:
+    """Delete stored models last written more than `max_age_days` ago; returns how many."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    removed = 0
+    for name in storage.list_files(_STORAGE_PREFIX):
+        key = f"{_STORAGE_PREFIX}/{name}"
+        modified = storage.modified_time(key)
+        if modified is None or modified >= cutoff:
+            continue
+        storage.delete(key)
+        with _cache_lock:
+            _cache.pop(name.rsplit(".", 1)[0], None)
+        removed += 1
+    return removed
+
+
+def predict(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Scores new points with a stored model.
+    - `model_id`: id returned by a regressor endpoint
+    - `X`: a batch of rows (or a flat list for single-feature models)
+    """
+    model, metadata = load_model(data.get("model_id"))
+    X = data.get("X")
+    if X is None:
+        raise ValueError("'X' is required")
+    try:
+        X = np.asarray(X, dtype=np.float64)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"'X' must be numeric: {exc}")
+    if X.ndim == 1:
+        X = X.reshape(-1, 1) if metadata["n_features"] == 1 else X.reshape(1, -1)
+    if X.ndim != 2 or X.shape[1] != metadata["n_features"]:
+        raise ValueError(f"Model expects {metadata['n_features']} features per row")
+
+    return {
+        "model_id": metadata["model_id"],
+        "algorithm": metadata["algorithm"],
+        "predictions": model.predict(X).tolist(),
+    }
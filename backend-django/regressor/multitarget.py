@@ -0,0 +1,92 @@
+"""Multi-target support for the linear-family regressor endpoints.
+
+``y`` may be a flat list (one target), a list of rows with one value per
+target (``n_samples x n_targets``), or an object mapping target names to
+columns. Linear, ridge and lasso models accept the 2D target matrix
+directly, so all targets share one factorization of ``X`` (least squares /
+Cholesky, or one precomputed Gram matrix for lasso's coordinate descent)
+instead of one request per target.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+from sklearn.metrics import r2_score
+
+from .compare import curve_samples
+from .estimators import param_str
+from .plotting import fit_plot
+
+
+def prepare_targets(data: Dict[str, Any]) -> Tuple[np.ndarray, List[str] | None]:
+    """
+    Return ``(y, target_names)``; `target_names` is None for a single target.
+    Names come from the keys of an object `y`, or from `target_names`.
+    """
+    raw = data.get("y")
+    names = data.get("target_names")
+    if isinstance(raw, dict):
+        names = [str(name) for name in raw]
+        y = np.column_stack([np.asarray(col, dtype=np.float64) for col in raw.values()])
+    else:
+        y = np.array(raw)
+    if y.ndim == 2 and y.shape[1] == 1 and not names:
+        y = y.ravel()
+    if y.ndim == 1:
+        return y, None
+
+    if names is None:
+        names = [f"y{i + 1}" for i in range(y.shape[1])]
+    if len(names) != y.shape[1]:
+        raise ValueError(f"Got {len(names)} target names for {y.shape[1]} target columns")
+    return y, [str(name) for name in names]
+
+
+def fit_target_plot(
+    predict: Callable[[np.ndarray], np.ndarray],
+    X: np.ndarray,
+    y: np.ndarray,
+    target_names: List[str] | None,
+    *,
+    params: Dict[str, Any] | None = None,
+    **options: Any,
+) -> Dict[str, Any]:
+    """`fit_plot` for one target; with several, `plot_target` (name or index) picks which."""
+    if target_names is None:
+        return fit_plot(predict, X, y, params=params, **options)
+
+    choice = param_str(params or {}, "plot_target", target_names[0])
+    if choice in target_names:
+        index = target_names.index(choice)
+    elif choice.isdigit() and int(choice) < len(target_names):
+        index = int(choice)
+    else:
+        raise ValueError(f"'plot_target' must be one of {target_names}")
+    plot = fit_plot(lambda grid: predict(grid)[:, index], X, y[:, index], params=params, **options)
+    plot["plot_target"] = target_names[index]
+    return plot
+
+
+def target_results(model, X: np.ndarray, y: np.ndarray, target_names: List[str] | None) -> Dict[str, Any]:
+    """Per-target coefficients, R² and curves (empty for single-target fits)."""
+    if target_names is None:
+        return {}
+    r2 = r2_score(y, model.predict(X), multioutput="raw_values")
+    intercepts = np.broadcast_to(model.intercept_, (len(target_names),))
+    curves = curve_samples(model, X)
+    targets = []
+    for i, name in enumerate(target_names):
+        curve = None
+        if curves is not None:
+            # Every target was predicted on the grid in one call; split the columns
+            values = np.asarray(curves["y"])
+            curve = {**curves, "y": values[..., i].tolist()}
+        targets.append({
+            "name": name,
+            "coefficients": model.coef_[i].tolist(),
+            "intercept": float(intercepts[i]),
+            "r_squared": float(r2[i]),
+            "curve": curve,
+        })
+    return {"n_targets": len(target_names), "targets": targets}
@@ -0,0 +1,156 @@
+"""Spatial-index cache for k-nearest-neighbour regression.
+
+Building a KD-tree or ball tree is the expensive part of k-NN; querying it
+is cheap. `get_index` builds the tree once per dataset (keyed by a hash of
+``X``, ``y`` and the tree settings) and keeps it in a per-process LRU, so
+requests that only change ``n_neighbors`` or ``weights`` reuse the tree.
+The returned ``index_id`` can be sent instead of ``X``/``y`` later on, and
+`model_key` gives the stored model of an index and query settings a fixed
+id, so repeat queries do not store the training data again.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from django.conf import settings
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.neighbors import BallTree, KDTree
+
+from .estimators import param_int, param_str
+
+TREE_ALGORITHMS = ("auto", "kd_tree", "ball_tree")
+WEIGHTS = ("uniform", "distance")
+
+_INDEX_ID_RE = re.compile(r"^[0-9a-f]{40}$")
+
+_cache: "OrderedDict[str, NeighborIndex]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class NeighborIndex:
+    """A KD-tree / ball tree over the training inputs plus their targets."""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, algorithm: str = "auto", leaf_size: int = 40):
+        if algorithm == "auto":
+            # KD-trees degrade towards brute force in high dimensions; ball trees hold up better
+            algorithm = "kd_tree" if X.shape[1] <= 15 else "ball_tree"
+        tree_cls = KDTree if algorithm == "kd_tree" else BallTree
+        self.algorithm = algorithm
+        self.leaf_size = leaf_size
+        self.X = X
+        self.y = y
+        self.tree = tree_cls(X, leaf_size=leaf_size)
+
+    @property
+    def n_samples(self) -> int:
+        return int(self.X.shape[0])
+
+    def predict(self, X: np.ndarray, n_neighbors: int, weights: str = "uniform", chunk_size: int = 20000) -> np.ndarray:
+        """Average the targets of the `n_neighbors` nearest training points, in batched queries."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        k = min(int(n_neighbors), self.n_samples)
+        out = np.empty(X.shape[0])
+        for start in range(0, X.shape[0], chunk_size):
+            dist, ind = self.tree.query(X[start:start + chunk_size], k=k)
+            neighbours = self.y[ind]
+            if weights == "distance":
+                with np.errstate(divide="ignore"):
+                    w = 1.0 / dist
+                # Exact matches take the whole weight, as in KNeighborsRegressor
+                exact = np.isinf(w)
+                rows = exact.any(axis=1)
+                w[rows] = exact[rows]
+                out[start:start + chunk_size] = np.sum(w * neighbours, axis=1) / np.sum(w, axis=1)
+            else:
+                out[start:start + chunk_size] = neighbours.mean(axis=1)
+        return out
+
+
+class NeighborsModel(RegressorMixin, BaseEstimator):
+    """Estimator view of a cached index with fixed `n_neighbors`/`weights` (what the model store keeps)."""
+
+    def __init__(self, index: NeighborIndex | None = None, n_neighbors: int = 5, weights: str = "uniform"):
+        self.index = index
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+
+    def fit(self, X, y):
+        self.index = NeighborIndex(np.asarray(X, dtype=np.float64), np.asarray(y, dtype=np.float64))
+        return self
+
+    def predict(self, X):
+        return self.index.predict(X, self.n_neighbors, self.weights)
+
+
+def dataset_key(X: np.ndarray, y: np.ndarray, algorithm: str, leaf_size: int) -> str:
+    digest = hashlib.sha1()
+    digest.update(repr((X.shape, algorithm, leaf_size)).encode())
+    digest.update(np.ascontiguousarray(X).tobytes())
+    digest.update(np.ascontiguousarray(y).tobytes())
+    return digest.hexdigest()
+
+
+def model_key(index_id: str, n_neighbors: int, weights: str) -> str:
+    """Model store id of the index queried with `n_neighbors`/`weights`."""
+    return hashlib.sha1(f"{index_id}:{n_neighbors}:{weights}".encode()).hexdigest()[:32]
+
+
+def _cache_put(index_id: str, index: NeighborIndex) -> None:
+    size = int(getattr(settings, "REGRESSOR_KNN_INDEX_CACHE_SIZE", 8))
+    with _cache_lock:
+        _cache[index_id] = index
+        _cache.move_to_end(index_id)
+        while len(_cache) > max(size, 0):
+            _cache.popitem(last=False)
+
+
+def lookup_index(index_id: str) -> NeighborIndex:
+    index_id = str(index_id or "").strip().lower()
+    if not _INDEX_ID_RE.match(index_id):
+        raise ValueError("Invalid 'index_id'")
+    with _cache_lock:
+        index = _cache.get(index_id)
+        if index is not None:
+            _cache.move_to_end(index_id)
+            return index
+    raise LookupError(f"Index '{index_id}' is not cached (anymore); send X and y again")
+
+
+def get_index(X: np.ndarray, y: np.ndarray, algorithm: str = "auto", leaf_size: int = 40) -> Tuple[str, NeighborIndex, bool]:
+    """Return ``(index_id, index, reused)``, building and caching the tree on a miss."""
+    if algorithm not in TREE_ALGORITHMS:
+        raise ValueError(f"'algorithm' must be one of {TREE_ALGORITHMS}")
+    index_id = dataset_key(X, y, algorithm, leaf_size)
+    with _cache_lock:
+        index = _cache.get(index_id)
+        if index is not None:
+            _cache.move_to_end(index_id)
+            return index_id, index, True
+    index = NeighborIndex(X, y, algorithm=algorithm, leaf_size=leaf_size)
+    _cache_put(index_id, index)
+    return index_id, index, False
+
+
+def resolve_index(data: Dict[str, Any], params: Dict[str, Any]) -> Tuple[str, NeighborIndex, bool]:
+    """Use `index_id` when no data is sent, otherwise hash `X`/`y` and build or reuse the tree."""
+    if data.get("X") is None and data.get("index_id"):
+        index_id = str(data["index_id"]).strip().lower()
+        return index_id, lookup_index(index_id), True
+    X = np.asarray(data.get("X"), dtype=np.float64)
+    y = np.asarray(data.get("y"), dtype=np.float64)
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    if X.ndim != 2 or y.ndim != 1 or X.shape[0] != y.shape[0]:
+        raise ValueError("'X' must have one row per value of 'y'")
+    return get_index(
+        X, y,
+        algorithm=param_str(params, "algorithm", "auto").lower(),
+        leaf_size=param_int(params, "leaf_size", 40),
+    )
@@ -0,0 +1,156 @@
+"""Lasso / ElasticNet regularization paths.
+
+The whole coefficient path over a log-spaced alpha grid is computed by one
+`enet_path` call: coordinate descent runs from the largest alpha (all
+coefficients zero) down, each solve warm-started from the previous one, and
+all of them reuse a single precomputed Gram matrix ``XᵀX``. Optional k-fold
+CV computes one path per fold in parallel and picks the alpha with the
+lowest mean validation MSE; without CV the alpha with the lowest BIC wins.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.linear_model import enet_path
+from sklearn.model_selection import KFold
+
+from .compare import finite_or_none, max_workers
+from .estimators import param_float, param_int, param_str, prepare_xy
+
+PATH_ALGORITHMS = ("lasso", "elasticnet")
+
+
+def alpha_grid(X: np.ndarray, y: np.ndarray, l1_ratio: float, n_alphas: int, eps: float) -> np.ndarray:
+    """Log-spaced alphas from the smallest one that zeroes every coefficient down to ``eps`` x that."""
+    Xc = X - X.mean(axis=0)
+    alpha_max = np.max(np.abs(Xc.T @ (y - y.mean()))) / (len(y) * l1_ratio)
+    if alpha_max <= 0:
+        alpha_max = 1.0
+    return np.logspace(np.log10(alpha_max), np.log10(alpha_max * eps), n_alphas)
+
+
+def _centered_path(
+    X: np.ndarray, y: np.ndarray, alphas: np.ndarray, l1_ratio: float, tol: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(coefs, intercepts)`` along `alphas`; coefs has shape ``(n_alphas, n_features)``."""
+    X_mean, y_mean = X.mean(axis=0), y.mean()
+    Xc = X - X_mean
+    yc = y - y_mean
+    # One Gram matrix and Xᵀy shared by every alpha on the path
+    gram = Xc.T @ Xc
+    Xy = Xc.T @ yc
+    _, coefs, _ = enet_path(
+        Xc, yc, l1_ratio=l1_ratio, alphas=alphas, precompute=gram, Xy=Xy, tol=tol, check_input=False,
+    )
+    coefs = coefs.T
+    return coefs, y_mean - coefs @ X_mean
+
+
+def _fold_mse(X, y, train_idx, test_idx, alphas, l1_ratio, tol) -> np.ndarray:
+    """Validation MSE along the path for one CV fold (runs inside a pool worker)."""
+    coefs, intercepts = _centered_path(X[train_idx], y[train_idx], alphas, l1_ratio, tol)
+    pred = X[test_idx] @ coefs.T + intercepts
+    return np.mean((y[test_idx, None] - pred) ** 2, axis=0)
+
+
+def compute_path(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Computes the regularization path and picks an alpha.
+    - `algorithm`: "lasso" (default) or "elasticnet" (with `l1_ratio`)
+    - `n_alphas` / `eps`: grid size and smallest/largest alpha ratio, or explicit `alphas`
+    - `cv`: number of folds for alpha selection (0 selects by BIC)
+    - `tol`: coordinate-descent tolerance
+    """
+    X, y = prepare_xy(data)
+    X = np.ascontiguousarray(X)
+    algorithm = param_str(data, "algorithm", "lasso").lower()
+    if algorithm not in PATH_ALGORITHMS:
+        raise ValueError(f"'algorithm' must be one of {PATH_ALGORITHMS}")
+    l1_ratio = 1.0 if algorithm == "lasso" else param_float(data, "l1_ratio", 0.5)
+    if not 0 < l1_ratio <= 1:
+        raise ValueError("'l1_ratio' must be in (0, 1]")
+
+    if data.get("alphas"):
+        alphas = np.sort(np.asarray(data["alphas"], dtype=np.float64))[::-1]
+        if np.any(alphas <= 0):
+            raise ValueError("'alphas' must all be positive")
+    else:
+        n_alphas = param_int(data, "n_alphas", 100)
+        eps = param_float(data, "eps", 1e-3)
+        if not 2 <= n_alphas <= 1000 or not 0 < eps < 1:
+            raise ValueError("'n_alphas' must be in [2, 1000] and 'eps' in (0, 1)")
+        alphas = alpha_grid(X, y, l1_ratio, n_alphas, eps)
+
+    # Coordinate-descent stopping tolerance, as for the single-alpha models
+    tol = param_float(data, "tol", 1e-4)
+    started = time.perf_counter()
+    coefs, intercepts = _centered_path(X, y, alphas, l1_ratio, tol)
+    residuals = y[:, None] - (X @ coefs.T + intercepts)
+    rss = np.sum(residuals ** 2, axis=0)
+    tss = np.sum((y - y.mean()) ** 2)
+    n = len(y)
+    n_nonzero = np.count_nonzero(np.abs(coefs) > 1e-12, axis=1)
+    r_squared = 1 - rss / tss if tss > 0 else np.zeros_like(rss)
+    # Degrees of freedom of the lasso ~ number of active coefficients (+ intercept)
+    bic = n * np.log(np.maximum(rss / n, np.finfo(float).tiny)) + np.log(n) * (n_nonzero + 1)
+
+    folds = param_int(data, "cv", 0)
+    cv = None
+    if folds:
+        if folds < 2 or n < 2 * folds:
+            raise ValueError(f"Cannot run {folds}-fold cross-validation on {n} samples")
+        splits = KFold(n_splits=folds, shuffle=True, random_state=param_int(data, "random_state", 42)).split(X)
+        # Every fold's path is independent; the data is memory-mapped to the workers
+        fold_mse = Parallel(n_jobs=min(folds, max_workers()), backend="loky", mmap_mode="r")(
+            delayed(_fold_mse)(X, y, train_idx, test_idx, alphas, l1_ratio, tol) for train_idx, test_idx in splits
+        )
+        fold_mse = np.vstack(fold_mse)
+        mean_mse = fold_mse.mean(axis=0)
+        best = int(np.argmin(mean_mse))
+        cv = {
+            "folds": folds,
+            "mean_mse": [finite_or_none(v) for v in mean_mse],
+            "std_mse": [finite_or_none(v) for v in fold_mse.std(axis=0)],
+        }
+    else:
+        best = int(np.argmin(bic))
+
+    return {
+        "algorithm": algorithm,
+        "l1_ratio": l1_ratio,
+        "alphas": alphas.tolist(),
+        "coefficients": coefs.tolist(),
+        "intercepts": intercepts.tolist(),
+        "n_nonzero": n_nonzero.tolist(),
+        "r_squared": [finite_or_none(v) for v in r_squared],
+        "bic": [finite_or_none(v) for v in bic],
+        "cv": cv,
+        "selection": "cv" if cv else "bic",
+        "selected_index": best,
+        "selected_alpha": float(alphas[best]),
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+def regularization_path(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Computes the path and returns the selected model's standard response.
+    - The selected alpha is refitted on all data through the matching service
+    - The path itself is attached under `path`
+    """
+    from .services import REGRESSION_SERVICES
+
+    path = compute_path(data)
+    parameters = {"alpha": path["selected_alpha"]}
+    if path["algorithm"] == "elasticnet":
+        parameters["l1_ratio"] = path["l1_ratio"]
+    response = REGRESSION_SERVICES[path["algorithm"]]({
+        "X": data.get("X"),
+        "y": data.get("y"),
+        "parameters": {**dict(data.get("parameters") or {}), **parameters},
+    })
+    response["path"] = path
+    return response
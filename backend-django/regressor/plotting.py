@@ -0,0 +1,226 @@
+"""Fit plots for the single-model regressor endpoints.
+
+Plotting is split in two steps so the output size does not depend on the
+number of samples:
+
+- `build_plot_spec` evaluates the model on a fixed grid and reduces the
+  scatter data to at most ``REGRESSOR_PLOT_MAX_POINTS`` points, either by a
+  stratified sample that keeps every stratum's extremes or by hexbin density;
+- `render_plot` draws the spec with matplotlib and encodes it as minified
+  SVG (``svg_plot``) or as a base64 PNG/WebP (``plot_image``).
+
+The spec only holds plain arrays and options, so `fit_plot` hands it to
+the warm worker pool in `regressor.render_pool` instead of drawing in the
+request thread.
+"""
+from __future__ import annotations
+
+import base64
+import io
+import re
+from typing import Any, Callable, Dict
+
+import numpy as np
+from django.conf import settings
+
+from .estimators import param_int, param_str
+
+PLOT_FORMATS = ("svg", "png", "webp")
+DECIMATION_METHODS = ("auto", "none", "sample", "hexbin")
+
+_SVG_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_SVG_GAP_RE = re.compile(r">\s+<")
+
+
+def _max_points() -> int:
+    return int(getattr(settings, "REGRESSOR_PLOT_MAX_POINTS", 2000))
+
+
+def stratified_sample(order_key: np.ndarray, values: np.ndarray, budget: int, seed: int = 0) -> np.ndarray:
+    """
+    Pick at most `budget` row indices spread evenly along `order_key`.
+
+    Rows are sorted by `order_key` and split into strata; every stratum keeps
+    its lowest and highest `values` (so outliers and the envelope survive)
+    and the remaining budget is filled with a uniform random sample.
+    """
+    n = len(values)
+    if n <= budget:
+        return np.arange(n)
+    order = np.argsort(order_key, kind="stable")
+    n_strata = max(budget // 4, 1)
+    bounds = np.linspace(0, n, n_strata + 1).astype(int)
+    starts = bounds[:-1]
+    sorted_values = values[order]
+
+    keep = np.zeros(n, dtype=bool)
+    for start, stop in zip(starts, bounds[1:]):
+        chunk = sorted_values[start:stop]
+        keep[order[start + np.argmin(chunk)]] = True
+        keep[order[start + np.argmax(chunk)]] = True
+    # Global extremes of the ordering key (ends of the x-axis)
+    keep[order[0]] = keep[order[-1]] = True
+
+    remaining = budget - int(keep.sum())
+    if remaining > 0:
+        rest = np.flatnonzero(~keep)
+        rng = np.random.default_rng(seed)
+        keep[rng.choice(rest, size=min(remaining, len(rest)), replace=False)] = True
+    return np.flatnonzero(keep)
+
+
+def build_plot_spec(
+    predict: Callable[[np.ndarray], np.ndarray],
+    X: np.ndarray,
+    y: np.ndarray,
+    *,
+    label: str,
+    params: Dict[str, Any] | None = None,
+    grid_1d: int = 200,
+    grid_2d: int = 30,
+    surface_color: str | None = "red",
+    surface_cmap: str | None = None,
+    surface_alpha: float = 0.5,
+) -> Dict[str, Any]:
+    """
+    Evaluate `predict` on a plotting grid and decimate the scatter data.
+    - `params` may set `plot_format`, `plot_max_points` and `plot_decimation`
+      (auto / none / sample / hexbin)
+    """
+    params = params or {}
+    fmt = param_str(params, "plot_format", "svg").lower()
+    if fmt not in PLOT_FORMATS:
+        raise ValueError(f"'plot_format' must be one of {PLOT_FORMATS}")
+    method = param_str(params, "plot_decimation", "auto").lower()
+    if method not in DECIMATION_METHODS:
+        raise ValueError(f"'plot_decimation' must be one of {DECIMATION_METHODS}")
+    budget = max(param_int(params, "plot_max_points", _max_points()), 10)
+
+    n_samples, n_features = X.shape
+    spec: Dict[str, Any] = {
+        "format": fmt,
+        "dpi": int(getattr(settings, "REGRESSOR_PLOT_DPI", 100)),
+        "n_features": n_features,
+        "label": label,
+        "points": {"total": int(n_samples), "shown": int(n_samples), "method": "all"},
+    }
+    if n_features > 2:
+        spec["points"]["shown"] = 0
+        return spec
+
+    if method == "auto":
+        method = "sample" if n_samples > budget else "none"
+    if method == "hexbin" and n_features != 1:
+        # Density bins only make sense on a flat 2D axis
+        method = "sample"
+
+    if n_features == 1:
+        x_range = np.linspace(X.min(), X.max(), grid_1d).reshape(-1, 1)
+        spec["curve"] = {"x": x_range.ravel(), "y": np.asarray(predict(x_range)).ravel()}
+    else:
+        x_surf, y_surf = np.meshgrid(
+            np.linspace(X[:, 0].min(), X[:, 0].max(), grid_2d),
+            np.linspace(X[:, 1].min(), X[:, 1].max(), grid_2d)
+        )
+        X_grid = np.column_stack((x_surf.ravel(), y_surf.ravel()))
+        spec["surface"] = {
+            "x": x_surf,
+            "y": y_surf,
+            "z": np.asarray(predict(X_grid)).reshape(x_surf.shape),
+            "color": surface_color,
+            "cmap": surface_cmap,
+            "alpha": surface_alpha,
+        }
+
+    if method == "hexbin":
+        # The hexbin itself is bounded by its grid size, not by the sample count
+        spec["hexbin"] = {"x": X[:, 0], "y": y, "gridsize": 60}
+        spec["points"].update(shown=0, method="hexbin")
+        return spec
+
+    idx = np.arange(n_samples) if method == "none" else stratified_sample(X[:, 0], y, budget)
+    spec["scatter"] = {"X": X[idx], "y": y[idx]}
+    spec["points"].update(shown=int(len(idx)), method="all" if len(idx) == n_samples else "sample")
+    return spec
+
+
+def _figure_bytes(fig, fmt: str, dpi: int) -> bytes:
+    import matplotlib
+
+    buf = io.BytesIO()
+    if fmt == "svg":
+        # Keep text as <text> nodes instead of glyph paths and drop the timestamp
+        with matplotlib.rc_context({"svg.fonttype": "none", "svg.hashsalt": "maid"}):
+            fig.savefig(buf, format="svg", metadata={"Date": None})
+    else:
+        fig.savefig(buf, format=fmt, dpi=dpi)
+    return buf.getvalue()
+
+
+def minify_svg(svg: str) -> str:
+    svg = _SVG_COMMENT_RE.sub("", svg)
+    return _SVG_GAP_RE.sub("><", svg).strip()
+
+
+def render_plot(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Draw a spec from `build_plot_spec` and return the response fields for it."""
+    import matplotlib.pyplot as plt
+
+    # Past a few hundred markers an embedded bitmap is smaller than one SVG path per point
+    dense = spec["points"]["shown"] > 500
+    fig, ax = plt.subplots()
+    try:
+        if spec["n_features"] == 1:
+            if "hexbin" in spec:
+                hb = spec["hexbin"]
+                ax.hexbin(hb["x"], hb["y"], gridsize=hb["gridsize"], mincnt=1, cmap="Blues")
+            else:
+                ax.scatter(
+                    spec["scatter"]["X"][:, 0], spec["scatter"]["y"], color="blue", label="Data", rasterized=dense
+                )
+            ax.plot(spec["curve"]["x"], spec["curve"]["y"], color="red", label=spec["label"])
+            ax.set_xlabel("X")
+            ax.set_ylabel("y")
+            ax.legend()
+        elif spec["n_features"] == 2:
+            fig.clf()
+            ax = fig.add_subplot(111, projection="3d")
+            pts = spec["scatter"]
+            ax.scatter(pts["X"][:, 0], pts["X"][:, 1], pts["y"], color="blue", label="Data", rasterized=dense)
+            surf = spec["surface"]
+            style = {"cmap": surf["cmap"]} if surf["cmap"] else {"color": surf["color"]}
+            # One embedded bitmap instead of a vector path per surface facet
+            ax.plot_surface(surf["x"], surf["y"], surf["z"], alpha=surf["alpha"], rasterized=True, **style)
+            ax.set_xlabel("X1")
+            ax.set_ylabel("X2")
+            ax.set_zlabel("y")
+        else:
+            # Higher-dimensional case: cannot plot
+            ax.text(0.5, 0.5, "Plot unavailable for >2 features", ha="center", va="center")
+            ax.axis("off")
+        data = _figure_bytes(fig, spec["format"], spec["dpi"])
+    finally:
+        plt.close(fig)
+
+    payload: Dict[str, Any] = {"plot_format": spec["format"], "plot_points": spec["points"]}
+    if spec["format"] == "svg":
+        payload["svg_plot"] = minify_svg(data.decode("utf-8"))
+    else:
+        payload["plot_image"] = base64.b64encode(data).decode("ascii")
+    return payload
+
+
+def fit_plot(predict: Callable[[np.ndarray], np.ndarray], X: np.ndarray, y: np.ndarray, **options: Any) -> Dict[str, Any]:
+    """
+    Build the fit plot and render it through the warm render pool.
+    Returns the plot fields of a service response; when the renderer is busy
+    or times out the fit is still returned, with `plot_error` instead of a figure.
+    """
+    from .render_pool import RenderUnavailable, submit_render
+
+    spec = build_plot_spec(predict, X, y, **options)
+    try:
+        return submit_render(spec)
+    except RenderUnavailable as exc:
+        image_key = "svg_plot" if spec["format"] == "svg" else "plot_image"
+        return {"plot_format": spec["format"], "plot_points": spec["points"], image_key: None, "plot_error": str(exc)}
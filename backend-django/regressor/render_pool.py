@@ -0,0 +1,184 @@
+"""Warm process pool that renders regression plots off the request thread.
+
+matplotlib's pyplot keeps global state and drawing holds the GIL, so
+rendering inside the Django worker serializes concurrent requests. Plot
+specs from `regressor.plotting` are plain data, so they are shipped to a
+small pool of spawned processes that import matplotlib (Agg backend),
+mplot3d and the font cache once at start-up.
+
+- ``REGRESSOR_RENDER_WORKERS``: pool size; ``0`` renders inline
+- ``REGRESSOR_RENDER_QUEUE_SIZE``: renders allowed to wait for a worker
+- ``REGRESSOR_RENDER_TIMEOUT``: seconds a request waits for its figure; a
+  render still running then retires its pool: new renders go to a fresh
+  pool, and the old workers are killed once its other renders finish
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, Set
+
+from django.conf import settings
+
+from .plotting import render_plot
+
+_pool: ProcessPoolExecutor | None = None
+_pool_size = 0
+_slots: threading.BoundedSemaphore | None = None
+# Reentrant: cancelling futures under the lock runs their done callbacks, which take it too
+_lock = threading.RLock()
+
+
+@dataclass
+class _PoolRenders:
+    """Unfinished renders of one pool; `hung` ones outlived their request's timeout."""
+
+    pending: Set[Future] = field(default_factory=set)
+    hung: Set[Future] = field(default_factory=set)
+    retired: bool = False
+
+
+_renders: Dict[ProcessPoolExecutor, _PoolRenders] = {}
+
+
+class RenderUnavailable(RuntimeError):
+    """The pool is saturated or the render did not finish within the timeout."""
+
+
+def _warm_worker() -> None:
+    # Runs once per worker process: pick the non-GUI backend and pay the
+    # import / font-cache cost before the first real request arrives
+    os.environ["MPLBACKEND"] = "Agg"
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import mpl_toolkits.mplot3d  # noqa: F401 - registers the "3d" projection
+
+    fig = plt.figure()
+    fig.add_subplot(111, projection="3d").set_xlabel("X")
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def render_workers() -> int:
+    default = min(2, os.cpu_count() or 1)
+    return max(int(getattr(settings, "REGRESSOR_RENDER_WORKERS", default)), 0)
+
+
+def _get_pool() -> tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+    global _pool, _pool_size, _slots
+    workers = render_workers()
+    with _lock:
+        if _pool is None or _pool_size != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+                _renders.pop(_pool, None)
+            # Spawn, not fork: forked children would inherit the web worker's
+            # threads and locks (and pyplot state if it was ever imported)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+            _pool_size = workers
+            _renders[_pool] = _PoolRenders()
+            queue_size = max(int(getattr(settings, "REGRESSOR_RENDER_QUEUE_SIZE", 16)), 0)
+            _slots = threading.BoundedSemaphore(workers + queue_size)
+        return _pool, _slots
+
+
+def _reset_pool(pool: ProcessPoolExecutor | None = None) -> None:
+    """Drop the pool, or only `pool` if still current (its running renders finish; queued ones are cancelled)."""
+    global _pool
+    with _lock:
+        if _pool is not None and pool in (None, _pool):
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _renders.pop(_pool, None)
+            _pool = None
+
+
+def _retire_pool(pool: ProcessPoolExecutor, hung: Future) -> None:
+    """Send new renders to a fresh pool; `pool`'s workers are killed once its other renders finish."""
+    global _pool
+    with _lock:
+        renders = _renders.get(pool)
+        if renders is None:
+            return
+        renders.hung.add(hung)
+        if renders.retired:
+            return
+        renders.retired = True
+        if _pool is pool:
+            _pool = None
+    threading.Thread(target=_kill_when_drained, args=(pool, renders), name="render-pool-drain", daemon=True).start()
+
+
+def _kill_when_drained(pool: ProcessPoolExecutor, renders: _PoolRenders) -> None:
+    while True:
+        with _lock:
+            running = renders.pending - renders.hung
+        if not running:
+            break
+        # Renders that time out meanwhile join `hung`, so this never waits on one indefinitely
+        wait(running, timeout=1.0)
+    with _lock:
+        _renders.pop(pool, None)
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    # The hung futures fail with BrokenProcessPool, which releases their slots
+    for process in processes:
+        process.terminate()
+
+
+def shutdown() -> None:
+    """Stop the worker processes (tests and graceful shutdown)."""
+    _reset_pool()
+
+
+def submit_render(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Render `spec` in the pool and wait for it, or inline when the pool is disabled."""
+    if render_workers() == 0:
+        return render_plot(spec)
+
+    timeout = float(getattr(settings, "REGRESSOR_RENDER_TIMEOUT", 30))
+    pool, slots = _get_pool()
+    # Bounded queue: a slot is held until the render really finishes, so
+    # renders that outlive their request still count against the limit
+    if not slots.acquire(timeout=timeout):
+        raise RenderUnavailable("Plot renderer is busy; try again shortly")
+    try:
+        future = pool.submit(render_plot, spec)
+    except (BrokenProcessPool, RuntimeError):
+        slots.release()
+        _reset_pool(pool)
+        raise RenderUnavailable("Plot renderer restarted; try again shortly")
+    with _lock:
+        renders = _renders.get(pool)
+        if renders is not None:
+            renders.pending.add(future)
+
+    def _finished(done: Future) -> None:
+        slots.release()
+        with _lock:
+            if renders is not None:
+                renders.pending.discard(done)
+
+    future.add_done_callback(_finished)
+
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        if not future.cancel():
+            # Already drawing: a cancel cannot stop it, so retire the pool instead of
+            # letting a hung render hold a worker (and its slot) indefinitely
+            _retire_pool(pool, future)
+        raise RenderUnavailable(f"Plot rendering took longer than {timeout:g}s")
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM); start a fresh pool for the next request
+        _reset_pool(pool)
+        raise RenderUnavailable("Plot renderer crashed while drawing this figure")
@@ -0,0 +1,211 @@
+"""Cross-validated hyperparameter search for the regressor models.
+
+Candidates are scored fold by fold: every round evaluates the next CV fold
+of all surviving candidates in parallel, after which candidates that are
+clearly worse than the current leader are pruned. The search stops early
+when its time budget is spent and reports scores on the folds completed.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+from django.conf import settings
+from joblib import Parallel, delayed
+from scipy import stats
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler
+
+from .compare import finite_or_none, max_workers
+from .estimators import (
+    ESTIMATOR_BUILDERS, build_estimator, param_bool, param_float, param_int, param_str, prepare_xy,
+)
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+def _distribution(name: str, spec: Any):
+    """Turn a JSON search-space entry into something `ParameterSampler` understands."""
+    if isinstance(spec, (list, tuple)):
+        if not spec:
+            raise ValueError(f"Search space for '{name}' is empty")
+        return list(spec)
+    if isinstance(spec, dict) and "low" in spec and "high" in spec:
+        low, high = float(spec["low"]), float(spec["high"])
+        if low >= high:
+            raise ValueError(f"Search space for '{name}' needs low < high")
+        if str(spec.get("type", "float")).lower() == "int":
+            return stats.randint(int(low), int(high) + 1)
+        if param_bool(spec, "log", False):
+            return stats.loguniform(low, high)
+        return stats.uniform(low, high - low)
+    raise ValueError(f"Search space for '{name}' must be a list of values or a {{low, high}} range")
+
+
+def build_candidates(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expand the grid or sample the random search space into concrete parameter sets."""
+    strategy = param_str(data, "strategy", "grid").lower()
+    space = data.get("search_space")
+    if not isinstance(space, dict) or not space:
+        raise ValueError("'search_space' must be a non-empty object of parameter -> values")
+    limit = int(getattr(settings, "REGRESSOR_SEARCH_MAX_CANDIDATES", 200))
+
+    if strategy == "grid":
+        for name, values in space.items():
+            if not isinstance(values, (list, tuple)) or not values:
+                raise ValueError(f"Grid search needs a non-empty list of values for '{name}'")
+        grid = ParameterGrid({name: list(values) for name, values in space.items()})
+        if len(grid) > limit:
+            raise ValueError(f"Grid has {len(grid)} candidates; the limit is {limit}")
+        candidates = list(grid)
+    elif strategy == "random":
+        n_iter = param_int(data, "n_iter", 20)
+        if not 1 <= n_iter <= limit:
+            raise ValueError(f"'n_iter' must be between 1 and {limit}")
+        distributions = {name: _distribution(name, spec) for name, spec in space.items()}
+        sampler = ParameterSampler(distributions, n_iter=n_iter, random_state=param_int(data, "random_state", 42))
+        candidates = list(sampler)
+    else:
+        raise ValueError("'strategy' must be 'grid' or 'random'")
+
+    # numpy scalars from the samplers are not JSON serializable
+    return [{k: (v.item() if isinstance(v, np.generic) else v) for k, v in c.items()} for c in candidates]
+
+
+def _score_fold(algorithm: str, params: Dict[str, Any], X: np.ndarray, y: np.ndarray, train_idx, test_idx) -> float:
+    """Fit one candidate on one fold and return its test R² (runs inside a pool worker)."""
+    try:
+        model = build_estimator(algorithm, params).fit(X[train_idx], y[train_idx])
+        return float(r2_score(y[test_idx], model.predict(X[test_idx])))
+    except Exception:
+        return float("nan")
+
+
+def run_search(data: Dict[str, Any], progress_callback: ProgressCallback | None = None) -> Dict[str, Any]:
+    """
+    Runs the cross-validated search and returns the score table.
+    - `algorithm`: any key of `estimators.ESTIMATOR_BUILDERS`
+    - `parameters`: fixed parameters shared by every candidate
+    - `strategy`/`search_space`/`n_iter`: grid or randomized candidates
+    - `folds`, `time_budget` (seconds), `prune_margin` (R² gap, 0 disables pruning)
+    """
+    X, y = prepare_xy(data)
+    algorithm = param_str(data, "algorithm", "").lower()
+    if algorithm not in ESTIMATOR_BUILDERS:
+        raise ValueError(f"Unknown algorithm '{algorithm}'. Supported: {sorted(ESTIMATOR_BUILDERS)}")
+    fixed = dict(data.get("parameters") or {})
+    candidates = [{**fixed, **c} for c in build_candidates(data)]
+    for params in candidates:
+        build_estimator(algorithm, params)
+
+    folds = param_int(data, "folds", 5)
+    if folds < 2 or len(y) < 2 * folds:
+        raise ValueError(f"Cannot run {folds}-fold cross-validation on {len(y)} samples")
+    time_budget = param_float(data, "time_budget", None)
+    prune_margin = param_float(data, "prune_margin", 0.1)
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=param_int(data, "random_state", 42)).split(X))
+
+    scores: List[List[float]] = [[] for _ in candidates]
+    status = ["running"] * len(candidates)
+    started = time.perf_counter()
+    timed_out = False
+    total_fits = len(candidates) * folds
+    done_fits = 0
+
+    with Parallel(n_jobs=min(len(candidates), max_workers()), backend="loky") as parallel:
+        for fold, (train_idx, test_idx) in enumerate(splits):
+            if time_budget is not None and time.perf_counter() - started > time_budget:
+                timed_out = True
+                break
+            alive = [i for i, s in enumerate(status) if s == "running"]
+            results = parallel(
+                delayed(_score_fold)(algorithm, candidates[i], X, y, train_idx, test_idx) for i in alive
+            )
+            for i, score in zip(alive, results):
+                scores[i].append(score)
+                if not np.isfinite(score):
+                    status[i] = "failed"
+            done_fits += len(alive)
+
+            # Prune candidates whose running mean trails the leader by more than the margin
+            means = {i: float(np.mean(scores[i])) for i in alive if status[i] == "running"}
+            if means and prune_margin and fold + 1 < folds:
+                best = max(means.values())
+                for i, mean in means.items():
+                    if mean < best - prune_margin:
+                        status[i] = "pruned"
+                        done_fits += folds - fold - 1
+
+            if progress_callback is not None:
+                progress_callback({
+                    "completed_fits": done_fits,
+                    "total_fits": total_fits,
+                    "fraction": done_fits / float(total_fits),
+                    "folds_completed": fold + 1,
+                    "best_score": finite_or_none(max(means.values())) if means else None,
+                    "elapsed": time.perf_counter() - started,
+                })
+
+    table = []
+    for params, fold_scores, state in zip(candidates, scores, status):
+        table.append({
+            "parameters": params,
+            "mean_score": finite_or_none(np.mean(fold_scores)) if fold_scores else None,
+            "std_score": finite_or_none(np.std(fold_scores)) if fold_scores else None,
+            "folds_scored": len(fold_scores),
+            "status": "completed" if state == "running" else state,
+        })
+    # Only candidates that survived every completed round compete for best
+    ranked = sorted(
+        (row for row in table if row["status"] == "completed" and row["mean_score"] is not None),
+        key=lambda row: -row["mean_score"],
+    )
+    for rank, row in enumerate(ranked, start=1):
+        row["rank"] = rank
+
+    return {
+        "algorithm": algorithm,
+        "strategy": param_str(data, "strategy", "grid").lower(),
+        "scoring": "r2",
+        "folds": folds,
+        "n_candidates": len(candidates),
+        "timed_out": timed_out,
+        "elapsed": time.perf_counter() - started,
+        "best_parameters": ranked[0]["parameters"] if ranked else None,
+        "best_score": ranked[0]["mean_score"] if ranked else None,
+        "results": table,
+    }
+
+
+def is_large_search(data: Dict[str, Any]) -> bool:
+    """Whether the search should run as a background Celery task instead of inline."""
+    if param_bool(data, "async", False):
+        return True
+    try:
+        n_candidates = len(build_candidates(data))
+    except ValueError:
+        return False
+    n_samples = len(data.get("y") or [])
+    cost = n_candidates * param_int(data, "folds", 5) * n_samples
+    return cost > int(getattr(settings, "REGRESSOR_SEARCH_SYNC_LIMIT", 2_000_000))
+
+
+def hyperparameter_search(data: Dict[str, Any], progress_callback: ProgressCallback | None = None) -> Dict[str, Any]:
+    """
+    Searches hyperparameters and returns the best model's standard response.
+    - The best candidate is refitted on all data through the matching service
+    - The full score table is attached under `search`
+    """
+    from .services import REGRESSION_SERVICES
+
+    search = run_search(data, progress_callback=progress_callback)
+    if search["best_parameters"] is None:
+        raise ValueError("No candidate completed successfully")
+    response = REGRESSION_SERVICES[search["algorithm"]]({
+        "X": data.get("X"),
+        "y": data.get("y"),
+        "parameters": search["best_parameters"],
+    })
+    response["search"] = search
+    return response
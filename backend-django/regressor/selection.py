@@ -0,0 +1,213 @@
+"""Stepwise and best-subset feature selection for linear regression.
+
+Every candidate subset is scored from one cached Gram matrix instead of a
+refit. With centered data ``G = XᵀX``, ``c = Xᵀy`` and the total sum of
+squares ``tss``, a subset ``S`` explains ``c_Sᵀ G_SS⁻¹ c_S`` of it:
+
+- forward steps grow a Cholesky factor of ``G_SS`` one row at a time, so
+  scoring a candidate costs one triangular solve (a rank-one update);
+- backward steps keep ``G_SS⁻¹`` and drop a feature with a rank-one
+  Schur-complement downdate; removing ``j`` costs ``β_j² / (G_SS⁻¹)_jj``;
+- exhaustive best-subset search (small ``p`` only) solves each subset's
+  small system from the same Gram matrix.
+"""
+from __future__ import annotations
+
+import itertools
+import time
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+from django.conf import settings
+from scipy.linalg import solve_triangular
+
+from .compare import finite_or_none
+from .estimators import param_int, param_str, prepare_xy
+
+METHODS = ("forward", "backward", "best_subset")
+CRITERIA = ("aic", "bic", "adjusted_r2")
+
+# Pivots below this (relative to the feature's own variance) mean the feature is collinear
+_COLLINEAR_TOL = 1e-10
+
+
+class GramCache:
+    """Centered cross-products of a dataset, computed once and shared by every subset score."""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray):
+        self.n = X.shape[0]
+        self.p = X.shape[1]
+        self.X_mean = X.mean(axis=0)
+        self.y_mean = float(y.mean())
+        Xc = X - self.X_mean
+        yc = y - self.y_mean
+        self.gram = Xc.T @ Xc
+        self.xy = Xc.T @ yc
+        self.tss = float(yc @ yc)
+
+    def rss(self, subset: Sequence[int]) -> float:
+        if not subset:
+            return self.tss
+        idx = list(subset)
+        beta = np.linalg.lstsq(self.gram[np.ix_(idx, idx)], self.xy[idx], rcond=None)[0]
+        return max(self.tss - float(self.xy[idx] @ beta), 0.0)
+
+    def coefficients(self, subset: Sequence[int]) -> tuple[np.ndarray, float]:
+        idx = list(subset)
+        if not idx:
+            return np.zeros(0), self.y_mean
+        beta = np.linalg.lstsq(self.gram[np.ix_(idx, idx)], self.xy[idx], rcond=None)[0]
+        return beta, self.y_mean - float(self.X_mean[idx] @ beta)
+
+
+def _metrics(cache: GramCache, rss: float, k: int) -> Dict[str, Any]:
+    n = cache.n
+    r2 = 1 - rss / cache.tss if cache.tss > 0 else 0.0
+    # Gaussian log-likelihood up to a constant; k coefficients + intercept
+    log_term = n * np.log(max(rss / n, np.finfo(float).tiny))
+    adjusted = 1 - (1 - r2) * (n - 1) / (n - k - 1) if n - k - 1 > 0 else None
+    return {
+        "rss": finite_or_none(rss),
+        "r_squared": finite_or_none(r2),
+        "adjusted_r_squared": finite_or_none(adjusted) if adjusted is not None else None,
+        "aic": finite_or_none(log_term + 2 * (k + 1)),
+        "bic": finite_or_none(log_term + np.log(n) * (k + 1)),
+    }
+
+
+def forward_steps(cache: GramCache, max_features: int) -> List[Dict[str, Any]]:
+    """Add the feature with the largest RSS reduction at each step."""
+    G, c = cache.gram, cache.xy
+    selected: List[int] = []
+    L = np.zeros((0, 0))
+    z = np.zeros(0)  # L⁻¹ c_S, so the explained sum of squares is z·z
+    explained = 0.0
+    steps = []
+    remaining = set(range(cache.p))
+    while remaining and len(selected) < max_features:
+        best = None
+        for j in remaining:
+            # Candidate row of the grown Cholesky factor: [wᵀ, d]
+            w = solve_triangular(L, G[selected, j], lower=True) if selected else np.zeros(0)
+            d2 = G[j, j] - w @ w
+            if d2 <= _COLLINEAR_TOL * max(G[j, j], 1e-300):
+                continue
+            d = np.sqrt(d2)
+            z_new = (c[j] - w @ z) / d
+            if best is None or z_new ** 2 > best[0]:
+                best = (z_new ** 2, j, w, d, z_new)
+        if best is None:
+            break
+        gain, j, w, d, z_new = best
+        L = np.block([[L, np.zeros((len(selected), 1))], [w[None, :], np.array([[d]])]])
+        z = np.append(z, z_new)
+        explained += gain
+        selected.append(j)
+        remaining.discard(j)
+        steps.append({"added": j, "features": list(selected), **_metrics(cache, cache.tss - explained, len(selected))})
+    return steps
+
+
+def backward_steps(cache: GramCache, min_features: int) -> List[Dict[str, Any]]:
+    """Start from every (non-collinear) feature and drop the least useful one at each step."""
+    selected = [step["added"] for step in forward_steps(cache, cache.p)]
+    selected.sort()
+    H = np.linalg.inv(cache.gram[np.ix_(selected, selected)])
+    beta = H @ cache.xy[selected]
+    rss = max(cache.tss - float(cache.xy[selected] @ beta), 0.0)
+    steps = [{"removed": None, "features": list(selected), **_metrics(cache, rss, len(selected))}]
+    while len(selected) > min_features:
+        # Dropping position i raises the RSS by beta_i² / H_ii
+        increase = beta ** 2 / np.diag(H)
+        i = int(np.argmin(increase))
+        rss += float(increase[i])
+        removed = selected.pop(i)
+        # Rank-one downdate of the inverse (Schur complement) and of the coefficients
+        h = np.delete(H[:, i], i)
+        beta = np.delete(beta, i) - h * (beta[i] / H[i, i])
+        H = np.delete(np.delete(H, i, axis=0), i, axis=1) - np.outer(h, h) / H[i, i]
+        steps.append({"removed": removed, "features": list(selected), **_metrics(cache, rss, len(selected))})
+    return steps
+
+
+def best_subset_steps(cache: GramCache, max_features: int) -> List[Dict[str, Any]]:
+    """Exhaustively find the lowest-RSS subset of every size up to `max_features`."""
+    steps = []
+    for k in range(1, max_features + 1):
+        best_rss, best_subset = None, None
+        for subset in itertools.combinations(range(cache.p), k):
+            rss = cache.rss(subset)
+            if best_rss is None or rss < best_rss:
+                best_rss, best_subset = rss, subset
+        steps.append({"features": list(best_subset), **_metrics(cache, best_rss, k)})
+    return steps
+
+
+def select_features(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Scores feature subsets for linear regression from one cached Gram matrix.
+    - `method`: "forward" (default), "backward" or "best_subset" (small p only)
+    - `criterion`: "aic" (default), "bic" or "adjusted_r2" picks the best step
+    - `max_features`: largest subset considered (forward / best_subset)
+    - `feature_names`: optional labels used in the response
+    """
+    X, y = prepare_xy(data)
+    method = param_str(data, "method", "forward").lower()
+    criterion = param_str(data, "criterion", "aic").lower()
+    if method not in METHODS:
+        raise ValueError(f"'method' must be one of {METHODS}")
+    if criterion not in CRITERIA:
+        raise ValueError(f"'criterion' must be one of {CRITERIA}")
+    p = X.shape[1]
+    names = [str(name) for name in (data.get("feature_names") or [f"x{i + 1}" for i in range(p)])]
+    if len(names) != p:
+        raise ValueError(f"Got {len(names)} feature names for {p} features")
+    max_features = min(param_int(data, "max_features", p), p)
+    if max_features < 1:
+        raise ValueError("'max_features' must be at least 1")
+
+    started = time.perf_counter()
+    cache = GramCache(X, y)
+    if method == "forward":
+        steps = forward_steps(cache, max_features)
+    elif method == "backward":
+        steps = backward_steps(cache, param_int(data, "min_features", 1))
+    else:
+        limit = int(getattr(settings, "REGRESSOR_BEST_SUBSET_MAX_FEATURES", 15))
+        if p > limit:
+            raise ValueError(f"Best-subset search is limited to {limit} features; use forward or backward")
+        steps = best_subset_steps(cache, max_features)
+
+    if not steps:
+        raise ValueError("No feature could be selected (constant or collinear inputs)")
+    for number, step in enumerate(steps, start=1):
+        step["step"] = number
+        step["feature_names"] = [names[j] for j in step["features"]]
+        for key in ("added", "removed"):
+            if step.get(key) is not None:
+                step[key] = names[step[key]]
+
+    def score(step):
+        value = step["adjusted_r_squared"] if criterion == "adjusted_r2" else step[criterion]
+        if value is None:
+            return np.inf
+        return -value if criterion == "adjusted_r2" else value
+
+    best = min(steps, key=score)
+    coefficients, intercept = cache.coefficients(best["features"])
+    return {
+        "method": method,
+        "criterion": criterion,
+        "n_samples": int(cache.n),
+        "n_features": int(p),
+        "steps": steps,
+        "best": {
+            "step": best["step"],
+            "features": best["feature_names"],
+            "coefficients": dict(zip(best["feature_names"], coefficients.tolist())),
+            "intercept": intercept,
+            "r_squared": best["r_squared"],
+            criterion: best["adjusted_r_squared"] if criterion == "adjusted_r2" else best[criterion],
+        },
+        "elapsed": time.perf_counter() - started,
+    }
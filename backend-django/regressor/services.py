@@ -1,34 +1,24 @@
-import base64
-import io
+import copy
+import functools
+
 import numpy as np
-import matplotlib.pyplot as plt
+from django.conf import settings
 from sklearn.linear_model import (
     LinearRegression, Ridge, Lasso, ElasticNet
 )
-from sklearn.svm import SVR
 from sklearn.tree import DecisionTreeRegressor
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.preprocessing import PolynomialFeatures
 from sklearn.pipeline import make_pipeline
 
+from .bootstrap import band_settings, confidence_band
+from .compare import max_workers
+from .estimators import build_estimator, param_int, param_max_samples, param_str
+from .model_store import load_model, save_model
+from .multitarget import fit_target_plot, prepare_targets, target_results
+from .neighbors import WEIGHTS, NeighborsModel, model_key, resolve_index
+# Figures are drawn by `plotting`, off the request thread when the render pool is enabled
+from .plotting import fit_plot
 
-import numpy as np
-import matplotlib.pyplot as plt
-import io
-import mpl_toolkits.mplot3d
-from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.svm import SVR
-from sklearn.tree import DecisionTreeRegressor
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from mpl_toolkits.mplot3d import Axes3D
-# Utility to convert plot to SVG
-def plot_to_svg(fig):
-    buf = io.StringIO()
-    fig.savefig(buf, format='svg')
-    svg_data = buf.getvalue()
-    buf.close()
-    return svg_data
 
 # Utility to format model information
 def model_summary(model, X, y):
@@ -36,7 +26,10 @@ def model_summary(model, X, y):
         r2_score = model.score(X, y)
         info = {
             "coefficients": model.coef_.tolist() if hasattr(model, 'coef_') else None,
-            "intercept": model.intercept_ if hasattr(model, 'intercept_') else None,
+            "intercept": (
+                (model.intercept_.item() if np.ndim(model.intercept_) == 0 else model.intercept_.tolist())
+                if hasattr(model, 'intercept_') else None
+            ),
             "r_squared": r2_score
         }
     except:
@@ -48,39 +41,19 @@ def model_summary(model, X, y):
     return info
 
 
-def create_plot_and_predict(model, X, y):
-    X = np.array(X).reshape(-1, 1)
-    X = np.array(X)
-    y = np.array(y)
-    #predict = np.array(predict).reshape(-1, 1)
-    fig, ax = plt.subplots()
-    ax.scatter(X, y, color="blue", label="Data")
-
-    model.fit(X, y)
-    #prediction = model.predict(predict).tolist()
-
-    x_range = np.linspace(X.min(), X.max(), 300).reshape(-1, 1)
-    ax.plot(x_range, model.predict(x_range), color="red", label="Regression")
-    #ax.scatter(predict, prediction, color="green", label="Prediction")
-    ax.legend()
-    ax.grid(True)
-
-    svg_image = plot_to_svg(fig)
-    plt.close(fig)
-    return {"svg_plot": svg_image}
-
-
 def linear_regression(data):
     """
     Performs simple linear regression on given data.
     - Supports a single feature (1D input)
     - Fits a LinearRegression model
+    - Accepts several targets (2D or named `y`), solved in one least-squares call
     - Returns SVG plot showing data points and fitted line
     """
 
     # Extract data
     X = np.array(data.get("X"))
-    y = np.array(data.get("y"))
+    y, target_names = prepare_targets(data)
+    params = data.get("parameters") or {}
 
     # Ensure X is 2D
     if X.ndim == 1:
@@ -89,50 +62,18 @@ def linear_regression(data):
     # Fit linear regression model
     model = LinearRegression().fit(X, y)
 
-    # Prepare plot
-    fig, ax = plt.subplots()
-    if X.shape[1] == 1:
-        # Univariate case: simple line plot
-        x_range = np.linspace(X.min(), X.max(), 200).reshape(-1, 1)
-        y_pred = model.predict(x_range)
-        ax.scatter(X, y, color="blue", label="Data")
-        ax.plot(x_range, y_pred, color="red", label="Linear fit")
-        ax.set_xlabel("X")
-        ax.set_ylabel("y")
-        ax.legend()
-    elif X.shape[1] == 2:
-        # Bivariate case: surface plot
-        ax = fig.add_subplot(111, projection="3d")
-        ax.scatter(X[:, 0], X[:, 1], y, color="blue", label="Data")
-
-        # Create a grid for the surface
-        x_surf, y_surf = np.meshgrid(
-            np.linspace(X[:, 0].min(), X[:, 0].max(), 30),
-            np.linspace(X[:, 1].min(), X[:, 1].max(), 30)
-        )
-        X_grid = np.column_stack((x_surf.ravel(), y_surf.ravel()))
-        z_pred = model.predict(X_grid).reshape(x_surf.shape)
-
-        ax.plot_surface(x_surf, y_surf, z_pred, color="red", alpha=0.5)
-        ax.set_xlabel("X1")
-        ax.set_ylabel("X2")
-        ax.set_zlabel("y")
-    else:
-        # Higher-dimensional case: cannot plot
-        ax.text(0.5, 0.5, "Plot unavailable for >2 features", ha="center", va="center")
-        ax.axis("off")
-
-    # Convert plot to SVG
-    svg_image = plot_to_svg(fig)
-    plt.close(fig)
+    # Plot the fit; scatter data is decimated above the point budget
+    plot = fit_target_plot(model.predict, X, y, target_names, label="Linear fit", params=params)
 
     # Return model info
     return {
-        "svg_plot": svg_image,
+        **plot,
+        "model_id": save_model(model, "linear", X.shape[1]),
         "model_info": model_summary(model, X, y),
         "n_features": X.shape[1],
         "coefficients": model.coef_.tolist(),
         "intercept": model.intercept_.item() if np.ndim(model.intercept_) == 0 else model.intercept_.tolist(),
+        **target_results(model, X, y, target_names),
     }
 
 def polynomial_regression(data):
@@ -162,47 +103,15 @@ def polynomial_regression(data):
     # Fit model
     model = LinearRegression().fit(X_poly, y)
 
-    # Prepare plot
-    fig, ax = plt.subplots()
-    if X.shape[1] == 1:
-        # Univariate case: easy line plot
-        x_range = np.linspace(X.min(), X.max(), 200).reshape(-1, 1)
-        y_pred = model.predict(poly.transform(x_range))
-        ax.scatter(X, y, color='blue', label='Data')
-        ax.plot(x_range, y_pred, color='red', label='Polynomial fit')
-        ax.set_xlabel('X')
-        ax.set_ylabel('y')
-        ax.legend()
-    elif X.shape[1] == 2:
-        # Bivariate case: surface plot
-
-        ax = fig.add_subplot(111, projection='3d')
-        ax.scatter(X[:, 0], X[:, 1], y, color='blue', label='Data')
-
-        # Create a grid for the surface
-        x_surf, y_surf = np.meshgrid(
-            np.linspace(X[:, 0].min(), X[:, 0].max(), 30),
-            np.linspace(X[:, 1].min(), X[:, 1].max(), 30)
-        )
-        X_grid = np.column_stack((x_surf.ravel(), y_surf.ravel()))
-        z_pred = model.predict(poly.transform(X_grid)).reshape(x_surf.shape)
-
-        ax.plot_surface(x_surf, y_surf, z_pred, color='red', alpha=0.5)
-        ax.set_xlabel('X1')
-        ax.set_ylabel('X2')
-        ax.set_zlabel('y')
-    else:
-        # Higher-dimensional case: cannot plot
-        ax.text(0.5, 0.5, "Plot unavailable for >2 features", ha='center', va='center')
-        ax.axis('off')
-
-    # Convert plot to SVG
-    svg_image = plot_to_svg(fig)
-    plt.close(fig)
+    # Plot the fit; scatter data is decimated above the point budget
+    plot = fit_plot(
+        lambda grid: model.predict(poly.transform(grid)), X, y, label="Polynomial fit", params=params
+    )
 
     # Return model info
     return {
-        "svg_plot": svg_image,
+        **plot,
+        "model_id": save_model(make_pipeline(poly, model), "polynomial", X.shape[1]),
         "model_info": model_summary(model, X_poly, y),
         "n_features": X.shape[1],
         "degree": degree,
@@ -217,6 +126,7 @@ def ridge_regression(data):
     Supports:
     - Multiple features (X can be 1D or 2D)
     - Alpha regularization parameter (default = 0.1, light regularization)
+    - Several targets (2D or named `y`) sharing one factorization
     - Visualizes results for 1D or 2D data
 
     Returns:
@@ -224,7 +134,7 @@ def ridge_regression(data):
     """
     # Extract data
     X = np.array(data.get('X'))
-    y = np.array(data.get('y'))
+    y, target_names = prepare_targets(data)
     params = data.get("parameters", {})
     # Light regularization by default
     alpha = float(params.get('alpha', 0.1))  # zastanawiam się czy zostawiać default
@@ -236,56 +146,19 @@ def ridge_regression(data):
     # Fit Ridge regression model
     model = Ridge(alpha=alpha).fit(X, y)
 
-    # Plot setup
-    fig, ax = plt.subplots()
-
-    if X.shape[1] == 1:
-        # Univariate case: simple line plot
-        x_range = np.linspace(X.min(), X.max(), 200).reshape(-1, 1)
-        y_pred = model.predict(x_range)
-        ax.scatter(X, y, color='blue', label='Data')
-        ax.plot(x_range, y_pred, color='red', label=f'Ridge fit (alpha={alpha})')
-        ax.set_xlabel('X')
-        ax.set_ylabel('y')
-        ax.legend()
-
-    elif X.shape[1] == 2:
-        # Bivariate case: 3D surface plot
-        from mpl_toolkits.mplot3d import Axes3D
-        ax = fig.add_subplot(111, projection='3d')
-        ax.scatter(X[:, 0], X[:, 1], y, color='blue', label='Data')
-
-        # Create grid for surface
-        x_surf, y_surf = np.meshgrid(
-            np.linspace(X[:, 0].min(), X[:, 0].max(), 30),
-            np.linspace(X[:, 1].min(), X[:, 1].max(), 30)
-        )
-        X_grid = np.column_stack((x_surf.ravel(), y_surf.ravel()))
-        z_pred = model.predict(X_grid).reshape(x_surf.shape)
-
-        ax.plot_surface(x_surf, y_surf, z_pred, color='red', alpha=0.5)
-        ax.set_xlabel('X1')
-        ax.set_ylabel('X2')
-        ax.set_zlabel('y')
-
-    else:
-        # Higher-dimensional case: cannot plot
-        # Możemy to wymienić że wgl to już za dużo kolumn jak to ułatwi rzeczy
-        ax.text(0.5, 0.5, "Plot unavailable for >2 features", ha='center', va='center')
-        ax.axis('off')
-
-    # Convert plot to SVG
-    svg_image = plot_to_svg(fig)
-    plt.close(fig)
+    # Plot the fit; scatter data is decimated above the point budget
+    plot = fit_target_plot(model.predict, X, y, target_names, label=f"Ridge fit (alpha={alpha})", params=params)
 
     # Return results
     return {
-        "svg_plot": svg_image,
+        **plot,
+        "model_id": save_model(model, "ridge", X.shape[1]),
         "model_info": model_summary(model, X, y),
         "n_features": X.shape[1],
         "alpha": alpha,
         "coefficients": model.coef_.tolist(),
-        "intercept": model.intercept_.item() if np.ndim(model.intercept_) == 0 else model.intercept_.tolist()
+        "intercept": model.intercept_.item() if np.ndim(model.intercept_) == 0 else model.intercept_.tolist(),
+        **target_results(model, X, y, target_names)
     }
 
 def lasso_regression(data):
@@ -293,13 +166,14 @@ def lasso_regression(data):
     Performs Lasso (L1-regularized) regression on given data.
     - Supports multiple X features (2D input)
     - Fits sklearn's Lasso model with adjustable alpha
+    - Accepts several targets (2D or named `y`) with a shared Gram matrix
     - Returns SVG plot for 1D or 2D visualization
     """
 
     # Extract data and parameters
     X = np.array(data.get("X"))
-    y = np.array(data.get("y"))
-    params = data.get("params", {})
+    y, target_names = prepare_targets(data)
+    params = data.get("parameters") or data.get("params", {})
     alpha = float(params.get("alpha", 1.0)) # Regularization strength
 
     # Ensure X is 2D
@@ -307,53 +181,23 @@ def lasso_regression(data):
         X = X.reshape(-1, 1)
 
     # Fit Lasso model
-    model = Lasso(alpha=alpha).fit(X, y)
-
-    # Prepare plot
-    fig, ax = plt.subplots()
-    if X.shape[1] == 1:
-        # Univariate case: line plot
-        x_range = np.linspace(X.min(), X.max(), 200).reshape(-1, 1)
-        y_pred = model.predict(x_range)
-        ax.scatter(X, y, color="blue", label="Data")
-        ax.plot(x_range, y_pred, color="red", label="Lasso fit")
-        ax.set_xlabel("X")
-        ax.set_ylabel("y")
-        ax.legend()
-    elif X.shape[1] == 2:
-        # Bivariate case: 3D surface plot
-        ax = fig.add_subplot(111, projection="3d")
-        ax.scatter(X[:, 0], X[:, 1], y, color="blue", label="Data")
-
-        # Create a grid for the surface
-        x_surf, y_surf = np.meshgrid(
-            np.linspace(X[:, 0].min(), X[:, 0].max(), 30),
-            np.linspace(X[:, 1].min(), X[:, 1].max(), 30)
-        )
-        X_grid = np.column_stack((x_surf.ravel(), y_surf.ravel()))
-        z_pred = model.predict(X_grid).reshape(x_surf.shape)
-
-        ax.plot_surface(x_surf, y_surf, z_pred, color="red", alpha=0.5)
-        ax.set_xlabel("X1")
-        ax.set_ylabel("X2")
-        ax.set_zlabel("y")
-    else:
-        # Higher-dimensional case: cannot plot
-        ax.text(0.5, 0.5, "Plot unavailable for >2 features", ha="center", va="center")
-        ax.axis("off")
+    # With several targets the Gram matrix is computed once and shared by each target's solve
+    precompute = target_names is not None and X.shape[0] > X.shape[1]
+    model = Lasso(alpha=alpha, precompute=precompute).fit(X, y)
 
-    # Convert plot to SVG
-    svg_image = plot_to_svg(fig)
-    plt.close(fig)
+    # Plot the fit; scatter data is decimated above the point budget
+    plot = fit_target_plot(model.predict, X, y, target_names, label="Lasso fit", params=params)
 
     # Return model info
     return {
-        "svg_plot": svg_image,
+        **plot,
+        "model_id": save_model(model, "lasso", X.shape[1]),
         "model_info": model_summary(model, X, y),
         "n_features": X.shape[1],
         "alpha": alpha,
         "coefficients": model.coef_.tolist(),
         "intercept": model.intercept_.item() if np.ndim(model.intercept_) == 0 else model.intercept_.tolist(),
+        **target_results(model, X, y, target_names),
     }
 
 def elasticnet_regression(data):
@@ -367,7 +211,7 @@ def elasticnet_regression(data):
     # Extract data and parameters
     X = np.array(data.get("X"))
     y = np.array(data.get("y"))
-    params = data.get("params", {})
+    params = data.get("parameters") or data.get("params", {})
     alpha = float(params.get("alpha", 1.0)) # Overall regularization strength
     l1_ratio = float(params.get("l1_ratio", 0.5)) # Mix between L1 (Lasso) and L2 (Ridge)
 
@@ -378,46 +222,13 @@ def elasticnet_regression(data):
     # Fit ElasticNet model
     model = ElasticNet(alpha=alpha, l1_ratio=l1_ratio).fit(X, y)
 
-    # Prepare plot
-    fig, ax = plt.subplots()
-    if X.shape[1] == 1:
-        # Univariate case: line plot
-        x_range = np.linspace(X.min(), X.max(), 200).reshape(-1, 1)
-        y_pred = model.predict(x_range)
-        ax.scatter(X, y, color="blue", label="Data")
-        ax.plot(x_range, y_pred, color="red", label="ElasticNet fit")
-        ax.set_xlabel("X")
-        ax.set_ylabel("y")
-        ax.legend()
-    elif X.shape[1] == 2:
-        # Bivariate case: 3D surface plot
-        ax = fig.add_subplot(111, projection="3d")
-        ax.scatter(X[:, 0], X[:, 1], y, color="blue", label="Data")
-
-        # Create a grid for the surface
-        x_surf, y_surf = np.meshgrid(
-            np.linspace(X[:, 0].min(), X[:, 0].max(), 30),
-            np.linspace(X[:, 1].min(), X[:, 1].max(), 30)
-        )
-        X_grid = np.column_stack((x_surf.ravel(), y_surf.ravel()))
-        z_pred = model.predict(X_grid).reshape(x_surf.shape)
-
-        ax.plot_surface(x_surf, y_surf, z_pred, color="red", alpha=0.5)
-        ax.set_xlabel("X1")
-        ax.set_ylabel("X2")
-        ax.set_zlabel("y")
-    else:
-        # Higher-dimensional case: cannot plot
-        ax.text(0.5, 0.5, "Plot unavailable for >2 features", ha="center", va="center")
-        ax.axis("off")
-
-    # Convert plot to SVG
-    svg_image = plot_to_svg(fig)
-    plt.close(fig)
+    # Plot the fit; scatter data is decimated above the point budget
+    plot = fit_plot(model.predict, X, y, label="ElasticNet fit", params=params)
 
     # Return model info
     return {
-        "svg_plot": svg_image,
+        **plot,
+        "model_id": save_model(model, "elasticnet", X.shape[1]),
         "model_info": model_summary(model, X, y),
         "n_features": X.shape[1],
         "alpha": alpha,
@@ -434,10 +245,12 @@ def svr_regression(data):
     Supports:
     - Multiple X features (1D or 2D)
     - Custom kernel, C, epsilon parameters
+    - Kernel approximation (Nystroem / random Fourier features) above
+      `approximation_threshold` samples, or when `approximation` is set
     - Visualization for 1D or 2D data
 
     Returns:
-        dict with SVG plot, model info, and parameters.
+        dict with SVG plot, model info, parameters and the fitting mode used.
     """
 
     # Extract and prepare data
@@ -456,58 +269,27 @@ def svr_regression(data):
     #kernela na stałe może ale reszta by do dostosowania przez użytkownika
 
 
-    # Fit the SVR model
-    model = SVR(kernel=kernel, C=C, epsilon=epsilon).fit(X, y)
-
-    # Create plot
-    fig, ax = plt.subplots()
-
-    if X.shape[1] == 1:
-        # Univariate case
-        x_range = np.linspace(X.min(), X.max(), 300).reshape(-1, 1)
-        y_pred = model.predict(x_range)
-        ax.scatter(X, y, color='blue', label='Data')
-        ax.plot(x_range, y_pred, color='red', label=f'SVR fit (kernel={kernel})')
-        ax.set_xlabel('X')
-        ax.set_ylabel('y')
-        ax.legend()
-
-    elif X.shape[1] == 2:
-        # Bivariate case
-        fig.clf()
-        ax = fig.add_subplot(111, projection='3d')
-        ax.scatter(X[:, 0], X[:, 1], y, color='blue', label='Data')
-
-        # Create mesh grid for surface
-        x_surf, y_surf = np.meshgrid(
-            np.linspace(X[:, 0].min(), X[:, 0].max(), 40),
-            np.linspace(X[:, 1].min(), X[:, 1].max(), 40)
-        )
-        X_grid = np.column_stack((x_surf.ravel(), y_surf.ravel()))
-        z_pred = model.predict(X_grid).reshape(x_surf.shape)
+    # Fit the SVR model (exact below the size threshold, approximate above it)
+    model = build_estimator("svr", params).fit(X, y)
 
-        ax.plot_surface(x_surf, y_surf, z_pred, cmap='viridis', alpha=0.6)
-        ax.set_xlabel('X1')
-        ax.set_ylabel('X2')
-        ax.set_zlabel('y')
-
-    else:
-        # Higher-dimensional case
-        ax.text(0.5, 0.5, "Plot unavailable for >2 features", ha='center', va='center')
-        ax.axis('off')
-
-    # Convert to SVG
-    svg_image = plot_to_svg(fig)
-    plt.close(fig)
+    # Plot the fit; scatter data is decimated above the point budget
+    plot = fit_plot(
+        model.predict, X, y, label=f"SVR fit (kernel={kernel})", params=params,
+        grid_1d=300, grid_2d=40, surface_cmap="viridis", surface_alpha=0.6,
+    )
 
     # Return structured model info
     return {
-        "svg_plot": svg_image,
+        **plot,
+        "model_id": save_model(model, "svr", X.shape[1]),
         "model_info": model_summary(model, X, y),
         "n_features": X.shape[1],
         "kernel": kernel,
         "C": C,
-        "epsilon": epsilon
+        "epsilon": epsilon,
+        "mode": model.mode_,
+        "approximation_rank": model.approximation_rank_,
+        "solver": None if model.mode_ == "exact" else model.solver
     }
 
 def decision_tree_regression(data):
@@ -521,9 +303,9 @@ def decision_tree_regression(data):
     # Extract data and parameters
     X = np.array(data.get("X"))
     y = np.array(data.get("y"))
-    params = data.get("params", {})
-    max_depth = params.get("max_depth", None)
-    random_state = params.get("random_state", 42)
+    params = data.get("parameters") or data.get("params", {})
+    max_depth = param_int(params, "max_depth", None)
+    random_state = param_int(params, "random_state", 42)
 
     # Ensure X is 2D
     if X.ndim == 1:
@@ -533,46 +315,15 @@ def decision_tree_regression(data):
     model = DecisionTreeRegressor(max_depth=max_depth, random_state=random_state)
     model.fit(X, y)
 
-    # Prepare plot
-    fig, ax = plt.subplots()
-    if X.shape[1] == 1:
-        # Univariate case: line plot
-        x_range = np.linspace(X.min(), X.max(), 300).reshape(-1, 1)
-        y_pred = model.predict(x_range)
-        ax.scatter(X, y, color="blue", label="Data")
-        ax.plot(x_range, y_pred, color="red", label="Decision Tree fit")
-        ax.set_xlabel("X")
-        ax.set_ylabel("y")
-        ax.legend()
-    elif X.shape[1] == 2:
-        # Bivariate case: 3D surface plot
-        ax = fig.add_subplot(111, projection="3d")
-        ax.scatter(X[:, 0], X[:, 1], y, color="blue", label="Data")
-
-        # Create a grid for the surface
-        x_surf, y_surf = np.meshgrid(
-            np.linspace(X[:, 0].min(), X[:, 0].max(), 50),
-            np.linspace(X[:, 1].min(), X[:, 1].max(), 50)
-        )
-        X_grid = np.column_stack((x_surf.ravel(), y_surf.ravel()))
-        z_pred = model.predict(X_grid).reshape(x_surf.shape)
-
-        ax.plot_surface(x_surf, y_surf, z_pred, color="red", alpha=0.5)
-        ax.set_xlabel("X1")
-        ax.set_ylabel("X2")
-        ax.set_zlabel("y")
-    else:
-        # Higher-dimensional case: cannot plot
-        ax.text(0.5, 0.5, "Plot unavailable for >2 features", ha="center", va="center")
-        ax.axis("off")
-
-    # Convert plot to SVG
-    svg_image = plot_to_svg(fig)
-    plt.close(fig)
+    # Plot the fit; scatter data is decimated above the point budget
+    plot = fit_plot(
+        model.predict, X, y, label="Decision Tree fit", params=params, grid_1d=300, grid_2d=50
+    )
 
     # Return model info
     return {
-        "svg_plot": svg_image,
+        **plot,
+        "model_id": save_model(model, "decision-tree", X.shape[1]),
         "model_info": model_summary(model, X, y),
         "n_features": X.shape[1],
         "max_depth": model.get_depth(),
@@ -588,6 +339,10 @@ def random_forest_regression(data):
     Supports:
     - Multiple input features (1D or 2D visualization)
     - Configurable hyperparameters (n_estimators, max_depth, random_state)
+    - Parallel tree building (n_jobs, capped by REGRESSOR_RF_MAX_JOBS)
+    - Bootstrap row sub-sampling (max_samples: fraction or row count)
+    - Adding trees to a stored forest (warm_start_from=<model_id>; n_estimators
+      is then the number of trees to add)
     - Feature importance output
     - Automatic visualization for 1D/2D data
 
@@ -595,74 +350,218 @@ def random_forest_regression(data):
         dict with SVG plot, model info, and feature importances.
     """
 
-    # Extract data
-    X = np.array(data.get('X'))
-    y = np.array(data.get('y'))
+    # Extract data; trees split on float32 internally, so convert once up front
+    X = np.asarray(data.get('X'), dtype=np.float32)
+    y = np.asarray(data.get('y'), dtype=np.float64)
     params = data.get("parameters", {})
     n_estimators = int(params.get('n_estimators', 200))  # number of trees
-    max_depth = int(params.get('max_depth'))                  # limit depth or None
+    max_depth = param_int(params, 'max_depth', None)          # limit depth or None
     random_state = int(params.get('random_state', 42))   # reproducibility
     # Ensure X is 2D
     if X.ndim == 1:
         X = X.reshape(-1, 1)
 
-    # Fit model
-    model = RandomForestRegressor(
-        n_estimators=n_estimators,
-        max_depth=max_depth,
-        random_state=random_state
-    ).fit(X, y)
-
-    # Plot setup
-    fig, ax = plt.subplots()
-
-    if X.shape[1] == 1:
-        # Univariate case: line plot
-        x_range = np.linspace(X.min(), X.max(), 300).reshape(-1, 1)
-        y_pred = model.predict(x_range)
-        ax.scatter(X, y, color='blue', label='Data')
-        ax.plot(x_range, y_pred, color='red', label='Random Forest fit')
-        ax.set_xlabel('X')
-        ax.set_ylabel('y')
-        ax.legend()
-
-    elif X.shape[1] == 2:
-        # Bivariate case: 3D surface
-        fig.clf()
-        ax = fig.add_subplot(111, projection='3d')
-        ax.scatter(X[:, 0], X[:, 1], y, color='blue', label='Data')
-
-        # Create grid for predictions
-        x_surf, y_surf = np.meshgrid(
-            np.linspace(X[:, 0].min(), X[:, 0].max(), 40),
-            np.linspace(X[:, 1].min(), X[:, 1].max(), 40)
+    # Build trees on several cores, never more than the configured cap
+    max_jobs = int(getattr(settings, "REGRESSOR_RF_MAX_JOBS", None) or max_workers())
+    n_jobs = param_int(params, "n_jobs", max_jobs)
+    n_jobs = max_jobs if n_jobs is None or n_jobs < 1 else min(n_jobs, max_jobs)
+
+    warm_start_from = param_str(params, "warm_start_from", "")
+    if warm_start_from:
+        # Grow a copy so the stored forest (and its cached instance) stay untouched
+        base, metadata = load_model(warm_start_from)
+        if metadata["algorithm"] != "random-forest" or metadata["n_features"] != X.shape[1]:
+            raise ValueError(
+                f"Model '{warm_start_from}' is not a random forest over {X.shape[1]} features"
+            )
+        model = copy.deepcopy(base)
+        model.set_params(
+            warm_start=True,
+            n_estimators=len(model.estimators_) + n_estimators,
+            n_jobs=n_jobs,
         )
-        X_grid = np.column_stack((x_surf.ravel(), y_surf.ravel()))
-        z_pred = model.predict(X_grid).reshape(x_surf.shape)
-
-        ax.plot_surface(x_surf, y_surf, z_pred, cmap='viridis', alpha=0.7)
-        ax.set_xlabel('X1')
-        ax.set_ylabel('X2')
-        ax.set_zlabel('y')
-
+        if param_str(params, "max_samples", ""):
+            model.set_params(max_samples=param_max_samples(params))
     else:
-        # Higher-dimensional case: no visualization
-        ax.text(0.5, 0.5, "Plot unavailable for >2 features", ha='center', va='center')
-        ax.axis('off')
+        model = build_estimator("random-forest", params).set_params(n_jobs=n_jobs)
+
+    # Fit model (with warm_start only the new trees are built)
+    trees_before = len(getattr(model, "estimators_", []))
+    model.fit(X, y)
 
-    # Convert to SVG
-    svg_image = plot_to_svg(fig)
-    plt.close(fig)
+    # Plot the fit; scatter data is decimated above the point budget
+    plot = fit_plot(
+        model.predict, X, y, label="Random Forest fit", params=params,
+        grid_1d=300, grid_2d=40, surface_cmap="viridis", surface_alpha=0.7,
+    )
 
     # Return detailed output
     return {
-        "svg_plot": svg_image,
+        **plot,
+        "model_id": save_model(model, "random-forest", X.shape[1]),
         "model_info": model_summary(model, X, y),
         "n_features": X.shape[1],
-        "n_estimators": n_estimators,
+        "n_estimators": len(model.estimators_),
+        "trees_added": len(model.estimators_) - trees_before,
+        "warm_start_from": warm_start_from or None,
         "max_depth": max_depth,
+        "max_samples": model.max_samples,
+        "n_jobs": n_jobs,
         "feature_importances": model.feature_importances_.tolist(),
         "random_state": random_state
     }
 
-def gradient_boosting_regression(data): return create_plot_and_predict(GradientBoostingRegressor(), **data)
+def gradient_boosting_regression(data):
+    """
+    Performs Gradient Boosting Regression on given data.
+
+    Supports:
+    - Histogram-based, multithreaded boosting (HistGradientBoostingRegressor)
+    - Configurable max_iter, learning_rate, max_leaf_nodes, max_depth
+    - Early stopping on a held-out validation fraction
+    - Automatic visualization for 1D/2D data
+
+    Returns:
+        dict with SVG plot, model info, and boosting diagnostics.
+    """
+
+    # Extract data
+    X = np.array(data.get('X'), dtype=np.float64)
+    y = np.array(data.get('y'), dtype=np.float64)
+    params = data.get("parameters", {})
+    # Ensure X is 2D
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+
+    # Fit model; features are binned once, so cost grows ~linearly with rows
+    model = build_estimator("gradient-boosting", params).fit(X, y)
+
+    # Plot the fit; scatter data is decimated above the point budget
+    plot = fit_plot(
+        model.predict, X, y, label="Gradient Boosting fit", params=params,
+        grid_1d=300, grid_2d=40, surface_cmap="viridis", surface_alpha=0.7,
+    )
+
+    # Validation scores exist only when early stopping held out data
+    validation_score = None
+    if model.do_early_stopping_ and len(model.validation_score_):
+        validation_score = float(model.validation_score_[-1])
+
+    # Return detailed output
+    return {
+        **plot,
+        "model_id": save_model(model, "gradient-boosting", X.shape[1]),
+        "model_info": model_summary(model, X, y),
+        "n_features": X.shape[1],
+        "max_iter": model.max_iter,
+        "n_iter": int(model.n_iter_),
+        "learning_rate": model.learning_rate,
+        "max_leaf_nodes": model.max_leaf_nodes,
+        "max_depth": model.max_depth,
+        "early_stopping": bool(model.do_early_stopping_),
+        "validation_fraction": model.validation_fraction if model.do_early_stopping_ else None,
+        "validation_score": validation_score,
+        "random_state": model.random_state
+    }
+
+
+def knn_regression(data):
+    """
+    Performs k-nearest-neighbour regression on given data.
+
+    Supports:
+    - Multiple input features (1D or 2D visualization)
+    - KD-tree / ball tree index built once per dataset and cached; changing
+      n_neighbors or weights reuses it (send `index_id` instead of X/y)
+    - Batched tree queries for the plot grid and for `predict_X`
+
+    Returns:
+        dict with SVG plot, model info, index id and optional predictions.
+    """
+
+    # Extract parameters
+    params = data.get("parameters") or {}
+    n_neighbors = param_int(params, 'n_neighbors', 5)     # neighbours averaged per prediction
+    weights = param_str(params, 'weights', 'uniform').lower()  # 'uniform' or 'distance'
+    if n_neighbors < 1:
+        raise ValueError("'n_neighbors' must be at least 1")
+    if weights not in WEIGHTS:
+        raise ValueError(f"'weights' must be one of {WEIGHTS}")
+
+    # Build the spatial index, or reuse the cached one for this dataset
+    index_id, index, reused = resolve_index(data, params)
+    X, y = index.X, index.y
+    model = NeighborsModel(index=index, n_neighbors=n_neighbors, weights=weights)
+
+    # Plot the fit; scatter data is decimated above the point budget
+    plot = fit_plot(
+        model.predict, X, y, label=f"k-NN fit (k={n_neighbors})", params=params, grid_1d=300, grid_2d=40,
+        surface_cmap="viridis", surface_alpha=0.7,
+    )
+
+    # Optional batch of new points scored against the same index
+    predictions = None
+    if data.get("predict_X") is not None:
+        predict_X = np.asarray(data.get("predict_X"), dtype=np.float64)
+        if predict_X.ndim == 1:
+            predict_X = predict_X.reshape(-1, 1) if X.shape[1] == 1 else predict_X.reshape(1, -1)
+        if predict_X.shape[1] != X.shape[1]:
+            raise ValueError(f"'predict_X' must have {X.shape[1]} features per row")
+        predictions = model.predict(predict_X).tolist()
+
+    # Return model info
+    return {
+        **plot,
+        # Written once per index and query settings; repeat queries return the stored id
+        "model_id": save_model(model, "knn", X.shape[1], model_id=model_key(index_id, n_neighbors, weights)),
+        "model_info": model_summary(model, X, y),
+        "n_features": X.shape[1],
+        "n_neighbors": min(n_neighbors, index.n_samples),
+        "weights": weights,
+        "algorithm": index.algorithm,
+        "leaf_size": index.leaf_size,
+        "index_id": index_id,
+        "index_reused": reused,
+        "predictions": predictions,
+    }
+
+
+def with_confidence_band(algorithm, service):
+    """
+    Adds `confidence_band` to a service response when `bootstrap_resamples` is set.
+    Invalid band options fail before the fit; a band that cannot be built (e.g. a
+    k-NN request by `index_id` has no X/y to resample) is reported as
+    `confidence_band_error` next to the fit instead.
+    """
+    @functools.wraps(service)
+    def wrapper(data):
+        requested = band_settings(data) is not None
+        response = service(data)
+        if requested:
+            try:
+                band = confidence_band(algorithm, data)
+            except ValueError as exc:
+                response["confidence_band_error"] = str(exc)
+            else:
+                if band is not None:
+                    response["confidence_band"] = band
+        return response
+    return wrapper
+
+
+# Single-model service per algorithm, keyed like `estimators.ESTIMATOR_BUILDERS`
+REGRESSION_SERVICES = {
+    algorithm: with_confidence_band(algorithm, service)
+    for algorithm, service in {
+        "linear": linear_regression,
+        "polynomial": polynomial_regression,
+        "ridge": ridge_regression,
+        "lasso": lasso_regression,
+        "elasticnet": elasticnet_regression,
+        "svr": svr_regression,
+        "decision-tree": decision_tree_regression,
+        "random-forest": random_forest_regression,
+        "gradient-boosting": gradient_boosting_regression,
+        "knn": knn_regression,
+    }.items()
+}
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from celery import shared_task
+
+from config.runtime_limits import limit_threads
+
+from regressor.search import hyperparameter_search
+from regressor.services import REGRESSION_SERVICES
+
+
+@shared_task(bind=True, name="regressor.run_hyperparameter_search")
+def run_hyperparameter_search_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Celery task entry point for large hyperparameter searches."""
+
+    def _report(progress: Dict[str, Any]) -> None:
+        # Exposed through the job status endpoint while the task runs
+        if not self.request.called_directly:
+            self.update_state(state="PROGRESS", meta=progress)
+
+    with limit_threads("regressor.search"):
+        return hyperparameter_search(data, progress_callback=_report)
+
+
+@shared_task(name="regressor.run_regression")
+def run_regression_task(algorithm: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Celery task entry point for single-model fits queued by the regressor endpoints."""
+    with limit_threads(f"regressor.{algorithm}"):
+        return REGRESSION_SERVICES[algorithm](data)
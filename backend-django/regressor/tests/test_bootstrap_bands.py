@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from network.testing import TempStorageMixin
+from regressor.bootstrap import confidence_band
+from regressor.services import REGRESSION_SERVICES
+
+
+def _noisy_line(n=150, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 10, size=n)
+    y = 1.5 * X + rng.normal(scale=1.0, size=n)
+    return X.tolist(), y.tolist()
+
+
+@override_settings(REGRESSOR_MAX_WORKERS=2)
+class BootstrapBandTests(TempStorageMixin, SimpleTestCase):
+    def test_band_brackets_the_fit(self):
+        X, y = _noisy_line()
+        result = REGRESSION_SERVICES["linear"]({"X": X, "y": y, "parameters": {"bootstrap_resamples": "40"}})
+        band = result["confidence_band"]
+        self.assertEqual(band["n_resamples"], 40)
+        self.assertFalse(band["timed_out"])
+        lower, upper = np.array(band["lower"]), np.array(band["upper"])
+        self.assertEqual(len(lower), 200)
+        self.assertTrue(np.all(lower < upper))
+        fit = 1.5 * np.array(band["x"])
+        self.assertGreater(np.mean((lower < fit) & (fit < upper)), 0.8)
+
+    def test_surface_band_and_not_requested(self):
+        rng = np.random.default_rng(1)
+        X = rng.uniform(size=(80, 2))
+        y = X.sum(axis=1) + rng.normal(scale=0.1, size=80)
+        band = confidence_band("ridge", {"X": X.tolist(), "y": y.tolist(), "parameters": {"bootstrap_resamples": 10}})
+        self.assertEqual(np.array(band["upper"]).shape, (30, 30))
+        self.assertIsNone(confidence_band("ridge", {"X": X.tolist(), "y": y.tolist()}))
+
+    def test_time_limit_caps_resamples(self):
+        X, y = _noisy_line(n=2000)
+        band = confidence_band("random-forest", {
+            "X": X, "y": y,
+            "parameters": {"bootstrap_resamples": 500, "bootstrap_time_limit": 1, "n_estimators": 50},
+        })
+        self.assertTrue(band["timed_out"])
+        self.assertLess(band["n_resamples"], 500)
+        self.assertLess(band["elapsed"], 10)
+
+    def test_band_errors_do_not_discard_the_fit(self):
+        X, y = _noisy_line()
+        with self.assertRaises(ValueError):
+            REGRESSION_SERVICES["linear"]({"X": X, "y": y, "parameters": {"bootstrap_resamples": "1"}})
+        # Rejected before fitting: no model was stored
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, "regressors")))
+
+        first = REGRESSION_SERVICES["knn"]({"X": X, "y": y})
+        result = REGRESSION_SERVICES["knn"]({"index_id": first["index_id"], "parameters": {"bootstrap_resamples": "10"}})
+        self.assertIn("predictions", result)
+        self.assertNotIn("confidence_band", result)
+        self.assertIn("X", result["confidence_band_error"])
@@ -0,0 +1,57 @@
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APISimpleTestCase
+
+from regressor.compare import compare_models
+
+
+def _linear_data(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(-3, 3, size=n)
+    y = 2.0 * X + 1.0 + rng.normal(scale=0.1, size=n)
+    return X.tolist(), y.tolist()
+
+
+@override_settings(REGRESSOR_MAX_WORKERS=2)
+class CompareModelsTests(SimpleTestCase):
+    def test_ranks_models_by_test_r2(self):
+        X, y = _linear_data()
+        result = compare_models({
+            "X": X,
+            "y": y,
+            "models": [
+                {"algorithm": "decision-tree", "parameters": {"max_depth": "1"}},
+                {"algorithm": "linear"},
+            ],
+        })
+        ranking = result["ranking"]
+        self.assertEqual([row["label"] for row in ranking], ["linear", "decision-tree"])
+        self.assertEqual(ranking[0]["rank"], 1)
+        self.assertGreater(ranking[0]["r2"], 0.99)
+        self.assertEqual(len(result["curves"]["linear"]["x"]), 200)
+
+    def test_cv_evaluation_and_duplicate_labels(self):
+        X, y = _linear_data()
+        result = compare_models({
+            "X": X,
+            "y": y,
+            "models": [{"algorithm": "ridge", "parameters": {"alpha": 0.1}}, {"algorithm": "ridge", "parameters": {"alpha": 10}}],
+            "evaluation": {"method": "cv", "folds": 3},
+        })
+        self.assertEqual(result["evaluation"], {"method": "cv", "n_splits": 3})
+        self.assertEqual(sorted(result["curves"]), ["ridge", "ridge #2"])
+        self.assertIsNotNone(result["ranking"][0]["r2_std"])
+
+    def test_rejects_unknown_algorithm(self):
+        X, y = _linear_data()
+        with self.assertRaisesMessage(ValueError, "Unknown algorithm"):
+            compare_models({"X": X, "y": y, "models": [{"algorithm": "magic"}]})
+
+
+@override_settings(REGRESSOR_MAX_WORKERS=1)
+class CompareEndpointTests(APISimpleTestCase):
+    def test_invalid_payload_returns_400(self):
+        resp = self.client.post(reverse("compare_regression"), {"X": [1, 2, 3], "y": [1, 2, 3], "models": []}, format="json")
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("models", resp.data["detail"])
@@ -0,0 +1,60 @@
+import itertools
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+from sklearn.linear_model import LinearRegression
+
+from regressor.selection import GramCache, select_features
+
+
+def _data(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 6))
+    y = 4 * X[:, 1] - 2 * X[:, 4] + 0.5 * X[:, 0] + rng.normal(scale=0.5, size=n)
+    return X, y
+
+
+def _rss(X, y, subset):
+    model = LinearRegression().fit(X[:, subset], y)
+    return float(np.sum((y - model.predict(X[:, subset])) ** 2))
+
+
+class FeatureSelectionTests(SimpleTestCase):
+    def test_forward_steps_match_refits(self):
+        X, y = _data()
+        result = select_features({"X": X.tolist(), "y": y.tolist(), "method": "forward"})
+        self.assertEqual([s["added"] for s in result["steps"][:3]], ["x2", "x5", "x1"])
+        for step in result["steps"]:
+            self.assertAlmostEqual(step["rss"], _rss(X, y, step["features"]), places=6)
+        self.assertTrue({"x1", "x2", "x5"} <= set(result["best"]["features"]))
+        self.assertAlmostEqual(result["best"]["coefficients"]["x2"], 4, delta=0.2)
+
+    def test_backward_downdates_match_refits(self):
+        X, y = _data()
+        result = select_features({"X": X.tolist(), "y": y.tolist(), "method": "backward", "criterion": "bic"})
+        self.assertEqual(len(result["steps"][0]["features"]), 6)
+        self.assertEqual(len(result["steps"][-1]["features"]), 1)
+        for step in result["steps"]:
+            self.assertAlmostEqual(step["rss"], _rss(X, y, step["features"]), places=6)
+
+    def test_best_subset_is_exhaustive(self):
+        X, y = _data(seed=3)
+        result = select_features({"X": X.tolist(), "y": y.tolist(), "method": "best_subset", "max_features": 3})
+        cache = GramCache(X, y)
+        for step in result["steps"]:
+            k = len(step["features"])
+            best = min(cache.rss(s) for s in itertools.combinations(range(6), k))
+            self.assertAlmostEqual(step["rss"], best, places=6)
+
+    def test_collinear_feature_is_skipped(self):
+        X, y = _data()
+        X = np.column_stack([X, 2 * X[:, 1]])
+        result = select_features({"X": X.tolist(), "y": y.tolist()})
+        self.assertEqual(len(result["steps"]), 6)
+        self.assertNotIn("x7", result["steps"][-1]["feature_names"])
+
+    @override_settings(REGRESSOR_BEST_SUBSET_MAX_FEATURES=4)
+    def test_best_subset_limit(self):
+        X, y = _data()
+        with self.assertRaises(ValueError):
+            select_features({"X": X.tolist(), "y": y.tolist(), "method": "best_subset"})
@@ -0,0 +1,69 @@
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from network.testing import TempStorageMixin
+from regressor.search import build_candidates, hyperparameter_search, is_large_search, run_search
+
+
+def _step_data(n=80, seed=1):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 10, size=n)
+    y = np.where(X > 5, 3.0, -3.0) + np.sin(X) + rng.normal(scale=0.05, size=n)
+    return X.tolist(), y.tolist()
+
+
+@override_settings(REGRESSOR_MAX_WORKERS=2)
+class HyperparameterSearchTests(TempStorageMixin, SimpleTestCase):
+    def test_grid_search_returns_standard_response_and_table(self):
+        X, y = _step_data()
+        progress = []
+        result = hyperparameter_search(
+            {
+                "X": X,
+                "y": y,
+                "algorithm": "decision-tree",
+                "search_space": {"max_depth": [1, 4, None]},
+                "folds": 3,
+                "prune_margin": 0,
+            },
+            progress_callback=progress.append,
+        )
+        self.assertIn("svg_plot", result)
+        search = result["search"]
+        self.assertEqual(search["n_candidates"], 3)
+        self.assertEqual(len(search["results"]), 3)
+        self.assertNotEqual(search["best_parameters"]["max_depth"], 1)
+        self.assertEqual(len(progress), 3)
+        self.assertEqual(progress[-1]["fraction"], 1.0)
+
+    def test_prunes_clearly_worse_candidates(self):
+        X, y = _step_data()
+        search = run_search({
+            "X": X,
+            "y": y,
+            "algorithm": "ridge",
+            "search_space": {"alpha": [0.01, 1e6]},
+            "folds": 4,
+            "prune_margin": 0.2,
+        })
+        statuses = {row["parameters"]["alpha"]: row["status"] for row in search["results"]}
+        self.assertEqual(statuses[1e6], "pruned")
+        self.assertEqual(statuses[0.01], "completed")
+        self.assertEqual(search["best_parameters"]["alpha"], 0.01)
+
+    def test_random_search_samples_ranges(self):
+        candidates = build_candidates({
+            "strategy": "random",
+            "n_iter": 5,
+            "search_space": {"C": {"low": 0.1, "high": 100, "log": True}, "kernel": ["rbf", "linear"]},
+        })
+        self.assertEqual(len(candidates), 5)
+        for c in candidates:
+            self.assertTrue(0.1 <= c["C"] <= 100)
+            self.assertIsInstance(c["C"], float)
+
+    @override_settings(REGRESSOR_SEARCH_SYNC_LIMIT=100)
+    def test_large_searches_are_queued(self):
+        X, y = _step_data()
+        self.assertTrue(is_large_search({"X": X, "y": y, "search_space": {"alpha": [1, 2]}}))
+        self.assertTrue(is_large_search({"async": True, "search_space": {}}))
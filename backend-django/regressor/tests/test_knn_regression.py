@@ -0,0 +1,65 @@
+from unittest import mock
+
+import numpy as np
+from django.urls import reverse
+from rest_framework.test import APISimpleTestCase
+from sklearn.neighbors import KNeighborsRegressor
+
+from network.testing import TempStorageMixin
+from regressor import model_store, neighbors
+from regressor.services import knn_regression
+
+
+class KNNRegressionTests(TempStorageMixin, APISimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        neighbors._cache.clear()
+        rng = np.random.default_rng(0)
+        self.X = rng.uniform(0, 1, size=(300, 2))
+        self.y = np.sin(4 * self.X[:, 0]) + self.X[:, 1]
+
+    def test_matches_sklearn_for_both_weightings(self):
+        queries = np.random.default_rng(1).uniform(0, 1, size=(50, 2))
+        for weights in ("uniform", "distance"):
+            result = knn_regression({
+                "X": self.X.tolist(),
+                "y": self.y.tolist(),
+                "predict_X": queries.tolist(),
+                "parameters": {"n_neighbors": "7", "weights": weights},
+            })
+            expected = KNeighborsRegressor(n_neighbors=7, weights=weights).fit(self.X, self.y).predict(queries)
+            np.testing.assert_allclose(result["predictions"], expected)
+            self.assertEqual(result["algorithm"], "kd_tree")
+
+    def test_index_is_reused_across_k_and_weights(self):
+        data = {"X": self.X.tolist(), "y": self.y.tolist()}
+        first = knn_regression({**data, "parameters": {"n_neighbors": "3"}})
+        self.assertFalse(first["index_reused"])
+
+        with mock.patch.object(neighbors, "KDTree", side_effect=AssertionError("tree rebuilt")):
+            again = knn_regression({**data, "parameters": {"n_neighbors": "10", "weights": "distance"}})
+            by_id = knn_regression({"index_id": first["index_id"], "parameters": {"n_neighbors": "4"}})
+        self.assertTrue(again["index_reused"])
+        self.assertEqual(again["index_id"], first["index_id"])
+        self.assertEqual(by_id["n_neighbors"], 4)
+
+    def test_repeat_queries_store_the_model_once(self):
+        data = {"X": self.X.tolist(), "y": self.y.tolist(), "parameters": {"n_neighbors": "3"}}
+        first = knn_regression(data)
+        with mock.patch.object(model_store.storage, "save_file", side_effect=AssertionError("model stored again")):
+            again = knn_regression(data)
+            by_id = knn_regression({"index_id": first["index_id"], "parameters": {"n_neighbors": "3"}})
+        self.assertEqual(again["model_id"], first["model_id"])
+        self.assertEqual(by_id["model_id"], first["model_id"])
+
+        # Other query settings are a different model of the same index
+        other = knn_regression({"index_id": first["index_id"], "parameters": {"n_neighbors": "5"}})
+        self.assertNotEqual(other["model_id"], first["model_id"])
+        model_store._cache.clear()
+        self.assertEqual(model_store.load_model(other["model_id"])[0].n_neighbors, 5)
+
+    def test_evicted_index_returns_404(self):
+        resp = self.client.post(
+            reverse("knn_regression"), {"index_id": "0" * 40, "parameters": {}}, format="json"
+        )
+        self.assertEqual(resp.status_code, 404)
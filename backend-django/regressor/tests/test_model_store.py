@@ -0,0 +1,54 @@
+import os
+import time
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APISimpleTestCase
+
+from network.testing import TempStorageMixin
+from regressor import model_store
+from regressor.services import linear_regression, polynomial_regression
+
+
+class ModelStoreTests(TempStorageMixin, APISimpleTestCase):
+    def test_predict_uses_stored_model_without_refitting(self):
+        result = linear_regression({"X": [[0], [1], [2], [3]], "y": [1, 3, 5, 7]})
+        model_id = result["model_id"]
+
+        # Drop the in-memory copy to force loading from storage
+        model_store._cache.clear()
+        resp = self.client.post(reverse("regression_predict"), {"model_id": model_id, "X": [[4], [5]]}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertAlmostEqual(resp.data["predictions"][0], 9.0)
+        self.assertAlmostEqual(resp.data["predictions"][1], 11.0)
+        self.assertIn(model_id, model_store._cache)
+
+    def test_polynomial_model_includes_feature_expansion(self):
+        result = polynomial_regression({"X": [[0], [1], [2], [3]], "y": [0, 1, 4, 9], "parameters": {"degree": "2"}})
+        out = model_store.predict({"model_id": result["model_id"], "X": [4]})
+        self.assertAlmostEqual(out["predictions"][0], 16.0, places=6)
+
+    @override_settings(REGRESSOR_MODEL_CACHE_SIZE=1)
+    def test_lru_evicts_oldest_model(self):
+        first = linear_regression({"X": [0, 1, 2], "y": [0, 1, 2]})["model_id"]
+        second = linear_regression({"X": [0, 1, 2], "y": [0, 2, 4]})["model_id"]
+        self.assertNotIn(first, model_store._cache)
+        self.assertIn(second, model_store._cache)
+
+    def test_unknown_and_malformed_ids(self):
+        url = reverse("regression_predict")
+        resp = self.client.post(url, {"model_id": "0" * 32, "X": [[1]]}, format="json")
+        self.assertEqual(resp.status_code, 404)
+        resp = self.client.post(url, {"model_id": "../secrets", "X": [[1]]}, format="json")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_prune_removes_expired_models(self):
+        old = linear_regression({"X": [0, 1, 2], "y": [0, 1, 2]})["model_id"]
+        fresh = linear_regression({"X": [0, 1, 2], "y": [0, 2, 4]})["model_id"]
+        expired = time.time() - 10 * 86400
+        os.utime(os.path.join(self.media_root, "regressors", f"{old}.joblib"), (expired, expired))
+
+        self.assertEqual(model_store.prune_models(7), 1)
+        with self.assertRaises(LookupError):
+            model_store.load_model(old)
+        self.assertEqual(model_store.load_model(fresh)[1]["model_id"], fresh)
@@ -0,0 +1,50 @@
+import base64
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from regressor.plotting import build_plot_spec, fit_plot, stratified_sample
+
+
+def _line(n, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 10, size=(n, 1))
+    y = 2 * X[:, 0] + rng.normal(size=n)
+    return X, y
+
+
+def _predict(grid):
+    return 2 * grid[:, 0]
+
+
+@override_settings(REGRESSOR_PLOT_MAX_POINTS=500)
+class PlottingTests(SimpleTestCase):
+    def test_stratified_sample_keeps_extremes(self):
+        X, y = _line(20000)
+        y[123] = 1e6
+        idx = stratified_sample(X[:, 0], y, 400)
+        self.assertLessEqual(len(idx), 400)
+        self.assertIn(123, idx)
+        self.assertIn(int(np.argmin(X[:, 0])), idx)
+        self.assertIn(int(np.argmax(X[:, 0])), idx)
+
+    def test_svg_size_is_bounded_by_point_budget(self):
+        small = fit_plot(_predict, *_line(500), label="fit")
+        large = fit_plot(_predict, *_line(50000), label="fit")
+        self.assertEqual(large["plot_points"], {"total": 50000, "shown": 500, "method": "sample"})
+        self.assertLess(len(large["svg_plot"]), 1.2 * len(small["svg_plot"]))
+        self.assertNotIn("<!--", large["svg_plot"])
+
+    def test_hexbin_and_raster_output(self):
+        X, y = _line(5000)
+        result = fit_plot(_predict, X, y, label="fit", params={"plot_format": "png", "plot_decimation": "hexbin"})
+        self.assertNotIn("svg_plot", result)
+        self.assertEqual(result["plot_points"]["method"], "hexbin")
+        self.assertTrue(base64.b64decode(result["plot_image"]).startswith(b"\x89PNG"))
+
+        webp = fit_plot(_predict, X, y, label="fit", params={"plot_format": "webp"})
+        self.assertEqual(base64.b64decode(webp["plot_image"])[8:12], b"WEBP")
+
+    def test_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            build_plot_spec(_predict, *_line(10), label="fit", params={"plot_format": "gif"})
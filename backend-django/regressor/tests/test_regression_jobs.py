@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.test import override_settings
+from kombu.utils.json import dumps, loads
+from django.urls import reverse
+from rest_framework.test import APISimpleTestCase
+
+from network.testing import TempStorageMixin
+from regressor.jobs import estimate_cost, should_run_async
+from regressor.tasks import run_regression_task
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class RegressionJobTests(TempStorageMixin, APISimpleTestCase):
+    def test_cost_scales_with_model_size(self):
+        data = {"X": [[1, 2]] * 100, "y": [1] * 100}
+        self.assertEqual(estimate_cost("linear", data), 200)
+        small = estimate_cost("random-forest", {**data, "parameters": {"n_estimators": "10"}})
+        self.assertEqual(estimate_cost("random-forest", data), 20 * small)
+
+    @override_settings(REGRESSOR_ASYNC_COST_LIMIT=1000)
+    def test_explicit_flag_overrides_estimate(self):
+        big = {"X": list(range(5000)), "y": list(range(5000))}
+        self.assertTrue(should_run_async("linear", big))
+        self.assertFalse(should_run_async("linear", {**big, "async": False}))
+        self.assertTrue(should_run_async("linear", {"X": [1, 2], "y": [1, 2], "parameters": {"async": "true"}}))
+
+    def test_short_fit_stays_synchronous(self):
+        resp = self.client.post(reverse("ridge_regression"), {"X": [1, 2, 3], "y": [2, 4, 6]}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("model_id", resp.json())
+
+    def test_async_fit_is_queued_and_reuses_service(self):
+        payload = {"X": [1, 2, 3, 4], "y": [1, 2, 3, 4], "async": True}
+        with mock.patch("regressor.views.run_regression_task.delay") as delay:
+            delay.return_value = mock.Mock(id="abc")
+            resp = self.client.post(reverse("random_forest_regression"), payload, format="json")
+        self.assertEqual(resp.status_code, 202)
+        self.assertTrue(resp["Location"].endswith(reverse("regression_job", args=["abc"])))
+        delay.assert_called_once_with("random-forest", payload)
+
+        result = run_regression_task("random-forest", {**payload, "parameters": {"n_estimators": "5"}})
+        self.assertEqual(result["n_estimators"], 5)
+
+    def test_async_multi_target_results_serialize(self):
+        payload = {"X": [1, 2, 3, 4, 5], "y": [[1, 2], [2, 3], [3, 5], [4, 4], [5, 7]], "async": True}
+        for algorithm in ("linear", "ridge", "lasso"):
+            # Celery's JSON result serializer, as used by the worker
+            result = loads(dumps(run_regression_task(algorithm, payload)))
+            self.assertEqual(len(result["model_info"]["intercept"]), 2, algorithm)
+
+    def test_status_only_for_issued_jobs(self):
+        with mock.patch("regressor.views.run_regression_task.delay") as delay:
+            delay.return_value = mock.Mock(id="issued")
+            self.client.post(reverse("linear_regression"), {"X": [1, 2], "y": [1, 2], "async": True}, format="json")
+
+        with mock.patch("regressor.views.AsyncResult") as async_result:
+            async_result.return_value = mock.Mock(state="SUCCESS", result={"r2": 1.0})
+            resp = self.client.get(reverse("regression_job", args=["issued"]))
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json()["result"], {"r2": 1.0})
+
+            # e.g. a network training task id, or an id that was never issued
+            resp = self.client.get(reverse("regression_job", args=["other-task"]))
+            self.assertEqual(resp.status_code, 404)
+            async_result.assert_called_once_with("issued")
@@ -0,0 +1,103 @@
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from network.testing import TempStorageMixin
+from regressor.model_store import load_model
+from regressor.services import (
+    gradient_boosting_regression, lasso_regression, linear_regression, random_forest_regression, ridge_regression,
+    svr_regression,
+)
+
+
+class RegressionServiceTests(TempStorageMixin, SimpleTestCase):
+    def test_gradient_boosting_early_stops_on_validation_fraction(self):
+        rng = np.random.default_rng(0)
+        X = rng.uniform(0, 1, size=(400, 2))
+        y = 3 * X[:, 0] + np.sin(6 * X[:, 1])
+        result = gradient_boosting_regression({
+            "X": X.tolist(),
+            "y": y.tolist(),
+            "parameters": {"max_iter": "500", "learning_rate": "0.3", "early_stopping": "true", "validation_fraction": "0.2"},
+        })
+        self.assertTrue(result["early_stopping"])
+        self.assertEqual(result["validation_fraction"], 0.2)
+        self.assertLess(result["n_iter"], 500)
+        self.assertIsNotNone(result["validation_score"])
+        self.assertGreater(result["model_info"]["r_squared"], 0.9)
+        self.assertIn("svg_plot", result)
+        self.assertIn("model_id", result)
+
+    def test_svr_uses_exact_solver_below_threshold(self):
+        X = np.linspace(0, 6, 60)
+        result = svr_regression({"X": X.tolist(), "y": np.sin(X).tolist(), "parameters": {"C": "10"}})
+        self.assertEqual(result["mode"], "exact")
+        self.assertIsNone(result["approximation_rank"])
+
+    def test_svr_switches_to_kernel_approximation_above_threshold(self):
+        rng = np.random.default_rng(0)
+        X = rng.uniform(0, 6, size=(3000, 2))
+        y = np.sin(X[:, 0]) + 0.5 * X[:, 1]
+        result = svr_regression({
+            "X": X.tolist(),
+            "y": y.tolist(),
+            "parameters": {"C": "10", "approximation_threshold": "1000", "n_components": "150"},
+        })
+        self.assertEqual(result["mode"], "nystroem")
+        self.assertEqual(result["approximation_rank"], 150)
+        self.assertEqual(result["solver"], "ridge")
+        self.assertGreater(result["model_info"]["r_squared"], 0.95)
+
+    @override_settings(REGRESSOR_RF_MAX_JOBS=2)
+    def test_random_forest_caps_jobs_and_subsamples(self):
+        rng = np.random.default_rng(0)
+        X = rng.uniform(0, 1, size=(300, 2))
+        y = X[:, 0] - X[:, 1]
+        result = random_forest_regression({
+            "X": X.tolist(),
+            "y": y.tolist(),
+            "parameters": {"n_estimators": "20", "n_jobs": "8", "max_samples": "0.5"},
+        })
+        self.assertEqual(result["n_jobs"], 2)
+        self.assertEqual(result["max_samples"], 0.5)
+        self.assertEqual(result["n_estimators"], 20)
+
+    def test_random_forest_warm_start_adds_trees_to_stored_forest(self):
+        X = np.linspace(0, 1, 100)
+        data = {"X": X.tolist(), "y": np.sin(6 * X).tolist()}
+        first = random_forest_regression({**data, "parameters": {"n_estimators": "10"}})
+        grown = random_forest_regression({
+            **data, "parameters": {"n_estimators": "5", "warm_start_from": first["model_id"]},
+        })
+        self.assertEqual(grown["n_estimators"], 15)
+        self.assertEqual(grown["trees_added"], 5)
+        self.assertNotEqual(grown["model_id"], first["model_id"])
+
+        # The original stored forest is left as it was
+        self.assertEqual(len(load_model(first["model_id"])[0].estimators_), 10)
+
+        with self.assertRaises(ValueError):
+            svr = svr_regression({**data, "parameters": {}})
+            random_forest_regression({**data, "parameters": {"warm_start_from": svr["model_id"]}})
+
+    def test_linear_family_fits_named_targets_in_one_call(self):
+        X = np.linspace(0, 1, 50)
+        targets = {"double": (2 * X).tolist(), "shifted": (X + 3).tolist(), "flat": np.ones(50).tolist()}
+        for service in (linear_regression, ridge_regression, lasso_regression):
+            result = service({"X": X.tolist(), "y": targets, "parameters": {"alpha": "0.0001", "plot_target": "shifted"}})
+            self.assertEqual(result["n_targets"], 3)
+            self.assertEqual([t["name"] for t in result["targets"]], ["double", "shifted", "flat"])
+            self.assertEqual(result["plot_target"], "shifted")
+            shifted = result["targets"][1]
+            self.assertAlmostEqual(shifted["intercept"], 3.0, places=2)
+            self.assertAlmostEqual(shifted["coefficients"][0], 1.0, places=2)
+            self.assertEqual(len(shifted["curve"]["y"]), 200)
+
+    def test_matrix_targets_on_two_features(self):
+        rng = np.random.default_rng(0)
+        X = rng.uniform(size=(40, 2))
+        Y = np.column_stack([X @ [1, 2], X @ [-1, 0.5]])
+        result = linear_regression({"X": X.tolist(), "y": Y.tolist()})
+        self.assertEqual([t["name"] for t in result["targets"]], ["y1", "y2"])
+        self.assertGreater(min(t["r_squared"] for t in result["targets"]), 0.999)
+        self.assertEqual(np.asarray(result["targets"][1]["curve"]["y"]).shape, (30, 30))
+        self.assertNotIn("targets", linear_regression({"X": X.tolist(), "y": Y[:, 0].tolist()}))
@@ -0,0 +1,42 @@
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+from sklearn.linear_model import Lasso
+
+from network.testing import TempStorageMixin
+from regressor.path import compute_path, regularization_path
+
+
+def _sparse_data(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 6))
+    y = 3 * X[:, 0] - 2 * X[:, 3] + rng.normal(scale=0.1, size=n)
+    return X.tolist(), y.tolist()
+
+
+@override_settings(REGRESSOR_MAX_WORKERS=2)
+class RegularizationPathTests(TempStorageMixin, SimpleTestCase):
+    def test_path_matches_individual_fits(self):
+        X, y = _sparse_data()
+        path = compute_path({"X": X, "y": y, "n_alphas": 20, "tol": 1e-8})
+        self.assertEqual(path["n_nonzero"][0], 0)
+        self.assertEqual(len(path["coefficients"]), 20)
+        for i in (5, 15):
+            model = Lasso(alpha=path["alphas"][i], tol=1e-8).fit(X, y)
+            np.testing.assert_allclose(path["coefficients"][i], model.coef_, atol=1e-3)
+            self.assertAlmostEqual(path["intercepts"][i], model.intercept_, places=3)
+
+    def test_cv_selects_sparse_model_and_refits(self):
+        X, y = _sparse_data()
+        result = regularization_path({"X": X, "y": y, "algorithm": "elasticnet", "l1_ratio": 0.9, "cv": 4})
+        path = result["path"]
+        self.assertEqual(path["selection"], "cv")
+        self.assertEqual(len(path["cv"]["mean_mse"]), 100)
+        self.assertAlmostEqual(result["alpha"], path["selected_alpha"])
+        self.assertEqual(result["l1_ratio"], 0.9)
+        self.assertGreater(result["model_info"]["r_squared"], 0.99)
+        self.assertIn("model_id", result)
+
+    def test_rejects_unsupported_algorithm(self):
+        X, y = _sparse_data()
+        with self.assertRaises(ValueError):
+            compute_path({"X": X, "y": y, "algorithm": "ridge"})
@@ -0,0 +1,65 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from regressor import render_pool
+from regressor.plotting import build_plot_spec, fit_plot
+
+
+def _spec():
+    X = np.linspace(0, 1, 50).reshape(-1, 1)
+    return build_plot_spec(lambda grid: grid[:, 0], X, X[:, 0], label="fit")
+
+
+@override_settings(REGRESSOR_RENDER_WORKERS=1, REGRESSOR_RENDER_QUEUE_SIZE=1)
+class RenderPoolTests(SimpleTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        render_pool.shutdown()
+        super().tearDownClass()
+
+    def test_renders_in_worker_process(self):
+        result = render_pool.submit_render(_spec())
+        self.assertTrue(result["svg_plot"].startswith("<?xml"))
+        self.assertEqual(result["plot_points"]["shown"], 50)
+
+    @override_settings(REGRESSOR_RENDER_WORKERS=0)
+    def test_zero_workers_renders_inline(self):
+        self.assertIn("svg_plot", render_pool.submit_render(_spec()))
+
+    def test_timeout_keeps_fit_response(self):
+        render_pool.shutdown()
+        X = np.linspace(0, 1, 50)
+        with override_settings(REGRESSOR_RENDER_TIMEOUT=0.001):
+            # A cold pool cannot start a worker within a millisecond
+            result = fit_plot(lambda grid: grid[:, 0], X.reshape(-1, 1), X, label="fit")
+        self.assertIsNone(result["svg_plot"])
+        self.assertIn("plot_error", result)
+
+    def test_timeout_kills_running_render(self):
+        render_pool.submit_render(_spec())
+        with mock.patch.object(render_pool, "render_plot", time.sleep), override_settings(REGRESSOR_RENDER_TIMEOUT=1):
+            with self.assertRaises(render_pool.RenderUnavailable):
+                render_pool.submit_render(60)
+        # The only worker was hung; a fresh pool serves the next render
+        result = render_pool.submit_render(_spec())
+        self.assertIn("svg_plot", result)
+
+    @override_settings(REGRESSOR_RENDER_WORKERS=2)
+    def test_timeout_spares_other_running_renders(self):
+        render_pool.shutdown()
+        with mock.patch.object(render_pool, "render_plot", time.sleep), ThreadPoolExecutor(2) as requests:
+            # Start both workers first
+            list(requests.map(render_pool.submit_render, [0.5, 0.5]))
+            with override_settings(REGRESSOR_RENDER_TIMEOUT=3):
+                hung = requests.submit(render_pool.submit_render, 60)
+                time.sleep(1)
+                # Still drawing when the hung render times out (at 3s), done at 3.5s
+                normal = requests.submit(render_pool.submit_render, 2.5)
+                with self.assertRaises(render_pool.RenderUnavailable):
+                    hung.result()
+                self.assertIsNone(normal.result())
+        self.assertIn("svg_plot", render_pool.submit_render(_spec()))
@@ -8,7 +8,14 @@ from .views import (
     SVRRegressionView,
     DecisionTreeRegressionView,
     RandomForestRegressionView,
-    GradientBoostingRegressionView
+    GradientBoostingRegressionView,
+    KNNRegressionView,
+    CompareRegressionView,
+    RegularizationPathView,
+    FeatureSelectionView,
+    HyperparameterSearchView,
+    RegressionJobView,
+    PredictView,
 )
 
 urlpatterns = [
@@ -21,4 +28,11 @@ urlpatterns = [
     path('decision-tree/', DecisionTreeRegressionView.as_view(), name='decision_tree_regression'),
     path('random-forest/', RandomForestRegressionView.as_view(), name='random_forest_regression'),
     path('gradient-boosting/', GradientBoostingRegressionView.as_view(), name='gradient_boosting_regression'),
+    path('knn/', KNNRegressionView.as_view(), name='knn_regression'),
+    path('compare/', CompareRegressionView.as_view(), name='compare_regression'),
+    path('path/', RegularizationPathView.as_view(), name='regularization_path'),
+    path('feature-selection/', FeatureSelectionView.as_view(), name='feature_selection'),
+    path('search/', HyperparameterSearchView.as_view(), name='hyperparameter_search'),
+    path('jobs/<str:job_id>/', RegressionJobView.as_view(), name='regression_job'),
+    path('predict/', PredictView.as_view(), name='regression_predict'),
 ]
@@ -1,42 +1,145 @@
+from rest_framework import status
+from django.urls import reverse
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from .services import (
-    linear_regression,
-    polynomial_regression,
-    ridge_regression,
-    lasso_regression,
-    elasticnet_regression,
-    svr_regression,
-    decision_tree_regression,
-    random_forest_regression,
-    gradient_boosting_regression
-)
-
-class LinearRegressionView(APIView):
-    def post(self, request): 
-        print("Received data:", request.data)
-        return Response(linear_regression(request.data))
-
-class PolynomialRegressionView(APIView):
-    def post(self, request): return Response(polynomial_regression(request.data))
-
-class RidgeRegressionView(APIView):
-    def post(self, request): return Response(ridge_regression(request.data))
-
-class LassoRegressionView(APIView):
-    def post(self, request): return Response(lasso_regression(request.data))
-
-class ElasticNetRegressionView(APIView):
-    def post(self, request): return Response(elasticnet_regression(request.data))
-
-class SVRRegressionView(APIView):
-    def post(self, request): return Response(svr_regression(request.data))
-
-class DecisionTreeRegressionView(APIView):
-    def post(self, request): return Response(decision_tree_regression(request.data))
-
-class RandomForestRegressionView(APIView):
-    def post(self, request): return Response(random_forest_regression(request.data))
-
-class GradientBoostingRegressionView(APIView):
-    def post(self, request): return Response(gradient_boosting_regression(request.data))
+from celery.result import AsyncResult
+from config.runtime_limits import limit_threads
+from .compare import compare_models
+from .model_store import predict
+from .path import regularization_path
+from .search import hyperparameter_search, is_large_search
+from .selection import select_features
+from .jobs import is_known_job, remember_job, should_run_async
+from .tasks import run_hyperparameter_search_task, run_regression_task
+from .services import REGRESSION_SERVICES
+
+def _queued_response(request, task):
+    remember_job(task.id)
+    status_url = request.build_absolute_uri(reverse("regression_job", args=[task.id]))
+    return Response(
+        {"job_id": task.id, "status": "queued", "status_url": status_url},
+        status=status.HTTP_202_ACCEPTED,
+        headers={"Location": status_url},
+    )
+
+
+class RegressionServiceView(APIView):
+    """
+    Runs one `REGRESSION_SERVICES` entry; expensive fits (or `async=true`)
+    are queued as a Celery task and polled through `jobs/<job_id>/`.
+    """
+
+    algorithm = None
+
+    def post(self, request):
+        data = request.data
+        try:
+            if should_run_async(self.algorithm, data):
+                # Plain dict so the payload survives Celery's JSON serializer
+                return _queued_response(request, run_regression_task.delay(self.algorithm, dict(data)))
+            with limit_threads(f"regressor.{self.algorithm}"):
+                return Response(REGRESSION_SERVICES[self.algorithm](data))
+        except LookupError as exc:
+            # e.g. an unknown `warm_start_from` model id or an evicted k-NN `index_id`
+            return Response({"detail": str(exc)}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+class LinearRegressionView(RegressionServiceView):
+    algorithm = "linear"
+
+class PolynomialRegressionView(RegressionServiceView):
+    algorithm = "polynomial"
+
+class RidgeRegressionView(RegressionServiceView):
+    algorithm = "ridge"
+
+class LassoRegressionView(RegressionServiceView):
+    algorithm = "lasso"
+
+class ElasticNetRegressionView(RegressionServiceView):
+    algorithm = "elasticnet"
+
+class SVRRegressionView(RegressionServiceView):
+    algorithm = "svr"
+
+class DecisionTreeRegressionView(RegressionServiceView):
+    algorithm = "decision-tree"
+
+class RandomForestRegressionView(RegressionServiceView):
+    algorithm = "random-forest"
+
+class GradientBoostingRegressionView(RegressionServiceView):
+    algorithm = "gradient-boosting"
+
+class KNNRegressionView(RegressionServiceView):
+    algorithm = "knn"
+
+
+class CompareRegressionView(APIView):
+    def post(self, request):
+        try:
+            with limit_threads("regressor.compare"):
+                return Response(compare_models(request.data))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class RegularizationPathView(APIView):
+    def post(self, request):
+        try:
+            with limit_threads("regressor.path"):
+                return Response(regularization_path(request.data))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class FeatureSelectionView(APIView):
+    def post(self, request):
+        try:
+            with limit_threads("regressor.feature-selection"):
+                return Response(select_features(request.data))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class HyperparameterSearchView(APIView):
+    def post(self, request):
+        data = request.data
+        try:
+            if is_large_search(data):
+                # Plain dict so the payload survives Celery's JSON serializer
+                return _queued_response(request, run_hyperparameter_search_task.delay(dict(data)))
+            with limit_threads("regressor.search"):
+                return Response(hyperparameter_search(data))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class RegressionJobView(APIView):
+    """Status/result polling for regressor work running as a Celery task."""
+
+    def get(self, request, job_id):
+        # Other apps' tasks share the result backend; only jobs queued here are visible
+        if not is_known_job(job_id):
+            return Response({"detail": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        result = AsyncResult(job_id)
+        payload = {"job_id": job_id, "status": result.state.lower()}
+        if result.state == "PROGRESS":
+            payload["progress"] = result.info
+        elif result.state == "SUCCESS":
+            payload["result"] = result.result
+        elif result.state == "FAILURE":
+            payload["error"] = str(result.result)
+        return Response(payload)
+
+
+class PredictView(APIView):
+    def post(self, request):
+        try:
+            with limit_threads("regressor.predict"):
+                return Response(predict(request.data))
+        except LookupError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file